@@ -1,13 +1,17 @@
-from .engine import create_engine_all_in_one
+from .engine import create_async_engine_all_in_one, create_engine_all_in_one
 from .base import Base
 from .mixins_graph import GraphNodeMixin
 from .mixins_vector import VectorMixin
 from .mixins_fts import FTSSearchMixin
 from .mixins_bm25 import BM25SearchMixin
 from .relationships import GraphRelationship
-from .hybrid import hybrid_search, graph_expand_ids
+from .hybrid import hybrid_search, hybrid_search_async, graph_expand_ids
 from .taxonomy import Label, make_doc_labels_table
-from .hybrid_graph import hybrid_search_results_constrained, hybrid_search_results_in_label_subtree
+from .hybrid_graph import (
+    hybrid_search_results_constrained,
+    hybrid_search_results_in_label_subtree,
+    hybrid_search_results_in_label_subtree_async,
+)
 from .hybrid_relational import hybrid_search_results_in_label_subtree_relational
 from .community import (
     connected_components,
@@ -29,6 +33,7 @@ __version__ = "0.1.0"
 
 __all__ = [
     "create_engine_all_in_one",
+    "create_async_engine_all_in_one",
     "Base",
     "GraphNodeMixin",
     "VectorMixin",
@@ -36,11 +41,13 @@ __all__ = [
     "BM25SearchMixin",
     "GraphRelationship",
     "hybrid_search",
+    "hybrid_search_async",
     "graph_expand_ids",
     "Label",
     "make_doc_labels_table",
     "hybrid_search_results_constrained",
     "hybrid_search_results_in_label_subtree",
+    "hybrid_search_results_in_label_subtree_async",
     "hybrid_search_results_in_label_subtree_relational",
     "connected_components",
     "graph_connected_components",
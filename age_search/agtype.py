@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+# Scalars that don't need the full parser.
+_INT = re.compile(r"-?\d+\Z")
+_CONSTANTS: dict[str, Any] = {"true": True, "false": False, "null": None}
+
+# AGE annotates values with `::vertex`, `::edge`, `::path`, `::numeric`, ...
+_SUFFIX = re.compile(r"::[A-Za-z_]+")
+
+
+def _strip_type_suffixes(value: str) -> str:
+    """
+    Remove `::type` annotations that sit outside JSON strings.
+    """
+    if '"' not in value:
+        return _SUFFIX.sub("", value)
+
+    out: list[str] = []
+    i, n, start = 0, len(value), 0
+    in_str = False
+    while i < n:
+        ch = value[i]
+        if in_str:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == ":" and value.startswith("::", i):
+            m = _SUFFIX.match(value, i)
+            if m:
+                out.append(value[start:i])
+                i = start = m.end()
+                continue
+        i += 1
+    out.append(value[start:])
+    return "".join(out)
+
+
+def decode_agtype(value: Any) -> Any:
+    """
+    Decode an agtype value as returned by psycopg (its text form) into Python objects.
+
+    - ints, plain strings, booleans and null take fast paths
+    - vertices / edges / paths lose their `::vertex` / `::edge` / `::path` suffix and come
+      back as dicts / lists, matching what agtype_to_json() gives on the server
+    - NaN / Infinity floats are accepted
+
+    Values that are already decoded (not str) are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    if _INT.match(value):
+        return int(value)
+    if value in _CONSTANTS:
+        return _CONSTANTS[value]
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"' and "\\" not in value and '"' not in value[1:-1]:
+        return value[1:-1]
+    if "::" in value:
+        value = _strip_type_suffixes(value)
+    return json.loads(value)
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .cypher import _cfg, _require_safe_graph_name, _require_safe_ident
+
+# (label, id, props) and (edge, src, dst, props). Edge endpoints are vertex ids, or
+# (label, id) tuples when the same id is used under several labels.
+VertexRow = tuple[str, Any, Optional[dict[str, Any]]]
+EdgeEndpoint = Union[Any, tuple[str, Any]]
+EdgeRow = tuple[str, EdgeEndpoint, EdgeEndpoint, Optional[dict[str, Any]]]
+
+# AGE packs the label id into the top 16 bits of a graphid; the rest is the sequence value.
+_ENTRY_ID_BITS = 48
+
+
+def make_graphid(label_id: int, entry_id: int) -> int:
+    return (int(label_id) << _ENTRY_ID_BITS) | int(entry_id)
+
+
+@dataclass
+class LoadReport:
+    vertices: int = 0
+    edges: int = 0
+    skipped_edges: int = 0
+    labels_created: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _LabelInfo:
+    label_id: int
+    seq: str  # qualified sequence name
+    relation: str  # qualified label table name
+
+
+def _ensure_label(session: Session, graph: str, name: str, *, kind: str, report: LoadReport) -> _LabelInfo:
+    """
+    Create the vlabel / elabel if needed and return its id, sequence and table.
+    """
+    name = _require_safe_ident(name, what="graph label")
+    sql = text(
+        """
+        SELECT l.id, l.seq_name, l.relation::text
+        FROM ag_catalog.ag_label l
+        JOIN ag_catalog.ag_graph g ON g.graphid = l.graph
+        WHERE g.name = :g AND l.name = :l
+        """
+    )
+    row = session.execute(sql, {"g": graph, "l": name}).first()
+    if row is None:
+        fn = "create_vlabel" if kind == "v" else "create_elabel"
+        session.execute(text(f"SELECT ag_catalog.{fn}(CAST(:g AS name), CAST(:l AS name))"), {"g": graph, "l": name})
+        report.labels_created.append(name)
+        row = session.execute(sql, {"g": graph, "l": name}).first()
+    label_id, seq_name, relation = row  # type: ignore[misc]
+    return _LabelInfo(label_id=int(label_id), seq=f'"{graph}"."{seq_name}"', relation=relation)
+
+
+def _allocate_graphids(session: Session, info: _LabelInfo, n: int) -> list[int]:
+    rows = session.execute(
+        text("SELECT nextval(CAST(:seq AS regclass)) FROM generate_series(1, :n)"),
+        {"seq": info.seq, "n": int(n)},
+    ).all()
+    return [make_graphid(info.label_id, r[0]) for r in rows]
+
+
+def _copy_rows(
+    session: Session,
+    copy_sql: str,
+    rows: Iterable[Sequence[Any]],
+    *,
+    types: Optional[Sequence[str]] = None,
+) -> None:
+    """
+    Stream rows through psycopg's COPY ... FROM STDIN on the session's connection.
+    `types` (Postgres type names) is required for FORMAT BINARY.
+    """
+    dbapi_conn = session.connection().connection.driver_connection
+    with dbapi_conn.cursor() as cur:  # type: ignore[union-attr]
+        with cur.copy(copy_sql) as copy:
+            if types is not None:
+                copy.set_types(list(types))
+            for row in rows:
+                copy.write_row(row)
+
+
+def _batched(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch: list[Any] = []
+    for r in rows:
+        batch.append(r)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_load_graph(
+    session: Session,
+    vertices: Iterable[VertexRow],
+    edges: Iterable[EdgeRow] = (),
+    *,
+    graph_name: Optional[str] = None,
+    key: str = "id",
+    batch_size: int = 10_000,
+) -> LoadReport:
+    """
+    Load vertices and edges straight into AGE's label tables with COPY.
+
+    - vlabels / elabels are created as needed
+    - graphids come from each label's sequence (label id << 48 | nextval)
+    - vertex props get `key` set to the vertex id (the package's id convention)
+    - edge endpoints are resolved from the ids loaded in this call; edges whose
+      endpoints weren't loaded are skipped and counted
+
+    Bypasses cypher entirely: no MERGE, so vertices already in the graph aren't matched
+    (loading one again creates a second vertex). A (label, id) listed twice in `vertices`
+    raises ValueError instead; the same id under different labels is fine, but edges
+    must then name those endpoints as (label, id). Meant for initial loads into empty
+    labels. The caller commits (or rolls back after an error).
+    """
+    graph = _require_safe_graph_name(_cfg(session, graph_name).graph_name)
+    report = LoadReport()
+    labels: dict[tuple[str, str], _LabelInfo] = {}
+
+    def _info(name: str, kind: str) -> _LabelInfo:
+        if (kind, name) not in labels:
+            labels[(kind, name)] = _ensure_label(session, graph, name, kind=kind, report=report)
+        return labels[(kind, name)]
+
+    by_label_id: dict[tuple[str, Any], int] = {}
+    labels_of_id: dict[Any, set[str]] = {}
+
+    for batch in _batched(vertices, batch_size):
+        per_label: dict[str, list[VertexRow]] = {}
+        for row in batch:
+            label, vid = row[0], row[1]
+            seen = labels_of_id.setdefault(vid, set())
+            if label in seen:
+                raise ValueError(f"vertex ({label!r}, {vid!r}) is listed more than once")
+            seen.add(label)
+            per_label.setdefault(label, []).append(row)
+        for label, rows in per_label.items():
+            info = _info(label, "v")
+            gids = _allocate_graphids(session, info, len(rows))
+            out = []
+            for (_, vid, props), gid in zip(rows, gids):
+                p = dict(props or {})
+                p.setdefault(key, vid)
+                out.append((gid, json.dumps(p)))
+                by_label_id[(label, vid)] = gid
+            _copy_rows(session, f"COPY {info.relation} (id, properties) FROM STDIN", out)
+            report.vertices += len(out)
+
+    def _resolve(ep: EdgeEndpoint) -> Optional[int]:
+        if isinstance(ep, tuple):
+            return by_label_id.get((ep[0], ep[1]))
+        found = labels_of_id.get(ep)
+        if not found:
+            return None
+        if len(found) > 1:
+            raise ValueError(f"vertex id {ep!r} is used under several labels; pass (label, id)")
+        return by_label_id[(next(iter(found)), ep)]
+
+    for batch in _batched(edges, batch_size):
+        per_edge: dict[str, list[tuple[int, int, Optional[dict[str, Any]]]]] = {}
+        for edge, src, dst, props in batch:
+            s, d = _resolve(src), _resolve(dst)
+            if s is None or d is None:
+                report.skipped_edges += 1
+                continue
+            per_edge.setdefault(edge, []).append((s, d, props))
+        for edge, rows in per_edge.items():
+            info = _info(edge, "e")
+            gids = _allocate_graphids(session, info, len(rows))
+            out = [(gid, s, d, json.dumps(props or {})) for (s, d, props), gid in zip(rows, gids)]
+            _copy_rows(session, f"COPY {info.relation} (id, start_id, end_id, properties) FROM STDIN", out)
+            report.edges += len(out)
+
+    return report
+
+
+def _coerce_id(v: Any) -> Any:
+    if isinstance(v, str) and v.lstrip("-").isdigit():
+        return int(v)
+    return v
+
+
+def read_vertex_file(path: str) -> Iterator[VertexRow]:
+    """
+    Vertices from JSONL ({"label", "id", "props"}) or CSV (label, id, other columns as props).
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for rec in csv.DictReader(f):
+                label, vid = rec.pop("label"), rec.pop("id")
+                yield (label, _coerce_id(vid), rec)
+        return
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                rec = json.loads(line)
+                yield (rec["label"], rec["id"], rec.get("props"))
+
+
+def _endpoint(rec: dict[str, Any], name: str) -> EdgeEndpoint:
+    vid = _coerce_id(rec.pop(name))
+    label = rec.pop(f"{name}_label", None)
+    return (label, vid) if label else vid
+
+
+def read_edge_file(path: str) -> Iterator[EdgeRow]:
+    """
+    Edges from JSONL ({"label", "src", "dst", "props"}, optional "src_label"/"dst_label")
+    or CSV (label, src, dst, optional src_label/dst_label, other columns as props).
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for rec in csv.DictReader(f):
+                label = rec.pop("label")
+                src, dst = _endpoint(rec, "src"), _endpoint(rec, "dst")
+                yield (label, src, dst, rec)
+        return
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                rec = json.loads(line)
+                label, props = rec.pop("label"), rec.pop("props", None)
+                yield (label, _endpoint(rec, "src"), _endpoint(rec, "dst"), props)
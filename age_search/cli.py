@@ -78,6 +78,105 @@ def cmd_index(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_sync_worker(args: argparse.Namespace) -> int:
+    """
+    Drain the graph sync outbox (see age_search.outbox) until interrupted.
+    """
+    import threading
+
+    from sqlalchemy import MetaData
+
+    from .engine import create_engine_all_in_one
+    from .outbox import OutboxStats, make_graph_outbox_table, run_sync_worker
+
+    url = args.url or _env("DATABASE_URL")
+    engine = create_engine_all_in_one(url, graph_name=args.graph_name)
+    table = make_graph_outbox_table(MetaData(), table_name=args.table)
+    stats = OutboxStats()
+    stop = threading.Event()
+
+    def _report() -> None:
+        while not stop.wait(args.report_interval):
+            print("sync-worker:", stats.snapshot(), flush=True)
+
+    if args.report_interval > 0:
+        threading.Thread(target=_report, daemon=True).start()
+    try:
+        run_sync_worker(
+            engine,
+            table,
+            batch_size=args.batch_size,
+            parallelism=args.parallelism,
+            poll_interval=args.poll_interval,
+            graph_name=args.graph_name,
+            stop=stop,
+            until_empty=args.once,
+            stats=stats,
+            max_attempts=args.max_attempts or None,
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+    print("sync-worker:", stats.snapshot())
+    return 0
+
+
+def cmd_load_graph(args: argparse.Namespace) -> int:
+    """
+    Bulk load vertices/edges from JSONL or CSV files with COPY (see age_search.bulk).
+    """
+    from sqlalchemy.orm import Session
+
+    from .bulk import bulk_load_graph, read_edge_file, read_vertex_file
+    from .engine import create_engine_all_in_one
+
+    url = args.url or _env("DATABASE_URL")
+    engine = create_engine_all_in_one(url, graph_name=args.graph_name)
+
+    vertices = (row for path in args.vertices for row in read_vertex_file(path))
+    edges = (row for path in args.edges for row in read_edge_file(path))
+    with Session(engine) as s:
+        report = bulk_load_graph(s, vertices, edges, graph_name=args.graph_name, batch_size=args.batch_size)
+        s.commit()
+    print(
+        f"Loaded {report.vertices} vertices, {report.edges} edges "
+        f"({report.skipped_edges} edges skipped; labels created: {', '.join(report.labels_created) or 'none'})."
+    )
+    return 0
+
+
+def cmd_reconcile(args: argparse.Namespace) -> int:
+    """
+    Diff a model's table against its AGE vertices and repair (or just report) drift.
+    """
+    import json
+
+    from sqlalchemy.orm import Session
+
+    from .engine import create_engine_all_in_one
+    from .reconcile import reconcile_graph, report_dict
+
+    url = args.url or _env("DATABASE_URL")
+    mod = __import__(args.models_module, fromlist=["MODELS"])
+    models = {m.__name__: m for m in getattr(mod, "MODELS", None) or []}
+    if args.model not in models:
+        raise SystemExit(f"{args.models_module}.MODELS has no model named {args.model!r}")
+
+    engine = create_engine_all_in_one(url, graph_name=args.graph_name)
+    with Session(engine) as s:
+        report = reconcile_graph(
+            s,
+            models[args.model],
+            chunk_size=args.chunk_size,
+            dry_run=args.dry_run,
+            checkpoint=args.checkpoint,
+            graph_name=args.graph_name,
+        )
+    print(json.dumps(report_dict(report), indent=2, default=str))
+    return 0 if report.in_sync or not args.dry_run else 1
+
+
 def main() -> None:
     p = argparse.ArgumentParser(prog="agegraph")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -105,6 +204,38 @@ def main() -> None:
     p_idx.add_argument("--models-module", required=True, help="Python module path exporting MODELS=[...]")
     p_idx.set_defaults(func=cmd_index)
 
+    p_sync = sub.add_parser("sync-worker")
+    p_sync.add_argument("--url", help="DATABASE_URL")
+    p_sync.add_argument("--graph-name", default="knowledge_graph")
+    p_sync.add_argument("--table", default="agegraph_outbox", help="Outbox table name")
+    p_sync.add_argument("--batch-size", type=int, default=5000)
+    p_sync.add_argument("--parallelism", type=int, default=1)
+    p_sync.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the outbox is empty")
+    p_sync.add_argument("--report-interval", type=float, default=60.0, help="Seconds between stats lines (0 = off)")
+    p_sync.add_argument("--once", action="store_true", help="Exit when the outbox is empty")
+    p_sync.add_argument(
+        "--max-attempts", type=int, default=5, help="Failures before a record is left as a dead letter (0 = never)"
+    )
+    p_sync.set_defaults(func=cmd_sync_worker)
+
+    p_load = sub.add_parser("load-graph")
+    p_load.add_argument("--url", help="DATABASE_URL")
+    p_load.add_argument("--graph-name", default="knowledge_graph")
+    p_load.add_argument("--vertices", action="append", default=[], help="JSONL/CSV vertex file (repeatable)")
+    p_load.add_argument("--edges", action="append", default=[], help="JSONL/CSV edge file (repeatable)")
+    p_load.add_argument("--batch-size", type=int, default=10_000)
+    p_load.set_defaults(func=cmd_load_graph)
+
+    p_rec = sub.add_parser("reconcile")
+    p_rec.add_argument("--url", help="DATABASE_URL")
+    p_rec.add_argument("--graph-name", default="knowledge_graph")
+    p_rec.add_argument("--models-module", required=True, help="Python module path exporting MODELS=[...]")
+    p_rec.add_argument("--model", required=True, help="Class name of the GraphNodeMixin model")
+    p_rec.add_argument("--chunk-size", type=int, default=5000)
+    p_rec.add_argument("--dry-run", action="store_true", help="Report drift only (exit 1 if any)")
+    p_rec.add_argument("--checkpoint", help="File used to resume an interrupted run")
+    p_rec.set_defaults(func=cmd_reconcile)
+
     args = p.parse_args()
     rc = args.func(args)
     raise SystemExit(rc)
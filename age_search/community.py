@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
 from sqlalchemy.orm import Session
 
-from .cypher import cypher_json
+from .cypher import iter_cypher_rows
 
 
 @dataclass
@@ -71,17 +71,19 @@ def connected_components(nodes: Iterable[int], edges: Iterable[tuple[int, int]])
     return out
 
 
-def graph_edge_list_ids(
+def iter_graph_edge_list_ids(
     session: Session,
     *,
     graph_name: str,
     label: str,
     edge: str,
     direction: str = "both",  # out|in|both
-    limit: int = 200000,
-) -> list[tuple[int, int]]:
+    limit: Optional[int] = None,
+    batch_size: int = 10_000,
+) -> Iterator[tuple[int, int]]:
     """
-    Fetch an edge list as (src_id, dst_id) pairs from AGE.
+    Stream an edge list as (src_id, dst_id) pairs from AGE (server-side cursor,
+    `batch_size` rows per fetch).
 
     Assumes nodes store an integer `id` property (same convention used across this package).
     """
@@ -94,16 +96,43 @@ def graph_edge_list_ids(
 
     cy = f"""
     MATCH {pat}
-    RETURN [a.id, b.id]
-    LIMIT {int(limit)}
+    RETURN a.id, b.id
     """
-    rows = cypher_json(session, cy, graph_name=graph_name)
-    out: list[tuple[int, int]] = []
-    for r in rows:
-        if not r or not isinstance(r, list) or len(r) < 2:
+    if limit is not None:
+        cy += f"LIMIT {int(limit)}\n"
+    rows = iter_cypher_rows(
+        session, cy, columns=("a", "b"), graph_name=graph_name, batch_size=batch_size
+    )
+    for a, b in rows:
+        if a is None or b is None:
             continue
-        out.append((int(r[0]), int(r[1])))
-    return out
+        yield (int(a), int(b))
+
+
+def graph_edge_list_ids(
+    session: Session,
+    *,
+    graph_name: str,
+    label: str,
+    edge: str,
+    direction: str = "both",  # out|in|both
+    limit: Optional[int] = None,
+) -> list[tuple[int, int]]:
+    """
+    Fetch an edge list as (src_id, dst_id) pairs from AGE.
+
+    No limit by default; rows are streamed, so only the resulting pairs are held in memory.
+    """
+    return list(
+        iter_graph_edge_list_ids(
+            session,
+            graph_name=graph_name,
+            label=label,
+            edge=edge,
+            direction=direction,
+            limit=limit,
+        )
+    )
 
 
 def graph_connected_components(
@@ -113,7 +142,7 @@ def graph_connected_components(
     label: str,
     edge: str,
     direction: str = "both",
-    limit_edges: int = 200000,
+    limit_edges: Optional[int] = None,
     nodes: Optional[Iterable[int]] = None,
 ) -> list[list[int]]:
     """
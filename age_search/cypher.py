@@ -1,11 +1,16 @@
 from __future__ import annotations
 import json
-from typing import Any, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence
 import re
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
 from sqlalchemy.orm import Session
+from .agtype import decode_agtype
 from .config import AGEGraphConfig
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 _SAFE_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 
@@ -58,32 +63,40 @@ def _cfg(session: Session, graph_name: Optional[str] = None) -> AGEGraphConfig:
         cfg = AGEGraphConfig(graph_name=graph_name, search_path=cfg.search_path)
     return cfg
 
-def cypher_json(
-    session: Session,
+def _build_cypher_sql(
+    graph_name: str,
     cypher: str,
-    *,
-    params: Optional[dict[str, Any]] = None,
-    graph_name: Optional[str] = None,
-    returns_alias: str = "row",
-) -> list[Any]:
-    """
-    Executes cypher() and returns JSON-friendly Python objects using agtype_to_json().
-    """
-    cfg = _cfg(session, graph_name)
-    params = params or {}
-
+    returns_alias: str,
+    columns: Optional[tuple[str, ...]] = None,
+) -> TextClause:
     # Apache AGE cypher() is picky:
     # - graph name must be a literal constant (not a bind param)
     # - query must be a dollar-quoted string constant (not a bind param)
     # We'll inline graph/query/params safely:
     # - graph name + alias are strict identifiers
     # - query + params are dollar-quoted string literals (delimiter chosen to avoid collisions)
-    graph_lit = _require_safe_graph_name(cfg.graph_name)
-    alias = _require_safe_ident(returns_alias, what="returns alias")
-
+    graph_lit = _require_safe_graph_name(graph_name)
     cypher_lit = _dollar_quote(cypher, tag_base="cy")
 
-    sql = text(
+    if columns is not None:
+        # Raw agtype columns; decoded client-side (see age_search.agtype).
+        cols = [_require_safe_ident(c, what="column name") for c in columns]
+        if not cols:
+            raise ValueError("columns must not be empty")
+        return text(
+            f"""
+        SELECT {", ".join(cols)}
+        FROM cypher(
+          '{graph_lit}'::name,
+          {cypher_lit},
+          CAST(:params AS agtype)
+        ) AS ({", ".join(f"{c} agtype" for c in cols)});
+        """
+        )
+
+    alias = _require_safe_ident(returns_alias, what="returns alias")
+
+    return text(
         f"""
         SELECT
           CASE
@@ -101,6 +114,55 @@ def cypher_json(
         """
     )
 
+
+DEFAULT_CYPHER_SQL_CACHE_SIZE = 512
+
+# LRU of finished TextClause objects keyed on (graph name, cypher text, returns alias / columns).
+# Reusing the same object keeps SQLAlchemy's compiled cache and psycopg's prepared
+# statements lined up across calls with the same shape.
+_cached_cypher_sql = lru_cache(maxsize=DEFAULT_CYPHER_SQL_CACHE_SIZE)(_build_cypher_sql)
+
+
+def _cypher_sql(cfg: AGEGraphConfig, cypher: str, *, returns_alias: str = "row") -> TextClause:
+    return _cached_cypher_sql(cfg.graph_name, cypher, returns_alias)
+
+
+def _cypher_rows_sql(cfg: AGEGraphConfig, cypher: str, columns: Sequence[str]) -> TextClause:
+    return _cached_cypher_sql(cfg.graph_name, cypher, "", tuple(columns))
+
+
+def configure_cypher_sql_cache(maxsize: Optional[int] = DEFAULT_CYPHER_SQL_CACHE_SIZE) -> None:
+    """
+    Resize (and clear) the cypher() SQL cache. maxsize=0 disables caching, None is unbounded.
+    """
+    global _cached_cypher_sql
+    _cached_cypher_sql = lru_cache(maxsize=maxsize)(_build_cypher_sql)
+
+
+def cypher_sql_cache_info():  # noqa: ANN201
+    """Hit/miss stats of the cypher() SQL cache (a functools `CacheInfo`)."""
+    return _cached_cypher_sql.cache_info()
+
+
+def cypher_sql_cache_clear() -> None:
+    _cached_cypher_sql.cache_clear()
+
+
+def cypher_json(
+    session: Session,
+    cypher: str,
+    *,
+    params: Optional[dict[str, Any]] = None,
+    graph_name: Optional[str] = None,
+    returns_alias: str = "row",
+) -> list[Any]:
+    """
+    Executes cypher() and returns JSON-friendly Python objects using agtype_to_json().
+    """
+    cfg = _cfg(session, graph_name)
+    params = params or {}
+    sql = _cypher_sql(cfg, cypher, returns_alias=returns_alias)
+
     rows = session.execute(
         sql,
         {"params": json.dumps(params)},
@@ -111,3 +173,111 @@ def cypher_json(
         # psycopg may return json already decoded; if not, keep as-is.
         out.append(val)
     return out
+
+
+def iter_cypher_json(
+    session: Session,
+    cypher: str,
+    *,
+    params: Optional[dict[str, Any]] = None,
+    graph_name: Optional[str] = None,
+    returns_alias: str = "row",
+    batch_size: int = 1000,
+) -> Iterator[Any]:
+    """
+    Streaming variant of cypher_json: rows come from a server-side (named) cursor,
+    `batch_size` at a time, so memory stays flat regardless of result size.
+
+    The cursor lives inside the session's transaction; consume (or close) the generator
+    before committing.
+    """
+    cfg = _cfg(session, graph_name)
+    sql = _cypher_sql(cfg, cypher, returns_alias=returns_alias)
+
+    result = session.execute(
+        sql,
+        {"params": json.dumps(params or {})},
+        execution_options={"stream_results": True, "yield_per": int(batch_size)},
+    )
+    try:
+        for batch in result.partitions():
+            for (val,) in batch:
+                yield val
+    finally:
+        result.close()
+
+
+def cypher_rows(
+    session: Session,
+    cypher: str,
+    *,
+    columns: Sequence[str],
+    params: Optional[dict[str, Any]] = None,
+    graph_name: Optional[str] = None,
+    decode: bool = True,
+) -> list[tuple[Any, ...]]:
+    """
+    Execute cypher() with a multi-column spec (`AS (a agtype, b agtype, ...)`) and return
+    one tuple per row.
+
+    The cypher RETURN clause must produce exactly `len(columns)` values. agtype values are
+    decoded client-side with decode_agtype (no agtype_to_json() on the server); pass
+    decode=False to get the raw agtype text.
+    """
+    cfg = _cfg(session, graph_name)
+    sql = _cypher_rows_sql(cfg, cypher, columns)
+    rows = session.execute(sql, {"params": json.dumps(params or {})}).all()
+    if not decode:
+        return [tuple(r) for r in rows]
+    return [tuple(decode_agtype(v) for v in r) for r in rows]
+
+
+def iter_cypher_rows(
+    session: Session,
+    cypher: str,
+    *,
+    columns: Sequence[str],
+    params: Optional[dict[str, Any]] = None,
+    graph_name: Optional[str] = None,
+    decode: bool = True,
+    batch_size: int = 1000,
+) -> Iterator[tuple[Any, ...]]:
+    """
+    Streaming variant of cypher_rows (server-side cursor, see iter_cypher_json).
+    """
+    cfg = _cfg(session, graph_name)
+    sql = _cypher_rows_sql(cfg, cypher, columns)
+
+    result = session.execute(
+        sql,
+        {"params": json.dumps(params or {})},
+        execution_options={"stream_results": True, "yield_per": int(batch_size)},
+    )
+    try:
+        for batch in result.partitions():
+            for r in batch:
+                yield tuple(decode_agtype(v) for v in r) if decode else tuple(r)
+    finally:
+        result.close()
+
+
+async def cypher_json_async(
+    session: "AsyncSession",
+    cypher: str,
+    *,
+    params: Optional[dict[str, Any]] = None,
+    graph_name: Optional[str] = None,
+    returns_alias: str = "row",
+) -> list[Any]:
+    """
+    asyncio counterpart of cypher_json for an AsyncSession.
+    """
+    cfg = _cfg(session.sync_session, graph_name)
+    params = params or {}
+    sql = _cypher_sql(cfg, cypher, returns_alias=returns_alias)
+
+    result = await session.execute(
+        sql,
+        {"params": json.dumps(params)},
+    )
+    return [val for (val,) in result.all()]
@@ -1,12 +1,147 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
-from pgvector.psycopg import register_vector
+from pgvector.psycopg import register_vector, register_vector_async
 
 from .config import AGEGraphConfig
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+# Key in the pool record's `.info` (== `Connection.info`) holding the search_path that
+# was applied to that DBAPI connection. Absent -> the connection needs bootstrapping.
+_BOOTSTRAP_KEY = "agegraph_bootstrapped_search_path"
+
+
+@dataclass
+class AGEBootstrapStats:
+    """
+    Counters for the per-connection AGE bootstrap (LOAD 'age' + SET search_path).
+
+    `checkouts - bootstraps` is the number of round trips saved by tracking init per
+    physical connection.
+    """
+
+    checkouts: int = 0
+    bootstraps: int = 0
+    invalidations: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def _bump(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "bootstraps": self.bootstraps,
+                "invalidations": self.invalidations,
+            }
+
+
+def _bootstrap_connection(
+    dbapi_conn: Any,
+    info: dict[str, Any],
+    cfg: AGEGraphConfig,
+    stats: Optional[AGEBootstrapStats] = None,
+    *,
+    force: bool = False,
+) -> bool:
+    """
+    Run LOAD 'age' + SET search_path unless this DBAPI connection was already initialized
+    for `cfg.search_path`. Returns True when the bootstrap actually ran.
+
+    The SET is committed so that a later ROLLBACK (e.g. the pool's reset-on-return)
+    can't undo it.
+    """
+    if stats is not None:
+        stats._bump("checkouts")
+    if not force and info.get(_BOOTSTRAP_KEY) == cfg.search_path:
+        return False
+
+    cur = dbapi_conn.cursor()
+    try:
+        cur.execute("LOAD 'age';")
+        cur.execute(f"SET search_path = {cfg.search_path};")
+    finally:
+        cur.close()
+    dbapi_conn.commit()
+
+    info[_BOOTSTRAP_KEY] = cfg.search_path
+    if stats is not None:
+        stats._bump("bootstraps")
+    return True
+
+
+def reset_age_bootstrap(conn: Any) -> None:
+    """
+    Mark a connection as needing the AGE bootstrap again on its next checkout.
+
+    Call this after running something that clears session state behind the pool's back
+    (`DISCARD ALL`, `RESET search_path`, ...). Accepts a Connection or Session.
+    """
+    if hasattr(conn, "get_bind"):
+        # Session.info is session-scoped; the pool record info hangs off its Connection.
+        conn = conn.connection()
+    conn.info.pop(_BOOTSTRAP_KEY, None)
+
+
+def _install_age_listeners(
+    engine: Engine,
+    cfg: AGEGraphConfig,
+    *,
+    async_driver: bool = False,
+    bootstrap_every_checkout: bool = False,
+) -> AGEBootstrapStats:
+    """
+    Pool listeners shared by the sync and async factories. For async engines pass
+    `engine.sync_engine`; the DBAPI connection is then SQLAlchemy's adapted psycopg
+    AsyncConnection, whose cursor runs awaitables for us.
+
+    The bootstrap runs once per physical connection (and again if `engine.agegraph_cfg`
+    gets a different search_path). Invalidated connections are replaced by fresh ones,
+    whose record info starts empty.
+    """
+    stats = AGEBootstrapStats()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):  # noqa: ANN001
+        try:
+            if async_driver:
+                dbapi_conn.run_async(register_vector_async)
+            else:
+                register_vector(dbapi_conn)
+        except Exception:
+            # Adapter registration shouldn't break startup; server-side errors will surface on query.
+            pass
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, _proxy):  # noqa: ANN001
+        current = getattr(engine, "agegraph_cfg", None) or cfg
+        _bootstrap_connection(dbapi_conn, record.info, current, stats, force=bootstrap_every_checkout)
+
+    @event.listens_for(engine, "invalidate")
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_invalidate(_dbapi_conn, record, _exc):  # noqa: ANN001
+        if record.info.pop(_BOOTSTRAP_KEY, None) is not None:
+            stats._bump("invalidations")
+
+    return stats
+
+
+def _connect_args(connect_args: Optional[dict[str, Any]], prepare_threshold: Optional[int]) -> dict[str, Any]:
+    out = dict(connect_args or {})
+    if prepare_threshold is not None:
+        out.setdefault("prepare_threshold", prepare_threshold)
+    return out
+
+
 def create_engine_all_in_one(
     url: str,
     *,
@@ -15,11 +150,22 @@ def create_engine_all_in_one(
     echo: bool = False,
     pool_pre_ping: bool = True,
     connect_args: Optional[dict[str, Any]] = None,
+    bootstrap_every_checkout: bool = False,
+    prepare_threshold: Optional[int] = None,
 ) -> Engine:
     """
     Engine that is safe with pooling:
       - registers pgvector adapters on connect
-      - runs LOAD 'age' + SET search_path on every checkout
+      - runs LOAD 'age' + SET search_path once per pooled connection
+        (bootstrap_every_checkout=True restores the old per-checkout behaviour, e.g. behind
+        a transaction-pooling PgBouncer where server connections change under the pool)
+
+    Bootstrap counters are available as `engine.agegraph_bootstrap_stats`.
+
+    prepare_threshold is passed to psycopg: after that many executions of the same SQL the
+    driver uses a server-side prepared statement (0 = prepare immediately, None = driver
+    default). cypher() wrappers are cached (see age_search.cypher), so hot graph queries
+    such as GraphNodeMixin.graph_upsert reuse one prepared statement per connection.
     """
     cfg = AGEGraphConfig(graph_name=graph_name, search_path=search_path)
 
@@ -27,26 +173,57 @@ def create_engine_all_in_one(
         url,
         echo=echo,
         pool_pre_ping=pool_pre_ping,
-        connect_args=connect_args or {},
+        connect_args=_connect_args(connect_args, prepare_threshold),
     )
+    stats = _install_age_listeners(engine, cfg, bootstrap_every_checkout=bootstrap_every_checkout)
 
-    @event.listens_for(engine, "connect")
-    def _on_connect(dbapi_conn, _record):  # noqa: ANN001
-        try:
-            register_vector(dbapi_conn)
-        except Exception:
-            # Adapter registration shouldn't break startup; server-side errors will surface on query.
-            pass
+    # SQLAlchemy Engine does not guarantee an `.info` dict; store config on the engine itself.
+    setattr(engine, "agegraph_cfg", cfg)
+    setattr(engine, "agegraph_bootstrap_stats", stats)
+    return engine
 
-    @event.listens_for(engine, "checkout")
-    def _on_checkout(dbapi_conn, _record, _proxy):  # noqa: ANN001
-        cur = dbapi_conn.cursor()
-        try:
-            cur.execute("LOAD 'age';")
-            cur.execute(f"SET search_path = {cfg.search_path};")
-        finally:
-            cur.close()
 
-    # SQLAlchemy Engine does not guarantee an `.info` dict; store config on the engine itself.
+def create_async_engine_all_in_one(
+    url: str,
+    *,
+    graph_name: str = "knowledge_graph",
+    search_path: str = "ag_catalog, public",
+    echo: bool = False,
+    pool_pre_ping: bool = True,
+    connect_args: Optional[dict[str, Any]] = None,
+    bootstrap_every_checkout: bool = False,
+    prepare_threshold: Optional[int] = None,
+) -> "AsyncEngine":
+    """
+    asyncio counterpart of create_engine_all_in_one (use a `postgresql+psycopg://` URL):
+      - registers pgvector adapters on the psycopg AsyncConnection on connect
+      - runs LOAD 'age' + SET search_path once per pooled connection
+
+    prepare_threshold: see create_engine_all_in_one.
+
+    Requires SQLAlchemy's asyncio extra (`pip install "age_search[asyncio]"`).
+    """
+    # Imported lazily: sqlalchemy.ext.asyncio needs greenlet, which sync users don't need.
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    cfg = AGEGraphConfig(graph_name=graph_name, search_path=search_path)
+
+    engine = create_async_engine(
+        url,
+        echo=echo,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=_connect_args(connect_args, prepare_threshold),
+    )
+    stats = _install_age_listeners(
+        engine.sync_engine,
+        cfg,
+        async_driver=True,
+        bootstrap_every_checkout=bootstrap_every_checkout,
+    )
+
+    # AsyncSession.sync_session.get_bind() returns the sync engine, so tag both.
     setattr(engine, "agegraph_cfg", cfg)
+    setattr(engine.sync_engine, "agegraph_cfg", cfg)
+    setattr(engine, "agegraph_bootstrap_stats", stats)
+    setattr(engine.sync_engine, "agegraph_bootstrap_stats", stats)
     return engine
@@ -1,3 +1,14 @@
 class AGEGraphError(RuntimeError): ...
 class ExtensionMissingError(RuntimeError): ...
 class MisconfiguredModelError(RuntimeError): ...
+class LegTimeoutError(TimeoutError): ...
+
+
+class OutboxBatchError(RuntimeError):
+    """
+    Applying a claimed outbox batch failed; `ids` are the claimed outbox row ids.
+    """
+
+    def __init__(self, ids, message: str = "outbox batch failed"):
+        super().__init__(message)
+        self.ids = list(ids)
@@ -1,22 +1,108 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional, Type
+from typing import Any, Literal, Optional, Type
 
-from sqlalchemy import event
+from sqlalchemy import Table, event
 from sqlalchemy.orm import Session
 
-from .mixins_graph import GraphNodeMixin
+from .mixins_graph import GraphNodeMixin, graph_delete_ids, graph_upsert_rows
+from .outbox import write_outbox_rows
+
+GraphSyncMode = Literal["flush", "immediate", "outbox"]
+
+# session.info key holding pending graph changes: {(model, id): (op, props)}
+_QUEUE_KEY = "agegraph_sync_queue"
 
 
 @dataclass(frozen=True)
 class GraphSyncOptions:
     enabled: bool = True
     detach_delete: bool = True
-    # If True, graph_upsert runs even if session is flushing bulk changes
+    # "flush": queue changes per session and apply them as batched UNWIND calls once per flush
+    # "immediate": one graph_upsert / graph_delete per row from the mapper events
+    # "outbox": write change records to `outbox` (see age_search.outbox); a worker applies them
+    mode: GraphSyncMode = "flush"
+    outbox: Optional[Table] = None
+    # Rows per UNWIND batch in "flush" mode
+    batch_size: int = 1000
+    # mode="immediate" only: if True, graph_upsert runs even if session is flushing bulk changes
     allow_in_flush: bool = False
 
 
+def _queue(session: Session) -> dict[tuple[Any, Any], tuple[str, Any, GraphSyncOptions]]:
+    return session.info.setdefault(_QUEUE_KEY, {})
+
+
+def _enqueue(session: Session, target: Any, op: str, options: GraphSyncOptions) -> None:
+    key = (type(target), target.graph_id())
+    q = _queue(session)
+    # Last change wins; re-insert so the op keeps its latest position.
+    q.pop(key, None)
+    q[key] = (op, target.graph_properties() if op == "upsert" else None, options)
+
+
+def flush_graph_sync_queue(session: Session) -> None:
+    """
+    Apply queued graph changes for `session`: upserts and deletes grouped per model and
+    sent as batched UNWIND calls. Runs automatically after every flush.
+    """
+    q = session.info.pop(_QUEUE_KEY, None)
+    if not q:
+        return
+
+    upserts: dict[Any, list[dict[str, Any]]] = {}
+    deletes: dict[Any, list[Any]] = {}
+    opts: dict[Any, GraphSyncOptions] = {}
+    outbox: dict[Any, list[dict[str, Any]]] = {}
+    for (model, _id), (op, props, options) in q.items():
+        opts[model] = options
+        if options.mode == "outbox":
+            if op == "delete" and options.detach_delete:
+                op = "detach_delete"
+            outbox.setdefault(options.outbox, []).append(
+                {"label": model._label(), "key": model.vertex_property_key, "node_id": _id, "op": op, "props": props}
+            )
+        elif op == "upsert":
+            upserts.setdefault(model, []).append({"id": _id, "props": props})
+        else:
+            deletes.setdefault(model, []).append(_id)
+
+    for table, rows in outbox.items():
+        write_outbox_rows(session, table, rows)
+    for model, ids in deletes.items():
+        graph_delete_ids(
+            session,
+            model._label(),
+            ids,
+            key=model.vertex_property_key,
+            detach=opts[model].detach_delete,
+            batch_size=opts[model].batch_size,
+        )
+    for model, rows in upserts.items():
+        graph_upsert_rows(
+            session,
+            model._label(),
+            rows,
+            key=model.vertex_property_key,
+            batch_size=opts[model].batch_size,
+        )
+
+
+def _on_after_flush_postexec(session: Session, _flush_context: Any) -> None:
+    flush_graph_sync_queue(session)
+
+
+def _on_rollback(session: Session, *_args: Any) -> None:
+    session.info.pop(_QUEUE_KEY, None)
+
+
+def _install_session_listeners() -> None:
+    if not event.contains(Session, "after_flush_postexec", _on_after_flush_postexec):
+        event.listen(Session, "after_flush_postexec", _on_after_flush_postexec)
+        event.listen(Session, "after_soft_rollback", _on_rollback)
+
+
 def install_graph_sync(model: Type[Any], *, options: GraphSyncOptions = GraphSyncOptions()) -> None:
     """
     Install SQLAlchemy ORM event hooks for a model that includes GraphNodeMixin.
@@ -25,40 +111,45 @@ def install_graph_sync(model: Type[Any], *, options: GraphSyncOptions = GraphSyn
     Behavior:
       - after_insert / after_update: graph_upsert()
       - after_delete: graph_delete(detach=...)
+
+    With mode="flush" (default) changes are queued on the session, repeated changes to the
+    same id are merged, and the queue is applied with graph_upsert_rows / graph_delete_ids
+    at the end of each flush, in the same transaction. mode="outbox" writes the same
+    merged changes to the outbox table instead, for `agegraph sync-worker` to apply.
     """
 
     if not issubclass(model, GraphNodeMixin):
         raise TypeError("install_graph_sync expects a model subclassing GraphNodeMixin")
 
-    @event.listens_for(model, "after_insert", propagate=True)
-    def _after_insert(mapper, connection, target):  # noqa: ANN001
+    if options.mode == "outbox" and options.outbox is None:
+        raise ValueError('GraphSyncOptions(mode="outbox") requires an outbox table (make_graph_outbox_table)')
+    if options.mode in ("flush", "outbox"):
+        _install_session_listeners()
+
+    def _handle(target: Any, op: str) -> None:
         if not options.enabled:
             return
         sess: Optional[Session] = Session.object_session(target)
         if sess is None:
             return
+        if options.mode != "immediate":
+            _enqueue(sess, target, op, options)
+            return
         if sess._flushing and not options.allow_in_flush:  # type: ignore[attr-defined]
             return
-        target.graph_upsert(sess)
+        if op == "upsert":
+            target.graph_upsert(sess)
+        else:
+            target.graph_delete(sess, detach=options.detach_delete)
+
+    @event.listens_for(model, "after_insert", propagate=True)
+    def _after_insert(mapper, connection, target):  # noqa: ANN001
+        _handle(target, "upsert")
 
     @event.listens_for(model, "after_update", propagate=True)
     def _after_update(mapper, connection, target):  # noqa: ANN001
-        if not options.enabled:
-            return
-        sess: Optional[Session] = Session.object_session(target)
-        if sess is None:
-            return
-        if sess._flushing and not options.allow_in_flush:  # type: ignore[attr-defined]
-            return
-        target.graph_upsert(sess)
+        _handle(target, "upsert")
 
     @event.listens_for(model, "after_delete", propagate=True)
     def _after_delete(mapper, connection, target):  # noqa: ANN001
-        if not options.enabled:
-            return
-        sess: Optional[Session] = Session.object_session(target)
-        if sess is None:
-            return
-        if sess._flushing and not options.allow_in_flush:  # type: ignore[attr-defined]
-            return
-        target.graph_delete(sess, detach=options.detach_delete)
+        _handle(target, "delete")
@@ -1,8 +1,13 @@
 from __future__ import annotations
-from typing import Sequence, Type, TypeVar
+from typing import TYPE_CHECKING, Optional, Sequence, Type, TypeVar
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .cypher import cypher_json
+from .hybrid_sql import hybrid_search_results_sql, hybrid_search_results_sql_async
+from .legs import hybrid_legs, hybrid_legs_async
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar("T")
 
@@ -23,26 +28,102 @@ def hybrid_search(
     k_vec: int = 50,
     limit: int = 20,
     prefer_bm25: bool = True,
+    single_statement: bool = False,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
 ) -> list[T]:
-    # lexical candidates
-    lex_ids: list[int] = []
-    if prefer_bm25 and hasattr(model, "bm25_search"):
-        rows = model.bm25_search(session, query_text, k=k_lex)  # type: ignore
-        lex_ids = [int(r[0]) for r in rows]
-    elif hasattr(model, "fts_search"):
-        lex_ids = [int(o.id) for o in model.fts_search(session, query_text, k=k_lex)]  # type: ignore
+    """
+    RRF hybrid search returning ORM objects in fused order.
+
+    With single_statement=True both legs, fusion and hydration run as one SQL statement
+    (one round trip instead of three); see `age_search.hybrid_sql.hybrid_select`.
+    With parallel=True the two legs run concurrently on separate pooled connections,
+    each bounded by `leg_timeout` seconds.
+    """
+    if single_statement:
+        results = hybrid_search_results_sql(
+            session,
+            model,
+            query_text=query_text,
+            query_vec=query_vec,
+            k_lex=k_lex,
+            k_vec=k_vec,
+            limit=limit,
+            prefer_bm25=prefer_bm25,
+            with_snippet=False,
+        )
+        return [r.obj for r in results if r.obj is not None]
 
-    # vector candidates
-    vec_objs = model.vector_search(session, query_vec, k=k_vec, distance="cosine")  # type: ignore
-    vec_ids = [int(o.id) for o in vec_objs]
+    # lexical + vector candidates (ids/scores only; no embeddings shipped)
+    lex, vec = hybrid_legs(
+        session,
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        prefer_bm25=prefer_bm25,
+        parallel=parallel,
+        leg_timeout=leg_timeout,
+    )
 
-    fused = rrf([lex_ids, vec_ids], limit=limit)
+    fused = rrf([lex.ids, vec.ids], limit=limit)
     if not fused:
         return []
     rows = session.execute(select(model).where(model.id.in_(fused))).scalars().all()  # type: ignore
     by_id = {int(r.id): r for r in rows}  # type: ignore
     return [by_id[i] for i in fused if i in by_id]
 
+async def hybrid_search_async(
+    session: "AsyncSession",
+    model: Type[T],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    limit: int = 20,
+    prefer_bm25: bool = True,
+    single_statement: bool = False,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
+) -> list[T]:
+    """
+    asyncio counterpart of hybrid_search (legs use the model's *_async search methods).
+    """
+    if single_statement:
+        results = await hybrid_search_results_sql_async(
+            session,
+            model,
+            query_text=query_text,
+            query_vec=query_vec,
+            k_lex=k_lex,
+            k_vec=k_vec,
+            limit=limit,
+            prefer_bm25=prefer_bm25,
+            with_snippet=False,
+        )
+        return [r.obj for r in results if r.obj is not None]
+
+    lex, vec = await hybrid_legs_async(
+        session,
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        prefer_bm25=prefer_bm25,
+        parallel=parallel,
+        leg_timeout=leg_timeout,
+    )
+
+    fused = rrf([lex.ids, vec.ids], limit=limit)
+    if not fused:
+        return []
+    rows = (await session.execute(select(model).where(model.id.in_(fused)))).scalars().all()  # type: ignore
+    by_id = {int(r.id): r for r in rows}  # type: ignore
+    return [by_id[i] for i in fused if i in by_id]
+
 def graph_expand_ids(
     session: Session,
     *,
@@ -1,21 +1,18 @@
 from __future__ import annotations
 
-from typing import Sequence, Type, TypeVar
+from typing import TYPE_CHECKING, Optional, Sequence, Type, TypeVar
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from .hybrid_sql import hybrid_search_results_sql, hybrid_search_results_sql_async
+from .legs import build_results, fuse, hybrid_legs, hybrid_legs_async
 from .results import SearchResult
 
-T = TypeVar("T")
-
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
-def _rrf_scores(ranked_ids: list[list[int]], *, k: int = 60) -> dict[int, float]:
-    scores: dict[int, float] = {}
-    for ids in ranked_ids:
-        for r, _id in enumerate(ids, start=1):
-            scores[_id] = scores.get(_id, 0.0) + 1.0 / (k + r)
-    return scores
+T = TypeVar("T")
 
 
 def hybrid_search_results(
@@ -30,34 +27,48 @@ def hybrid_search_results(
     prefer_bm25: bool = True,
     rrf_k: int = 60,
     fetch_objects: bool = True,
+    single_statement: bool = False,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
 ) -> list[SearchResult[T]]:
-    # ---------- lexical ----------
-    lex_ids: list[int] = []
-    bm25_scores: dict[int, float] = {}
-    snippets: dict[int, str] = {}
-    fts_ranks: dict[int, float] = {}
-
-    if prefer_bm25 and hasattr(model, "bm25_search"):
-        rows = model.bm25_search(session, query_text, k=k_lex, with_snippet=True)  # type: ignore
-        # rows: (id, score, snippet?)
-        for i, row in enumerate(rows, start=1):
-            _id = int(row[0])
-            lex_ids.append(_id)
-            bm25_scores[_id] = float(row[1]) if row[1] is not None else None  # type: ignore[assignment]
-            if len(row) >= 3 and row[2] is not None:
-                snippets[_id] = str(row[2])
-    elif hasattr(model, "fts_search"):
-        # fts_search returns objects; rank not exposed in our earlier mixin
-        objs = model.fts_search(session, query_text, k=k_lex)  # type: ignore
-        lex_ids = [int(o.id) for o in objs]
-
-    # ---------- semantic ----------
-    vec_objs = model.vector_search(session, query_vec, k=k_vec, distance="cosine")  # type: ignore
-    vec_ids = [int(o.id) for o in vec_objs]
+    """
+    RRF hybrid search returning `SearchResult`s with per-leg scores and ranks.
+
+    With single_statement=True the lexical leg, vector leg, fusion and hydration are sent as
+    one CTE-based statement instead of three round trips.
+    With parallel=True the two legs run concurrently on separate pooled connections
+    (bounded by `leg_timeout` seconds each); fusion order does not depend on which finishes first.
+    """
+    if single_statement:
+        return hybrid_search_results_sql(
+            session,
+            model,
+            query_text=query_text,
+            query_vec=query_vec,
+            k_lex=k_lex,
+            k_vec=k_vec,
+            limit=limit,
+            prefer_bm25=prefer_bm25,
+            rrf_k=rrf_k,
+            fetch_objects=fetch_objects,
+        )
+
+    # ---------- legs ----------
+    lex, vec = hybrid_legs(
+        session,
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        prefer_bm25=prefer_bm25,
+        with_snippet=True,
+        parallel=parallel,
+        leg_timeout=leg_timeout,
+    )
 
     # ---------- fuse ----------
-    rrf = _rrf_scores([lex_ids, vec_ids], k=rrf_k)
-    fused = sorted(rrf.keys(), key=lambda i: rrf[i], reverse=True)[:limit]
+    fused, rrf = fuse(lex, vec, rrf_k=rrf_k, limit=limit)
 
     # ---------- hydrate ----------
     obj_map: dict[int, T] = {}
@@ -65,22 +76,60 @@ def hybrid_search_results(
         objs = session.execute(select(model).where(model.id.in_(fused))).scalars().all()  # type: ignore
         obj_map = {int(o.id): o for o in objs}  # type: ignore
 
-    # ranks
-    lex_rank = {i: r for r, i in enumerate(lex_ids, start=1)}
-    sem_rank = {i: r for r, i in enumerate(vec_ids, start=1)}
-
-    out: list[SearchResult[T]] = []
-    for _id in fused:
-        out.append(
-            SearchResult(
-                id=_id,
-                obj=obj_map.get(_id),
-                bm25_score=bm25_scores.get(_id),
-                fts_rank=fts_ranks.get(_id),
-                snippet=snippets.get(_id),
-                lexical_rank=lex_rank.get(_id),
-                semantic_rank=sem_rank.get(_id),
-                rrf_score=rrf.get(_id),
-            )
+    return build_results(fused, rrf, lex, vec, obj_map)
+
+
+async def hybrid_search_results_async(
+    session: "AsyncSession",
+    model: Type[T],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    limit: int = 20,
+    prefer_bm25: bool = True,
+    rrf_k: int = 60,
+    fetch_objects: bool = True,
+    single_statement: bool = False,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
+) -> list[SearchResult[T]]:
+    """
+    asyncio counterpart of hybrid_search_results (legs use the model's *_async search methods).
+    """
+    if single_statement:
+        return await hybrid_search_results_sql_async(
+            session,
+            model,
+            query_text=query_text,
+            query_vec=query_vec,
+            k_lex=k_lex,
+            k_vec=k_vec,
+            limit=limit,
+            prefer_bm25=prefer_bm25,
+            rrf_k=rrf_k,
+            fetch_objects=fetch_objects,
         )
-    return out
+
+    lex, vec = await hybrid_legs_async(
+        session,
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        prefer_bm25=prefer_bm25,
+        with_snippet=True,
+        parallel=parallel,
+        leg_timeout=leg_timeout,
+    )
+
+    fused, rrf = fuse(lex, vec, rrf_k=rrf_k, limit=limit)
+
+    obj_map: dict[int, T] = {}
+    if fetch_objects and fused:
+        result = await session.execute(select(model).where(model.id.in_(fused)))  # type: ignore
+        obj_map = {int(o.id): o for o in result.scalars().all()}  # type: ignore
+
+    return build_results(fused, rrf, lex, vec, obj_map)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import Sequence, Type, TypeVar
+from typing import Optional, Sequence, Type, TypeVar
 
 from sqlalchemy import Table
 from sqlalchemy.orm import Session
 
 from .hybrid_graph import hybrid_search_results_constrained
+from .legs import VectorStrategy
 from .results import SearchResult
 from .taxonomy import descendant_label_ids, doc_ids_for_labels
 
@@ -27,6 +28,9 @@ def hybrid_search_results_in_label_subtree_relational(
     prefer_bm25: bool = True,
     rrf_k: int = 60,
     fetch_objects: bool = True,
+    vector_strategy: VectorStrategy = "auto",
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
 ) -> list[SearchResult[T]]:
     """
     Relational-only label-subtree constrained hybrid search:
@@ -48,5 +52,8 @@ def hybrid_search_results_in_label_subtree_relational(
         prefer_bm25=prefer_bm25,
         rrf_k=rrf_k,
         fetch_objects=fetch_objects,
+        vector_strategy=vector_strategy,
+        parallel=parallel,
+        leg_timeout=leg_timeout,
     )
 
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence, Type, TypeVar
+
+from sqlalchemy import Float, Integer, Select, String, cast, func, null, select
+from sqlalchemy.orm import Session
+
+from .results import SearchResult
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+def _lexical_cte(
+    model: Type[Any],
+    *,
+    query_text: str,
+    k_lex: int,
+    prefer_bm25: bool,
+    with_snippet: bool,
+):
+    pk = model.id  # type: ignore[attr-defined]
+    if prefer_bm25 and hasattr(model, "bm25_search"):
+        score = model._bm25_score_expr()  # type: ignore[attr-defined]
+        if with_snippet:
+            field_col = model.__table__.c[model.bm25_default_field]  # type: ignore[attr-defined]
+            snippet = func.paradedb.snippet(field_col)
+        else:
+            snippet = cast(null(), String)
+        stmt = select(
+            pk.label("id"),
+            cast(score, Float).label("bm25_score"),
+            cast(null(), Float).label("fts_rank"),
+            snippet.label("snippet"),
+            func.row_number().over(order_by=score.desc()).label("lex_rank"),
+        ).where(model._bm25_match_expr(query_text))  # type: ignore[attr-defined]
+        return stmt.order_by(score.desc()).limit(int(k_lex)).cte("lex")
+
+    if hasattr(model, "fts_search"):
+        tsq = model._fts_tsquery(query_text)  # type: ignore[attr-defined]
+        rank = func.ts_rank_cd(model.content_tsv, tsq)  # type: ignore[attr-defined]
+        stmt = select(
+            pk.label("id"),
+            cast(null(), Float).label("bm25_score"),
+            cast(rank, Float).label("fts_rank"),
+            cast(null(), String).label("snippet"),
+            func.row_number().over(order_by=rank.desc()).label("lex_rank"),
+        ).where(model.content_tsv.op("@@")(tsq))  # type: ignore[attr-defined]
+        return stmt.order_by(rank.desc()).limit(int(k_lex)).cte("lex")
+
+    return None
+
+
+def _vector_cte(model: Type[Any], *, query_vec: Sequence[float], k_vec: int):
+    pk = model.id  # type: ignore[attr-defined]
+    dist = model._distance_expr(query_vec, "cosine")  # type: ignore[attr-defined]
+    stmt = select(
+        pk.label("id"),
+        dist.label("vector_distance"),
+        func.row_number().over(order_by=dist).label("semantic_rank"),
+    )
+    # Quantized models: same coarse pass + exact re-rank as vector_search_ids.
+    limit = model._rerank_limit(k_vec, None)  # type: ignore[attr-defined]
+    if limit is not None:
+        stmt = stmt.where(
+            model._coarse_candidates(query_vec, limit=limit, distance="cosine")  # type: ignore[attr-defined]
+        )
+    return stmt.order_by(dist).limit(int(k_vec)).cte("vec")
+
+
+def hybrid_select(
+    model: Type[T],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    limit: int = 20,
+    prefer_bm25: bool = True,
+    rrf_k: int = 60,
+    with_snippet: bool = True,
+    fetch_objects: bool = True,
+) -> Select:
+    """
+    Build one CTE-based statement for hybrid search:
+      lex    -> BM25 (or FTS fallback) top-k_lex with row_number() ranks
+      vec    -> cosine top-k_vec with row_number() ranks (on a quantized model: coarse
+                top-k_vec * vector_oversample on the compact index, re-ranked exactly)
+      fused  -> FULL OUTER JOIN of both legs, RRF scored and limited in SQL
+      final  -> joined back to the model table (when fetch_objects=True)
+
+    Ties are broken the same way as the Python fusion: lexical rank first, then semantic rank.
+
+    hybrid_search_results_sql also applies the model's ANN settings before running it.
+    """
+    lex = _lexical_cte(
+        model,
+        query_text=query_text,
+        k_lex=k_lex,
+        prefer_bm25=prefer_bm25,
+        with_snippet=with_snippet,
+    )
+    vec = _vector_cte(model, query_vec=query_vec, k_vec=k_vec)
+
+    sem_rrf = func.coalesce(1.0 / (int(rrf_k) + cast(vec.c.semantic_rank, Float)), 0.0)
+    if lex is not None:
+        rrf = func.coalesce(1.0 / (int(rrf_k) + cast(lex.c.lex_rank, Float)), 0.0) + sem_rrf
+        fused_stmt = select(
+            func.coalesce(lex.c.id, vec.c.id).label("id"),
+            rrf.label("rrf_score"),
+            lex.c.lex_rank.label("lexical_rank"),
+            vec.c.semantic_rank,
+            lex.c.bm25_score,
+            lex.c.fts_rank,
+            lex.c.snippet,
+            vec.c.vector_distance,
+        ).select_from(lex.join(vec, lex.c.id == vec.c.id, full=True))
+        order = (rrf.desc(), lex.c.lex_rank.asc().nulls_last(), vec.c.semantic_rank.asc())
+    else:
+        fused_stmt = select(
+            vec.c.id,
+            sem_rrf.label("rrf_score"),
+            cast(null(), Integer).label("lexical_rank"),
+            vec.c.semantic_rank,
+            cast(null(), Float).label("bm25_score"),
+            cast(null(), Float).label("fts_rank"),
+            cast(null(), String).label("snippet"),
+            vec.c.vector_distance,
+        )
+        order = (vec.c.semantic_rank.asc(),)
+    fused = fused_stmt.order_by(*order).limit(int(limit)).cte("fused")
+
+    final_order = (
+        fused.c.rrf_score.desc(),
+        fused.c.lexical_rank.asc().nulls_last(),
+        fused.c.semantic_rank.asc(),
+    )
+    if fetch_objects:
+        pk = model.id  # type: ignore[attr-defined]
+        return select(model, *fused.c).join(fused, pk == fused.c.id).order_by(*final_order)
+    return select(*fused.c).order_by(*final_order)
+
+
+def _opt_int(v: Any) -> Any:
+    return int(v) if v is not None else None
+
+
+def _opt_float(v: Any) -> Any:
+    return float(v) if v is not None else None
+
+
+def hybrid_search_results_sql(
+    session: Session,
+    model: Type[T],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    limit: int = 20,
+    prefer_bm25: bool = True,
+    rrf_k: int = 60,
+    with_snippet: bool = True,
+    fetch_objects: bool = True,
+) -> list[SearchResult[T]]:
+    """
+    Single-round-trip variant of `hybrid_search_results`: both legs, RRF fusion and hydration
+    run as one statement (see `hybrid_select`). The vector leg uses the model's ann_ef_search /
+    ann_probes (or an enclosing ann_tuning block), raised on a quantized model to cover the
+    oversampled coarse pass.
+    """
+    stmt = hybrid_select(
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        limit=limit,
+        prefer_bm25=prefer_bm25,
+        rrf_k=rrf_k,
+        with_snippet=with_snippet,
+        fetch_objects=fetch_objects,
+    )
+    model._apply_ann_settings(  # type: ignore[attr-defined]
+        session, min_ef_search=model._rerank_limit(k_vec, None)  # type: ignore[attr-defined]
+    )
+    return _rows_to_results(session.execute(stmt).all(), fetch_objects=fetch_objects)
+
+
+async def hybrid_search_results_sql_async(
+    session: "AsyncSession",
+    model: Type[T],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    limit: int = 20,
+    prefer_bm25: bool = True,
+    rrf_k: int = 60,
+    with_snippet: bool = True,
+    fetch_objects: bool = True,
+) -> list[SearchResult[T]]:
+    """asyncio counterpart of `hybrid_search_results_sql`."""
+    stmt = hybrid_select(
+        model,
+        query_text=query_text,
+        query_vec=query_vec,
+        k_lex=k_lex,
+        k_vec=k_vec,
+        limit=limit,
+        prefer_bm25=prefer_bm25,
+        rrf_k=rrf_k,
+        with_snippet=with_snippet,
+        fetch_objects=fetch_objects,
+    )
+    await model._apply_ann_settings_async(  # type: ignore[attr-defined]
+        session, min_ef_search=model._rerank_limit(k_vec, None)  # type: ignore[attr-defined]
+    )
+    result = await session.execute(stmt)
+    return _rows_to_results(result.all(), fetch_objects=fetch_objects)
+
+
+def _rows_to_results(rows: Any, *, fetch_objects: bool) -> list[SearchResult[Any]]:
+    out: list[SearchResult[Any]] = []
+    for row in rows:
+        m = row._mapping
+        out.append(
+            SearchResult(
+                id=int(m["id"]),
+                obj=row[0] if fetch_objects else None,
+                bm25_score=_opt_float(m["bm25_score"]),
+                fts_rank=_opt_float(m["fts_rank"]),
+                snippet=m["snippet"],
+                lexical_rank=_opt_int(m["lexical_rank"]),
+                vector_distance=_opt_float(m["vector_distance"]),
+                semantic_rank=_opt_int(m["semantic_rank"]),
+                rrf_score=_opt_float(m["rrf_score"]),
+            )
+        )
+    return out
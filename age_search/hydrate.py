@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Sequence, Type, TypeVar
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, defer as defer_opt
+from sqlalchemy.orm.util import identity_key
+
+T = TypeVar("T")
+
+
+def hydrate(
+    session: Session,
+    model: Type[T],
+    ids: Sequence[Any],
+    *,
+    defer: Sequence[str] = (),
+) -> list[T]:
+    """
+    Turn ids (e.g. vertex id properties from cypher) into mapped instances with at most
+    one SELECT ... WHERE <graph_id_field> IN (...) (the primary key unless the model says otherwise).
+
+    - result order follows `ids`; ids without a row are dropped
+    - instances already in the session's identity map are reused, not re-selected
+    - `defer` names columns to load lazily (e.g. ("embedding",))
+    """
+    key_name = getattr(model, "graph_id_field", "id")
+    key_col = getattr(model, key_name)
+    mapper = inspect(model)
+
+    # The identity map is keyed by primary key. When the graph id is the (single-column)
+    # primary key, look ids up directly; otherwise match loaded instances by the attribute.
+    by_pk = list(mapper.primary_key) == list(mapper.get_property(key_name).columns)
+    loaded: dict[Any, Any] = {}
+    if not by_pk:
+        loaded = {getattr(o, key_name): o for o in session.identity_map.values() if isinstance(o, model)}
+
+    found: dict[Any, T] = {}
+    missing: list[Any] = []
+    for i in dict.fromkeys(ids):
+        obj = session.identity_map.get(identity_key(model, i)) if by_pk else loaded.get(i)
+        if obj is not None:
+            found[i] = obj  # type: ignore[assignment]
+        else:
+            missing.append(i)
+
+    if missing:
+        stmt = select(model).where(key_col.in_(missing))
+        if defer:
+            stmt = stmt.options(*(defer_opt(getattr(model, c)) for c in defer))
+        for obj in session.execute(stmt).scalars():
+            found[getattr(obj, key_name)] = obj
+
+    return [found[i] for i in ids if i in found]
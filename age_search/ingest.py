@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Type, Union
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    REAL,
+    Float,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from pgvector.sqlalchemy import VECTOR
+
+from .bulk import _batched, _copy_rows
+
+# Either an iterable of row dicts, or one sequence / numpy array per column
+# (e.g. {"id": ids, "content": texts, "embedding": float32 matrix}).
+IngestRows = Union[Iterable[Mapping[str, Any]], Mapping[str, Sequence[Any]]]
+
+_PREPARER = postgresql.dialect().identifier_preparer
+
+
+@dataclass
+class IngestReport:
+    rows: int = 0
+    batches: int = 0
+    deferred_indexes: list[str] = field(default_factory=list)
+
+
+def encode_vector(values: Any) -> bytes:
+    """
+    pgvector's binary wire format (uint16 dim, uint16 unused, big-endian float32s), built
+    straight from a float32 buffer when given a numpy array.
+    """
+    if hasattr(values, "astype"):
+        buf = values.astype(">f4", copy=False)
+        return struct.pack(">HH", buf.shape[0], 0) + buf.tobytes()
+    arr = array("f", values)
+    if sys.byteorder == "little":
+        arr.byteswap()
+    return struct.pack(">HH", len(arr), 0) + arr.tobytes()
+
+
+def _copy_type(col: Any) -> str:
+    """
+    Type name for psycopg's binary COPY. Vectors travel pre-encoded, which the bytea dumper
+    passes through untouched (binary COPY doesn't check field types; the column's
+    receive function parses the bytes).
+    """
+    t = col.type
+    if isinstance(t, VECTOR):
+        return "bytea"
+    if isinstance(t, BigInteger):
+        return "int8"
+    if isinstance(t, SmallInteger):
+        return "int2"
+    if isinstance(t, Integer):
+        return "int4"
+    if isinstance(t, Boolean):
+        return "bool"
+    if isinstance(t, REAL):
+        return "float4"
+    if isinstance(t, Float):
+        # Float(precision=p) is REAL for p <= 24 on Postgres, DOUBLE PRECISION otherwise.
+        return "float4" if t.precision is not None and t.precision <= 24 else "float8"
+    if isinstance(t, DateTime):
+        return "timestamptz" if t.timezone else "timestamp"
+    if isinstance(t, Date):
+        return "date"
+    if isinstance(t, JSONB):
+        return "jsonb"
+    if isinstance(t, JSON):
+        return "json"
+    if isinstance(t, LargeBinary):
+        return "bytea"
+    if isinstance(t, String):
+        return "text"
+    raise ValueError(f"No binary COPY type for column {col.name!r} ({t!r}); pass copy_types")
+
+
+def _iter_records(rows: IngestRows, columns: Sequence[str]) -> Iterator[tuple[Any, ...]]:
+    if isinstance(rows, Mapping):
+        # Convert 2-D arrays (embedding matrices) to big-endian float32 once, so each
+        # row's encode_vector is a header plus a buffer copy.
+        data = [
+            rows[c].astype(">f4", copy=False) if getattr(rows[c], "ndim", 1) == 2 else rows[c]
+            for c in columns
+        ]
+        yield from zip(*data)
+        return
+    for r in rows:
+        yield tuple(r.get(c) for c in columns)
+
+
+def _resolve_columns(tbl: Any, rows: IngestRows, columns: Optional[Sequence[str]]) -> tuple[list[str], IngestRows]:
+    if columns is None:
+        if isinstance(rows, Mapping):
+            columns = list(rows)
+        else:
+            it = iter(rows)
+            first = next(it, None)
+            if first is None:
+                return [], ()
+            columns = list(first)
+
+            def _chain() -> Iterator[Mapping[str, Any]]:
+                yield first
+                yield from it
+
+            rows = _chain()
+    for c in columns:
+        col = tbl.c.get(c)
+        if col is None:
+            raise ValueError(f"{tbl.name} has no column {c!r}")
+        if col.computed is not None:
+            raise ValueError(f"{c!r} is a generated column; Postgres computes it")
+    return list(columns), rows
+
+
+def _deferrable_indexes(session: Session, qualified: str) -> list[tuple[str, str]]:
+    """
+    (qualified name, CREATE INDEX statement) of the table's plain indexes: not primary
+    key / unique (ON CONFLICT needs those) and not backing a constraint.
+    """
+    rows = session.execute(
+        text(
+            """
+            SELECT format('%I.%I', n.nspname, i.relname), pg_get_indexdef(ix.indexrelid)
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_namespace n ON n.oid = i.relnamespace
+            WHERE ix.indrelid = CAST(:t AS regclass)
+              AND NOT ix.indisprimary AND NOT ix.indisunique
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = ix.indexrelid)
+            """
+        ),
+        {"t": qualified},
+    ).all()
+    return [(r[0], r[1]) for r in rows]
+
+
+def bulk_ingest(
+    session: Session,
+    model: Type[Any],
+    rows: IngestRows,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    batch_size: int = 10_000,
+    upsert: bool = False,
+    conflict_key: Sequence[str] = ("id",),
+    defer_indexes: bool = False,
+    maintenance_work_mem: Optional[str] = None,
+    copy_types: Optional[Mapping[str, str]] = None,
+) -> IngestReport:
+    """
+    Load rows into a model's table with binary COPY (psycopg), `batch_size` rows per COPY.
+
+    - `rows`: row dicts, or a mapping of column -> sequence / numpy array; `columns`
+      defaults to the keys of the first row (or of the mapping)
+    - vector columns are encoded to pgvector's binary format directly from float32
+      buffers (no text round trip)
+    - upsert=True copies each batch into a temp staging table, then
+      INSERT ... SELECT ... ON CONFLICT (`conflict_key`) DO UPDATE (the last of several
+      rows with the same key in a batch wins)
+    - defer_indexes=True drops the table's non-unique indexes (FTS, vector, ...) first and
+      recreates them at the end, optionally with a larger `maintenance_work_mem` for the
+      transaction. Unique / primary-key indexes are kept.
+
+    Generated columns (e.g. FTSSearchMixin.content_tsv) are computed by Postgres on insert.
+    Graph sync hooks are not involved (no ORM flush). Everything runs in the session's
+    transaction, so a failure leaves the table and its indexes as they were; the caller commits.
+    """
+    tbl = model.__table__
+    cols, rows = _resolve_columns(tbl, rows, columns)
+    report = IngestReport()
+    if not cols:
+        return report
+
+    overrides = dict(copy_types or {})
+    types = [overrides.get(c) or _copy_type(tbl.c[c]) for c in cols]
+    vec_pos = [i for i, c in enumerate(cols) if isinstance(tbl.c[c].type, VECTOR) and c not in overrides]
+    dims = {i: tbl.c[cols[i]].type.dim for i in vec_pos}
+
+    qualified = _PREPARER.format_table(tbl)
+    col_sql = ", ".join(_PREPARER.quote(c) for c in cols)
+
+    dropped: list[tuple[str, str]] = []
+    if defer_indexes:
+        dropped = _deferrable_indexes(session, qualified)
+        for name, _ddl in dropped:
+            session.execute(text(f"DROP INDEX {name}"))
+        report.deferred_indexes = [name for name, _ddl in dropped]
+
+    if upsert:
+        # Schema-qualified so a real table of the same name on the search_path is never touched.
+        staging = f"pg_temp.{_PREPARER.quote(f'_ingest_{tbl.name}')}"
+        session.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+        session.execute(
+            text(f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {col_sql} FROM {qualified} WITH NO DATA")
+        )
+        copy_sql = f"COPY {staging} ({col_sql}) FROM STDIN (FORMAT BINARY)"
+        stg = table(f"_ingest_{tbl.name}", *[column(c) for c in cols], schema="pg_temp")
+        ins = pg_insert(tbl).from_select(cols, select(*[stg.c[c] for c in cols]))
+        updates = {c: ins.excluded[c] for c in cols if c not in conflict_key}
+        if updates:
+            ins = ins.on_conflict_do_update(index_elements=list(conflict_key), set_=updates)
+        else:
+            ins = ins.on_conflict_do_nothing(index_elements=list(conflict_key))
+        key_pos = [cols.index(k) for k in conflict_key]
+    else:
+        copy_sql = f"COPY {qualified} ({col_sql}) FROM STDIN (FORMAT BINARY)"
+
+    for batch in _batched(_iter_records(rows, cols), batch_size):
+        n = len(batch)
+        if upsert:
+            # ON CONFLICT can't touch a row twice in one statement; the last duplicate wins.
+            batch = list({tuple(r[i] for i in key_pos): r for r in batch}.values())
+        if vec_pos:
+            batch = [_encode_vectors(r, vec_pos, dims) for r in batch]
+        _copy_rows(session, copy_sql, batch, types=types)
+        if upsert:
+            session.execute(ins)
+            session.execute(text(f"TRUNCATE {staging}"))
+        report.rows += n
+        report.batches += 1
+
+    if dropped:
+        if maintenance_work_mem:
+            session.execute(text("SELECT set_config('maintenance_work_mem', :m, true)"), {"m": maintenance_work_mem})
+        for _name, ddl in dropped:
+            session.execute(text(ddl))
+    return report
+
+
+def _encode_vectors(row: tuple[Any, ...], positions: Sequence[int], dims: Mapping[int, Optional[int]]) -> tuple[Any, ...]:
+    out = list(row)
+    for i in positions:
+        v = out[i]
+        if v is None:
+            continue
+        if dims[i] is not None and len(v) != dims[i]:
+            raise ValueError(f"expected {dims[i]} dimensions, got {len(v)}")
+        out[i] = encode_vector(v)
+    return tuple(out)
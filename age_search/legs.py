@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Literal, Optional, Sequence, Type
+
+from sqlalchemy import BigInteger, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from .parallel import run_legs, run_legs_async
+from .results import SearchResult
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class LexicalLeg:
+    ids: list[int] = field(default_factory=list)
+    bm25_scores: dict[int, Optional[float]] = field(default_factory=dict)
+    fts_ranks: dict[int, Optional[float]] = field(default_factory=dict)
+    snippets: dict[int, str] = field(default_factory=dict)
+
+
+@dataclass
+class VectorLeg:
+    ids: list[int] = field(default_factory=list)
+    distances: dict[int, Optional[float]] = field(default_factory=dict)
+
+
+VectorStrategy = Literal["auto", "exact", "hnsw"]
+
+
+def _opt_float(v: Any) -> Optional[float]:
+    return float(v) if v is not None else None
+
+
+def allowed_ids_predicate(model: Type[Any], allowed_ids: Sequence[int]):
+    """
+    `model.id = ANY(:allowed_ids)` with the ids sent as a single array parameter
+    (an IN list would bind one parameter per id).
+    """
+    ids = [int(i) for i in allowed_ids]
+    return model.id == any_(bindparam("allowed_ids", ids, type_=ARRAY(BigInteger)))
+
+
+def resolve_vector_strategy(strategy: VectorStrategy, n_allowed: int, *, exact_max_ids: int) -> str:
+    """
+    "auto" -> "exact" when the allowed set is small enough to score every row, else "hnsw"
+    (index scan with pgvector iterative scan so filtering doesn't starve the top-k).
+    """
+    if strategy == "auto":
+        return "exact" if n_allowed <= int(exact_max_ids) else "hnsw"
+    if strategy not in ("exact", "hnsw"):
+        raise ValueError(f"Unknown vector strategy: {strategy!r}")
+    return strategy
+
+
+def _lex_from_bm25_rows(rows: Any) -> LexicalLeg:
+    # rows: (id, score, snippet?)
+    leg = LexicalLeg()
+    for row in rows:
+        _id = int(row[0])
+        leg.ids.append(_id)
+        leg.bm25_scores[_id] = _opt_float(row[1]) if len(row) >= 2 else None
+        if len(row) >= 3 and row[2] is not None:
+            leg.snippets[_id] = str(row[2])
+    return leg
+
+
+def _lex_from_fts_rows(rows: Any) -> LexicalLeg:
+    # rows: (id, ts_rank_cd)
+    leg = LexicalLeg()
+    for row in rows:
+        _id = int(row[0])
+        leg.ids.append(_id)
+        leg.fts_ranks[_id] = _opt_float(row[1])
+    return leg
+
+
+def _lex_from_objects(objs: Any) -> LexicalLeg:
+    return LexicalLeg(ids=[int(o.id) for o in objs])
+
+
+def _vec_from_rows(rows: Any) -> VectorLeg:
+    # rows: (id, distance)
+    leg = VectorLeg()
+    for row in rows:
+        _id = int(row[0])
+        leg.ids.append(_id)
+        leg.distances[_id] = _opt_float(row[1])
+    return leg
+
+
+def _vec_from_objects(objs: Any) -> VectorLeg:
+    return VectorLeg(ids=[int(o.id) for o in objs])
+
+
+def _lexical_call(
+    model: Type[Any],
+    *,
+    prefer_bm25: bool,
+    with_snippet: bool,
+    allowed_ids: Optional[Sequence[int]],
+    suffix: str = "",
+) -> Optional[tuple[str, dict[str, Any], Callable[[Any], LexicalLeg]]]:
+    """
+    Pick the lexical method (by base name), its kwargs and the row parser.
+    `suffix="_async"` selects among the model's async methods instead.
+    """
+    if prefer_bm25 and hasattr(model, "bm25_search" + suffix):
+        kw: dict[str, Any] = {"with_snippet": True} if with_snippet else {}
+        if allowed_ids is not None:
+            kw["allowed_ids"] = allowed_ids
+        return "bm25_search", kw, _lex_from_bm25_rows
+    if hasattr(model, "fts_search_ids" + suffix):
+        where = allowed_ids_predicate(model, allowed_ids) if allowed_ids is not None else None
+        return "fts_search_ids", {"where": where}, _lex_from_fts_rows
+    if hasattr(model, "fts_search" + suffix):
+        return "fts_search", {}, _lex_from_objects
+    return None
+
+
+def _vector_call(
+    model: Type[Any],
+    *,
+    allowed_ids: Optional[Sequence[int]],
+    strategy: VectorStrategy,
+    exact_max_ids: int,
+    suffix: str = "",
+) -> tuple[str, dict[str, Any], Callable[[Any], VectorLeg]]:
+    kw: dict[str, Any] = {"distance": "cosine"}
+    if allowed_ids is not None:
+        kw["where"] = allowed_ids_predicate(model, allowed_ids)
+    if not hasattr(model, "vector_search_ids" + suffix):
+        return "vector_search", kw, _vec_from_objects
+    if allowed_ids is not None:
+        chosen = resolve_vector_strategy(strategy, len(allowed_ids), exact_max_ids=exact_max_ids)
+        if chosen == "exact":
+            kw["exact"] = True
+        else:
+            kw["iterative_scan"] = "relaxed_order"
+    return "vector_search_ids", kw, _vec_from_rows
+
+
+def lexical_leg(
+    session: Session,
+    model: Type[Any],
+    query_text: str,
+    *,
+    k: int = 50,
+    prefer_bm25: bool = True,
+    with_snippet: bool = False,
+    allowed_ids: Optional[Sequence[int]] = None,
+) -> LexicalLeg:
+    """
+    BM25 candidates if the model has bm25_search (and prefer_bm25), else FTS.
+    FTS goes through fts_search_ids when available so only (id, rank) leaves the database.
+
+    `allowed_ids` is pushed into the SQL of either leg (the object-returning fts_search
+    fallback has no filter hook; callers post-filter in that case).
+    """
+    call = _lexical_call(model, prefer_bm25=prefer_bm25, with_snippet=with_snippet, allowed_ids=allowed_ids)
+    if call is None:
+        return LexicalLeg()
+    name, kw, parse = call
+    return parse(getattr(model, name)(session, query_text, k=k, **kw))
+
+
+async def lexical_leg_async(
+    session: "AsyncSession",
+    model: Type[Any],
+    query_text: str,
+    *,
+    k: int = 50,
+    prefer_bm25: bool = True,
+    with_snippet: bool = False,
+    allowed_ids: Optional[Sequence[int]] = None,
+) -> LexicalLeg:
+    call = _lexical_call(
+        model,
+        prefer_bm25=prefer_bm25,
+        with_snippet=with_snippet,
+        allowed_ids=allowed_ids,
+        suffix="_async",
+    )
+    if call is None:
+        return LexicalLeg()
+    name, kw, parse = call
+    return parse(await getattr(model, name + "_async")(session, query_text, k=k, **kw))
+
+
+def vector_leg(
+    session: Session,
+    model: Type[Any],
+    query_vec: Sequence[float],
+    *,
+    k: int = 50,
+    allowed_ids: Optional[Sequence[int]] = None,
+    strategy: VectorStrategy = "auto",
+    exact_max_ids: int = 10_000,
+) -> VectorLeg:
+    """
+    Cosine candidates via vector_search_ids (id + distance only) when available,
+    else via vector_search (full objects, distance unknown).
+
+    With `allowed_ids` the filter is applied inside the query and `strategy` picks how:
+    "exact" scores every allowed row, "hnsw" uses the index with iterative scan.
+    """
+    name, kw, parse = _vector_call(
+        model, allowed_ids=allowed_ids, strategy=strategy, exact_max_ids=exact_max_ids
+    )
+    return parse(getattr(model, name)(session, query_vec, k=k, **kw))
+
+
+async def vector_leg_async(
+    session: "AsyncSession",
+    model: Type[Any],
+    query_vec: Sequence[float],
+    *,
+    k: int = 50,
+    allowed_ids: Optional[Sequence[int]] = None,
+    strategy: VectorStrategy = "auto",
+    exact_max_ids: int = 10_000,
+) -> VectorLeg:
+    name, kw, parse = _vector_call(
+        model,
+        allowed_ids=allowed_ids,
+        strategy=strategy,
+        exact_max_ids=exact_max_ids,
+        suffix="_async",
+    )
+    return parse(await getattr(model, name + "_async")(session, query_vec, k=k, **kw))
+
+
+def hybrid_legs(
+    session: Session,
+    model: Type[Any],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    prefer_bm25: bool = True,
+    with_snippet: bool = False,
+    allowed_ids: Optional[Sequence[int]] = None,
+    vector_strategy: VectorStrategy = "auto",
+    exact_max_ids: int = 10_000,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
+) -> tuple[LexicalLeg, VectorLeg]:
+    """
+    Run the lexical and vector legs, one after the other on `session` or, with parallel=True,
+    concurrently on separate pooled connections (see age_search.parallel.run_legs).
+
+    With parallel=True and leg_timeout set, a slow leg raises LegTimeoutError.
+    """
+
+    def _lex(s: Session) -> LexicalLeg:
+        return lexical_leg(
+            s,
+            model,
+            query_text,
+            k=k_lex,
+            prefer_bm25=prefer_bm25,
+            with_snippet=with_snippet,
+            allowed_ids=allowed_ids,
+        )
+
+    def _vec(s: Session) -> VectorLeg:
+        return vector_leg(
+            s,
+            model,
+            query_vec,
+            k=k_vec,
+            allowed_ids=allowed_ids,
+            strategy=vector_strategy,
+            exact_max_ids=exact_max_ids,
+        )
+
+    if not parallel:
+        return _lex(session), _vec(session)
+
+    lex, vec = run_legs(session, [_lex, _vec], timeout=leg_timeout)
+    return lex, vec  # type: ignore[return-value]
+
+
+async def hybrid_legs_async(
+    session: "AsyncSession",
+    model: Type[Any],
+    *,
+    query_text: str,
+    query_vec: Sequence[float],
+    k_lex: int = 50,
+    k_vec: int = 50,
+    prefer_bm25: bool = True,
+    with_snippet: bool = False,
+    allowed_ids: Optional[Sequence[int]] = None,
+    vector_strategy: VectorStrategy = "auto",
+    exact_max_ids: int = 10_000,
+    parallel: bool = False,
+    leg_timeout: Optional[float] = None,
+) -> tuple[LexicalLeg, VectorLeg]:
+    """
+    asyncio counterpart of hybrid_legs. parallel=True gathers both legs on separate
+    AsyncSessions (an AsyncSession can't run two statements at once).
+    """
+
+    def _lex(s: "AsyncSession") -> Awaitable[LexicalLeg]:
+        return lexical_leg_async(
+            s,
+            model,
+            query_text,
+            k=k_lex,
+            prefer_bm25=prefer_bm25,
+            with_snippet=with_snippet,
+            allowed_ids=allowed_ids,
+        )
+
+    def _vec(s: "AsyncSession") -> Awaitable[VectorLeg]:
+        return vector_leg_async(
+            s,
+            model,
+            query_vec,
+            k=k_vec,
+            allowed_ids=allowed_ids,
+            strategy=vector_strategy,
+            exact_max_ids=exact_max_ids,
+        )
+
+    if not parallel:
+        return await _lex(session), await _vec(session)
+
+    lex, vec = await run_legs_async(session, [_lex, _vec], timeout=leg_timeout)
+    return lex, vec  # type: ignore[return-value]
+
+
+def rrf_scores(ranked_ids: list[list[int]], *, k: int = 60) -> dict[int, float]:
+    scores: dict[int, float] = {}
+    for ids in ranked_ids:
+        for r, _id in enumerate(ids, start=1):
+            scores[_id] = scores.get(_id, 0.0) + 1.0 / (k + r)
+    return scores
+
+
+def fuse(lex: LexicalLeg, vec: VectorLeg, *, rrf_k: int = 60, limit: int = 20) -> tuple[list[int], dict[int, float]]:
+    """
+    RRF over (lexical, semantic). Ties keep first-seen order (lexical first), as sorted() is stable.
+    """
+    rrf = rrf_scores([lex.ids, vec.ids], k=rrf_k)
+    fused = sorted(rrf.keys(), key=lambda i: rrf[i], reverse=True)[:limit]
+    return fused, rrf
+
+
+def build_results(
+    fused: list[int],
+    rrf: dict[int, float],
+    lex: LexicalLeg,
+    vec: VectorLeg,
+    obj_map: dict[int, Any],
+) -> list[SearchResult[Any]]:
+    lex_rank = {i: r for r, i in enumerate(lex.ids, start=1)}
+    sem_rank = {i: r for r, i in enumerate(vec.ids, start=1)}
+
+    out: list[SearchResult[Any]] = []
+    for _id in fused:
+        out.append(
+            SearchResult(
+                id=_id,
+                obj=obj_map.get(_id),
+                bm25_score=lex.bm25_scores.get(_id),
+                fts_rank=lex.fts_ranks.get(_id),
+                snippet=lex.snippets.get(_id),
+                lexical_rank=lex_rank.get(_id),
+                vector_distance=vec.distances.get(_id),
+                semantic_rank=sem_rank.get(_id),
+                rrf_score=rrf.get(_id),
+            )
+        )
+    return out
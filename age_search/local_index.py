@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence, Type
+
+from sqlalchemy import DateTime, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, CollectionAggregate
+
+
+def _np():
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover - depends on the environment
+        raise ImportError("LocalVectorIndex needs numpy: pip install 'age_search[local]'") from e
+    return numpy
+
+
+def allowed_ids_from_predicate(where: Any, model: Type[Any]) -> Optional[list[int]]:
+    """
+    The id list of an age_search.legs.allowed_ids_predicate(model, ...) expression, or None for
+    anything else (including the same `= ANY(:allowed_ids)` shape on another column).
+    """
+    if not isinstance(where, BinaryExpression) or not isinstance(where.right, CollectionAggregate):
+        return None
+    if where.operator is not operators.eq or not where.left.compare(model.__table__.c.id):
+        return None
+    for el in visitors.iterate(where.right):
+        if isinstance(el, BindParameter) and el.key == "allowed_ids":
+            return [int(i) for i in el.value]
+    return None
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    ids: Any  # int64[n]
+    matrix: Any  # float32[n, dim]
+    norms: Any  # float32[n]
+    pos: dict[int, int]
+
+
+class LocalVectorIndex:
+    """
+    In-process, brute-force mirror of a VectorMixin model's embeddings (numpy, float32).
+
+    Assign it to `Model.local_vector_index` and vector_search / vector_search_ids (and so the
+    hybrid functions) answer from memory whenever the query's `where` is covered:
+      - no filter, when the mirror has no `scope`
+      - the mirror's own `scope` expression (e.g. Doc.tenant_id == 7)
+      - an allowed-ids filter (legs.allowed_ids_predicate), when the mirror has no `scope`
+    Anything else goes to Postgres as usual.
+
+    `watermark` names a monotonically increasing column (`id` for append-only tables, or e.g.
+    `updated_at`); refresh() pulls rows at or past the last seen value and upserts them.
+    Deletes are not seen by refresh(); call load() to rebuild.
+
+    The mirror is only as fresh as its last load()/refresh(). With `max_staleness` (seconds),
+    covers() turns down every query once that long has passed since then, so searches go back
+    to Postgres until the next refresh.
+    """
+
+    def __init__(
+        self,
+        model: Type[Any],
+        *,
+        scope: Any = None,
+        watermark: str = "id",
+        batch_size: int = 10_000,
+        max_staleness: Optional[float] = None,
+    ):
+        self.model = model
+        self.scope = scope
+        self.watermark = watermark
+        self.batch_size = int(batch_size)
+        self.max_staleness = max_staleness
+        self.last_watermark: Any = None
+        self.refreshed_at: Optional[float] = None  # time.time() of the last load/refresh
+        self._snap: Optional[_Snapshot] = None
+        self._lock = threading.Lock()  # serialises writers; readers use the current snapshot
+
+    def __len__(self) -> int:
+        snap = self._snap
+        return 0 if snap is None else len(snap.ids)
+
+    @property
+    def loaded(self) -> bool:
+        return self._snap is not None
+
+    @property
+    def staleness(self) -> Optional[float]:
+        """
+        Seconds since the last load/refresh (None when not loaded).
+        """
+        return None if self.refreshed_at is None else max(0.0, time.time() - self.refreshed_at)
+
+    def _snapshot(self, ids: Any, matrix: Any) -> _Snapshot:
+        np = _np()
+        norms = np.linalg.norm(matrix, axis=1).astype(np.float32) if len(ids) else np.zeros(0, np.float32)
+        return _Snapshot(ids=ids, matrix=matrix, norms=norms, pos={int(i): n for n, i in enumerate(ids)})
+
+    def _fetch(self, session: Session, since: Any):
+        """
+        Stream (id, embedding, watermark) rows through a server-side cursor, in batches.
+        """
+        m = self.model
+        wm = getattr(m, self.watermark)
+        stmt = select(m.id, m.embedding, wm).order_by(wm)
+        if self.scope is not None:
+            stmt = stmt.where(self.scope)
+        if since is not None:
+            stmt = stmt.where(wm >= since)
+        result = session.execute(stmt.execution_options(stream_results=True, yield_per=self.batch_size))
+        yield from result.partitions()
+
+    def load(self, session: Session) -> "LocalVectorIndex":
+        """
+        (Re)build the mirror from the table.
+        """
+        np = _np()
+        with self._lock:
+            started = time.time()
+            ids: list[int] = []
+            vecs: list[Any] = []
+            last = None
+            for part in self._fetch(session, None):
+                for id_, emb, wm in part:
+                    last = wm
+                    if emb is not None:
+                        ids.append(int(id_))
+                        vecs.append(np.asarray(emb, dtype=np.float32))
+            dim = int(self.model.vector_dim)
+            matrix = np.vstack(vecs) if vecs else np.zeros((0, dim), np.float32)
+            self._snap = self._snapshot(np.asarray(ids, dtype=np.int64), matrix)
+            self.last_watermark = last
+            self.refreshed_at = started
+        return self
+
+    def refresh(self, session: Session) -> int:
+        """
+        Upsert rows changed since the last load/refresh. Returns the number of rows applied.
+        """
+        if self._snap is None:
+            self.load(session)
+            return len(self)
+        np = _np()
+        with self._lock:
+            started = time.time()
+            snap = self._snap
+            updates: dict[int, Any] = {}
+            last = self.last_watermark
+            for part in self._fetch(session, self.last_watermark):
+                for id_, emb, wm in part:
+                    last = wm
+                    updates[int(id_)] = None if emb is None else np.asarray(emb, dtype=np.float32)
+            if not updates:
+                self.refreshed_at = started
+                return 0
+
+            # Copy before writing: the current arrays may be a read-only memmap, and readers
+            # keep using the old snapshot until the swap below.
+            matrix = np.array(snap.matrix, dtype=np.float32)
+            keep = np.ones(len(snap.ids), dtype=bool)
+            new_ids, new_vecs = [], []
+            for id_, vec in updates.items():
+                n = snap.pos.get(id_)
+                if vec is None:
+                    if n is not None:
+                        keep[n] = False
+                elif n is not None:
+                    matrix[n] = vec
+                else:
+                    new_ids.append(id_)
+                    new_vecs.append(vec)
+            ids = snap.ids[keep]
+            matrix = matrix[keep]
+            if new_ids:
+                ids = np.concatenate([ids, np.asarray(new_ids, dtype=np.int64)])
+                matrix = np.vstack([matrix, *new_vecs])
+            self._snap = self._snapshot(ids, matrix)
+            self.last_watermark = last
+            self.refreshed_at = started
+            return len(updates)
+
+    def save(self, path: str) -> None:
+        """
+        Write `<path>.ids.npy`, `<path>.vectors.npy` and `<path>.json` (watermark) so a
+        restart can open() the mirror memory-mapped and refresh() from there.
+        """
+        np = _np()
+        snap = self._snap
+        if snap is None:
+            raise RuntimeError("LocalVectorIndex is not loaded")
+        np.save(f"{path}.ids.npy", snap.ids)
+        np.save(f"{path}.vectors.npy", snap.matrix)
+        tmp = f"{path}.json.tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "table": self.model.__tablename__,
+                    "last_watermark": self.last_watermark,
+                    "refreshed_at": self.refreshed_at,
+                },
+                f,
+                default=str,
+            )
+        os.replace(tmp, f"{path}.json")
+
+    def open(self, path: str, *, mmap: bool = True) -> "LocalVectorIndex":
+        """
+        Load a mirror written by save(); vectors are memory-mapped unless mmap=False.
+        """
+        np = _np()
+        with open(f"{path}.json") as f:
+            meta = json.load(f)
+        ids = np.load(f"{path}.ids.npy")
+        matrix = np.load(f"{path}.vectors.npy", mmap_mode="r" if mmap else None)
+        last = meta.get("last_watermark")
+        if isinstance(last, str) and isinstance(getattr(self.model, self.watermark).type, DateTime):
+            last = datetime.fromisoformat(last)
+        with self._lock:
+            self._snap = self._snapshot(ids, matrix)
+            self.last_watermark = last
+            self.refreshed_at = meta.get("refreshed_at")
+        return self
+
+    def covers(self, where: Any) -> tuple[bool, Optional[list[int]]]:
+        """
+        (covered, id filter) for a vector search `where` clause; see the class docstring.
+        """
+        if self._snap is None:
+            return False, None
+        if self.max_staleness is not None:
+            age = self.staleness
+            if age is None or age > self.max_staleness:
+                return False, None
+        if where is None:
+            return self.scope is None, None
+        if self.scope is not None:
+            return bool(where.compare(self.scope)), None
+        ids = allowed_ids_from_predicate(where, self.model)
+        return ids is not None, ids
+
+    def search(
+        self,
+        qvec: Sequence[float],
+        *,
+        k: int = 20,
+        distance: str = "cosine",
+        ids: Optional[Sequence[int]] = None,
+    ) -> list[tuple[int, float]]:
+        """
+        Exact top-k as [(id, distance), ...], using pgvector's distance definitions
+        (cosine distance, L2, negative inner product). `ids` restricts the candidates.
+        """
+        np = _np()
+        snap = self._snap
+        if snap is None:
+            raise RuntimeError("LocalVectorIndex is not loaded")
+        row_ids, matrix, norms = snap.ids, snap.matrix, snap.norms
+        if ids is not None:
+            rows = np.asarray([snap.pos[i] for i in ids if i in snap.pos], dtype=np.int64)
+            row_ids, matrix, norms = row_ids[rows], matrix[rows], norms[rows]
+        if len(row_ids) == 0 or k <= 0:
+            return []
+
+        q = np.asarray(qvec, dtype=np.float32)
+        dots = matrix @ q
+        if distance == "cosine":
+            denom = norms * np.float32(np.linalg.norm(q))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                dist = np.where(denom > 0, 1.0 - dots / denom, np.nan)
+        elif distance == "l2":
+            dist = np.sqrt(np.maximum(norms**2 + np.dot(q, q) - 2.0 * dots, 0.0))
+        elif distance == "ip":
+            dist = -dots
+        else:
+            raise ValueError(f"Unsupported distance: {distance!r}")
+
+        k = min(int(k), len(row_ids))
+        top = np.argpartition(dist, k - 1)[:k] if k < len(row_ids) else np.arange(len(row_ids))
+        top = top[np.argsort(dist[top], kind="stable")]
+        return [(int(row_ids[i]), float(dist[i])) for i in top]
+
@@ -80,12 +80,27 @@ def ensure_ivfflat_index(conn, table: str, column: str, index_name: str, *, opcl
     """))
 
 
+def quantized_index_target(column: str, quantization: str, dim: int, *, opclass: str) -> tuple[str, str]:
+    """
+    (index expression, opclass) for a quantized vector index, matching the expressions
+    VectorMixin uses for its coarse pass:
+      - "halfvec": (column::halfvec(dim)) with the halfvec_* variant of `opclass`
+      - "bit":     (binary_quantize(column)::bit(dim)) with bit_hamming_ops
+    """
+    if quantization == "halfvec":
+        return f"(({column})::halfvec({int(dim)}))", opclass.replace("vector_", "halfvec_", 1)
+    if quantization == "bit":
+        return f"(binary_quantize({column})::bit({int(dim)}))", "bit_hamming_ops"
+    raise ValueError(f"Unsupported vector quantization: {quantization!r}")
+
+
 def analyze_table(conn, table: str):
     conn.execute(text(f"ANALYZE {table};"))
 
 
 def set_session_tuning(conn, *, ivfflat_probes: Optional[int] = None, hnsw_ef_search: Optional[int] = None):
-    # call per-session (or per transaction) as desired
+    # Session-wide SET: persists on the pooled connection. Prefer age_search.tuning.ann_tuning
+    # or the ef_search/probes arguments of the vector search methods (transaction-local).
     if ivfflat_probes is not None:
         conn.execute(text("SET ivfflat.probes = :p"), {"p": int(ivfflat_probes)})
     if hnsw_ef_search is not None:
@@ -129,18 +144,24 @@ def install_all(
 
             # Vector
             if spec.vector_index != "none" and hasattr(model, "embedding"):
-                col = "embedding"
+                col, opclass, suffix = "embedding", spec.vector_metric_opclass, ""
+                # Quantized models only get the compact index; the full-precision column is
+                # read for re-ranking, not indexed.
+                quantization = getattr(model, "vector_quantization", None)
+                if quantization:
+                    col, opclass = quantized_index_target(col, quantization, model.vector_dim, opclass=opclass)
+                    suffix = f"_{quantization}"
                 if spec.vector_index == "hnsw":
                     ensure_hnsw_index(
-                        conn, table, col, f"ix_{table}_emb_hnsw",
-                        opclass=spec.vector_metric_opclass,
+                        conn, table, col, f"ix_{table}_emb_hnsw{suffix}",
+                        opclass=opclass,
                         m=spec.hnsw_m,
                         ef_construction=spec.hnsw_ef_construction,
                     )
                 elif spec.vector_index == "ivfflat":
                     ensure_ivfflat_index(
-                        conn, table, col, f"ix_{table}_emb_ivf",
-                        opclass=spec.vector_metric_opclass,
+                        conn, table, col, f"ix_{table}_emb_ivf{suffix}",
+                        opclass=opclass,
                         lists=spec.ivfflat_lists,
                     )
 
@@ -1,9 +1,13 @@
 from __future__ import annotations
-from typing import Optional
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+from sqlalchemy import BigInteger, and_, bindparam, false, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.orm import Session, defer as defer_opt
 from .exceptions import MisconfiguredModelError
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 class BM25SearchMixin:
     """
     Requires extension: CREATE EXTENSION pg_search;
@@ -14,6 +18,103 @@ class BM25SearchMixin:
 
     bm25_key_field: str = "id"
     bm25_default_field: str = "content"    # the text column you search most often
+    # Columns bm25_search_objects loads lazily unless told otherwise.
+    bm25_defer_fields: Sequence[str] = ("embedding",)
+
+    @classmethod
+    def _bm25_score_expr(cls):
+        # Core equivalent of `paradedb.score(key_field)`, for composing bm25 into larger statements.
+        return func.paradedb.score(cls.__table__.c[cls.bm25_key_field])  # type: ignore[attr-defined]
+
+    @classmethod
+    def _bm25_match_expr(cls, query: str, *, field: Optional[str] = None):
+        # Core equivalent of `field @@@ :q`.
+        col = cls.__table__.c[field or cls.bm25_default_field]  # type: ignore[attr-defined]
+        return col.op("@@@")(query)
+
+    @classmethod
+    def _bm25_field_name(cls, name: str):
+        # Field names go in as SQL string literals (ParadeDB resolves them to its field-name
+        # type); only actual columns of the table are accepted.
+        if name not in cls.__table__.c:  # type: ignore[attr-defined]
+            raise MisconfiguredModelError(f"{cls.__tablename__} has no column {name!r}")  # type: ignore[attr-defined]
+        return literal_column(f"'{name}'")
+
+    @classmethod
+    def _bm25_allowed_query(cls, allowed_ids: Sequence[int]):
+        # paradedb.term_set over the key field, built server-side from one bigint[] parameter:
+        # (SELECT array_agg(paradedb.term('id', x)) FROM unnest(:allowed_ids) AS allowed(x))
+        ids = bindparam("allowed_ids", [int(i) for i in allowed_ids], type_=ARRAY(BigInteger))
+        allowed = func.unnest(ids).table_valued("x").render_derived(name="allowed")
+        terms = select(func.array_agg(func.paradedb.term(cls._bm25_field_name(cls.bm25_key_field), allowed.c.x)))
+        return func.paradedb.term_set(terms.scalar_subquery())
+
+    @classmethod
+    def _bm25_where(
+        cls,
+        query: str,
+        *,
+        field: Optional[str] = None,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
+    ):
+        """
+        WHERE clause for a BM25 search.
+
+        Without `allowed_ids` / `filter` this is the plain `field @@@ :q`. Otherwise the text
+        query and the filters are combined into one ParadeDB query,
+          key @@@ paradedb.boolean(must => ARRAY[parse_with_field(field, q),
+                                                 const_score(0, term_set(ids)), const_score(0, filter)...])
+        so pg_search prunes inside the index and the top-k is taken from matching rows only.
+        Filters are wrapped in const_score(0, ...) so they restrict without adding to the score,
+        which stays the text query's BM25 score.
+        `filter` is a ParadeDB query expression (or a list of them), e.g.
+        func.paradedb.term("tenant_id", 7) or func.paradedb.range(...).
+        `where` is any SQL predicate, ANDed to the statement as is.
+        """
+        if not hasattr(cls, "__tablename__"):
+            raise MisconfiguredModelError("Model must be a mapped table with __tablename__")
+        filters = list(filter) if isinstance(filter, (list, tuple)) else ([] if filter is None else [filter])
+        if allowed_ids is not None:
+            if not allowed_ids:
+                return false()
+            filters.append(cls._bm25_allowed_query(allowed_ids))
+
+        if filters:
+            key = cls.__table__.c[cls.bm25_key_field]  # type: ignore[attr-defined]
+            name = cls._bm25_field_name(field or cls.bm25_default_field)
+            text_query = func.paradedb.parse_with_field(name, literal(query))
+            must = [text_query, *(func.paradedb.const_score(literal_column("0"), f) for f in filters)]
+            clause = key.op("@@@")(func.paradedb.boolean(literal_column("must").op("=>")(array(must))))
+        else:
+            clause = cls._bm25_match_expr(query, field=field)
+        return clause if where is None else and_(clause, where)
+
+    @classmethod
+    def _bm25_stmt(
+        cls,
+        query: str,
+        *,
+        k: int,
+        field: Optional[str] = None,
+        with_snippet: bool = False,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
+    ):
+        key = cls.__table__.c[cls.bm25_key_field]  # type: ignore[attr-defined]
+        score = cls._bm25_score_expr()
+        cols = [key.label("id"), score.label("score")]
+        if with_snippet:
+            col = cls.__table__.c[field or cls.bm25_default_field]  # type: ignore[attr-defined]
+            cols.append(func.paradedb.snippet(col).label("snippet"))
+        return (
+            select(*cols)
+            .where(cls._bm25_where(query, field=field, allowed_ids=allowed_ids, filter=filter, where=where))
+            .order_by(score.desc())
+            .limit(int(k))
+        )
 
     @classmethod
     def bm25_search(
@@ -24,27 +125,84 @@ class BM25SearchMixin:
         k: int = 20,
         field: Optional[str] = None,
         with_snippet: bool = False,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
     ):
-        field = field or cls.bm25_default_field
-        key = cls.bm25_key_field
+        """
+        Returns rows of (id, score[, snippet]).
 
-        if not hasattr(cls, "__tablename__"):
-            raise MisconfiguredModelError("Model must be a mapped table with __tablename__")
-        table = cls.__tablename__
-
-        # We compute BM25 score and optionally a snippet.
-        # Score is computed using paradedb.score(key_field). :contentReference[oaicite:5]{index=5}
-        snippet_sql = f", paradedb.snippet({field}) AS snippet" if with_snippet else ""
-        sql = text(f"""
-            SELECT {key} AS id,
-                   paradedb.score({key}) AS score
-                   {snippet_sql}
-            FROM {table}
-            WHERE {field} @@@ :q
-            ORDER BY paradedb.score({key}) DESC
-            LIMIT :k
-        """)
-        return session.execute(sql, {"q": query, "k": int(k)}).all()
+        `allowed_ids` and `filter` are compiled into the `@@@` query (see _bm25_where), so
+        k results come from within the allowed set instead of being post-filtered from a
+        global top-k. `where` adds a plain SQL predicate.
+        """
+        stmt = cls._bm25_stmt(
+            query,
+            k=k,
+            field=field,
+            with_snippet=with_snippet,
+            allowed_ids=allowed_ids,
+            filter=filter,
+            where=where,
+        )
+        return session.execute(stmt).all()
+
+    @classmethod
+    async def bm25_search_async(
+        cls,
+        session: "AsyncSession",
+        query: str,
+        *,
+        k: int = 20,
+        field: Optional[str] = None,
+        with_snippet: bool = False,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
+    ):
+        stmt = cls._bm25_stmt(
+            query,
+            k=k,
+            field=field,
+            with_snippet=with_snippet,
+            allowed_ids=allowed_ids,
+            filter=filter,
+            where=where,
+        )
+        return (await session.execute(stmt)).all()
+
+    @classmethod
+    def _bm25_objects_stmt(
+        cls,
+        query: str,
+        *,
+        k: int,
+        field: Optional[str] = None,
+        defer: Optional[Sequence[str]] = None,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
+    ):
+        score = cls._bm25_score_expr()
+        stmt = (
+            select(cls, score.label("bm25_score"))
+            .where(cls._bm25_where(query, field=field, allowed_ids=allowed_ids, filter=filter, where=where))
+            .order_by(score.desc())
+            .limit(int(k))
+        )
+        defer = cls.bm25_defer_fields if defer is None else defer
+        cols = [getattr(cls, c) for c in defer if hasattr(cls, c)]
+        if cols:
+            stmt = stmt.options(*(defer_opt(c) for c in cols))
+        return stmt
+
+    @staticmethod
+    def _with_scores(rows: Any) -> list[Any]:
+        out = []
+        for obj, score in rows:
+            obj.bm25_score = float(score) if score is not None else None
+            out.append(obj)
+        return out
 
     @classmethod
     def bm25_search_objects(
@@ -54,12 +212,37 @@ class BM25SearchMixin:
         *,
         k: int = 20,
         field: Optional[str] = None,
+        defer: Optional[Sequence[str]] = None,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
+    ):
+        """
+        Mapped instances in BM25 rank order, each with a `bm25_score` attribute, from one
+        statement (the score and the row come from the same scan).
+
+        `defer` names columns to load lazily; defaults to `bm25_defer_fields` ("embedding").
+        `allowed_ids` / `filter` / `where` work as in bm25_search.
+        """
+        stmt = cls._bm25_objects_stmt(
+            query, k=k, field=field, defer=defer, allowed_ids=allowed_ids, filter=filter, where=where
+        )
+        return cls._with_scores(session.execute(stmt).all())
+
+    @classmethod
+    async def bm25_search_objects_async(
+        cls,
+        session: "AsyncSession",
+        query: str,
+        *,
+        k: int = 20,
+        field: Optional[str] = None,
+        defer: Optional[Sequence[str]] = None,
+        allowed_ids: Optional[Sequence[int]] = None,
+        filter: Any = None,
+        where: Any = None,
     ):
-        ids_scores = cls.bm25_search(session, query, k=k, field=field, with_snippet=False)
-        ids = [int(r[0]) for r in ids_scores]
-        if not ids:
-            return []
-        # preserve order
-        rows = session.execute(text(f"SELECT * FROM {cls.__tablename__} WHERE {cls.bm25_key_field} = ANY(:ids)"), {"ids": ids}).all()
-        by_id = {int(getattr(r, cls.bm25_key_field, r[0])): r for r in rows}  # crude fallback
-        return [by_id[i] for i in ids if i in by_id]
+        stmt = cls._bm25_objects_stmt(
+            query, k=k, field=field, defer=defer, allowed_ids=allowed_ids, filter=filter, where=where
+        )
+        return cls._with_scores((await session.execute(stmt)).all())
@@ -1,7 +1,11 @@
 from __future__ import annotations
 from sqlalchemy import Computed, Index, func, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, Session
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 class FTSSearchMixin:
     fts_config: str = "english"
@@ -9,16 +13,48 @@ class FTSSearchMixin:
 
     # default computed column name content_tsv
     content_tsv: Mapped[Any] = mapped_column(
-        Computed("to_tsvector('english', coalesce(content, ''))", persisted=True)
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(content, ''))", persisted=True),
     )
 
     @classmethod
     def fts_index(cls) -> Index:
         return Index(f"ix_{cls.__tablename__}_fts", cls.content_tsv, postgresql_using="gin")
 
+    @classmethod
+    def _fts_tsquery(cls, query: str):
+        return func.websearch_to_tsquery(cls.fts_config, query)
+
+    @classmethod
+    def _fts_search_stmt(cls, query: str, *, k: int):
+        tsq = cls._fts_tsquery(query)
+        rank = func.ts_rank_cd(cls.content_tsv, tsq)
+        return select(cls).where(cls.content_tsv.op("@@")(tsq)).order_by(rank.desc()).limit(int(k))
+
     @classmethod
     def fts_search(cls, session: Session, query: str, *, k: int = 20):
-        tsq = func.websearch_to_tsquery(cls.fts_config, query)
+        return session.execute(cls._fts_search_stmt(query, k=k)).scalars().all()
+
+    @classmethod
+    async def fts_search_async(cls, session: "AsyncSession", query: str, *, k: int = 20):
+        return (await session.execute(cls._fts_search_stmt(query, k=k))).scalars().all()
+
+    @classmethod
+    def _fts_search_ids_stmt(cls, query: str, *, k: int, where=None):
+        tsq = cls._fts_tsquery(query)
         rank = func.ts_rank_cd(cls.content_tsv, tsq)
-        stmt = select(cls).where(cls.content_tsv.op("@@")(tsq)).order_by(rank.desc()).limit(int(k))
-        return session.execute(stmt).scalars().all()
+        stmt = select(cls.id, rank.label("rank")).where(cls.content_tsv.op("@@")(tsq))  # type: ignore[attr-defined]
+        if where is not None:
+            stmt = stmt.where(where)
+        return stmt.order_by(rank.desc()).limit(int(k))
+
+    @classmethod
+    def fts_search_ids(cls, session: Session, query: str, *, k: int = 20, where=None):
+        """
+        Like fts_search, but returns rows of (id, ts_rank_cd) instead of mapped objects.
+        """
+        return session.execute(cls._fts_search_ids_stmt(query, k=k, where=where)).all()
+
+    @classmethod
+    async def fts_search_ids_async(cls, session: "AsyncSession", query: str, *, k: int = 20, where=None):
+        return (await session.execute(cls._fts_search_ids_stmt(query, k=k, where=where))).all()
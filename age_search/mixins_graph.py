@@ -1,12 +1,82 @@
 from __future__ import annotations
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 from sqlalchemy.orm import Session
-from .cypher import cypher_json
+from .cypher import _require_safe_ident, cypher_json, cypher_rows
+
+
+def _batches(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    size = max(1, int(size))
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def graph_upsert_rows(
+    session: Session,
+    label: str,
+    rows: Sequence[dict[str, Any]],
+    *,
+    key: str = "id",
+    batch_size: int = 1000,
+    graph_name: Optional[str] = None,
+) -> int:
+    """
+    MERGE many vertices with one cypher() call per batch:
+
+        UNWIND $rows AS r MERGE (n:Label {key: r.id}) SET n += r.props
+
+    `rows` are {"id": ..., "props": {...}} dicts. Returns the number of vertices merged.
+    """
+    label = _require_safe_ident(label, what="graph label")
+    key = _require_safe_ident(key, what="vertex property key")
+    cy = f"""
+    UNWIND $rows AS r
+    MERGE (n:{label} {{{key}: r.id}})
+    SET n += r.props
+    RETURN count(n)
+    """
+    total = 0
+    for batch in _batches(rows, batch_size):
+        out = cypher_rows(session, cy, columns=("n",), params={"rows": list(batch)}, graph_name=graph_name)
+        total += int(out[0][0]) if out and out[0][0] is not None else 0
+    return total
+
+
+def graph_delete_ids(
+    session: Session,
+    label: str,
+    ids: Sequence[Any],
+    *,
+    key: str = "id",
+    detach: bool = True,
+    batch_size: int = 1000,
+    graph_name: Optional[str] = None,
+) -> int:
+    """
+    Delete many vertices by their id property, one cypher() call per batch.
+    Returns the number of vertices deleted.
+    """
+    label = _require_safe_ident(label, what="graph label")
+    key = _require_safe_ident(key, what="vertex property key")
+    cy = f"""
+    UNWIND $ids AS i
+    MATCH (n:{label})
+    WHERE n.{key} = i
+    {"DETACH " if detach else ""}DELETE n
+    RETURN count(n)
+    """
+    total = 0
+    for batch in _batches(ids, batch_size):
+        out = cypher_rows(session, cy, columns=("n",), params={"ids": list(batch)}, graph_name=graph_name)
+        total += int(out[0][0]) if out and out[0][0] is not None else 0
+    return total
+
 
 class GraphNodeMixin:
     graph_label: str = ""         # default: class name
     graph_id_field: str = "id"
     vertex_property_key: str = "id"
+    # Attributes copied onto the vertex by graph_upsert / graph_upsert_many (besides the id).
+    graph_property_fields: tuple[str, ...] = ()
 
     @classmethod
     def _label(cls) -> str:
@@ -15,10 +85,19 @@ class GraphNodeMixin:
     def graph_id(self) -> Any:
         return getattr(self, self.graph_id_field)
 
+    def graph_properties(self) -> dict[str, Any]:
+        """
+        Vertex properties for this object: `graph_property_fields` plus the id property.
+        Override for computed properties.
+        """
+        props = {f: getattr(self, f) for f in self.graph_property_fields}
+        props[self.vertex_property_key] = self.graph_id()
+        return props
+
     def graph_upsert(self, session: Session, *, graph_name: Optional[str] = None, props: Optional[dict[str, Any]] = None):
         label = self._label()
         _id = self.graph_id()
-        props = props or {}
+        props = props if props is not None else self.graph_properties()
         props.setdefault(self.vertex_property_key, _id)
 
         cy = f"""
@@ -38,3 +117,50 @@ class GraphNodeMixin:
         RETURN n
         """
         return cypher_json(session, cy, params={"id": _id}, graph_name=graph_name)
+
+    @classmethod
+    def graph_upsert_many(
+        cls,
+        session: Session,
+        objs: Iterable["GraphNodeMixin"],
+        *,
+        batch_size: int = 1000,
+        graph_name: Optional[str] = None,
+    ) -> int:
+        """
+        Batched graph_upsert: one UNWIND ... MERGE round trip per `batch_size` objects,
+        using each object's graph_properties(). Returns the number of vertices merged.
+        """
+        rows = [{"id": o.graph_id(), "props": o.graph_properties()} for o in objs]
+        return graph_upsert_rows(
+            session,
+            cls._label(),
+            rows,
+            key=cls.vertex_property_key,
+            batch_size=batch_size,
+            graph_name=graph_name,
+        )
+
+    @classmethod
+    def graph_delete_many(
+        cls,
+        session: Session,
+        objs_or_ids: Iterable[Any],
+        *,
+        detach: bool = True,
+        batch_size: int = 1000,
+        graph_name: Optional[str] = None,
+    ) -> int:
+        """
+        Batched graph_delete for objects or raw ids. Returns the number of vertices deleted.
+        """
+        ids = [o.graph_id() if isinstance(o, GraphNodeMixin) else o for o in objs_or_ids]
+        return graph_delete_ids(
+            session,
+            cls._label(),
+            ids,
+            key=cls.vertex_property_key,
+            detach=detach,
+            batch_size=batch_size,
+            graph_name=graph_name,
+        )
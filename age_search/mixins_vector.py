@@ -1,27 +1,486 @@
 from __future__ import annotations
-from typing import Any, Sequence, Literal
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Literal
 from sqlalchemy.orm import Mapped, mapped_column, Session
-from sqlalchemy import select
-from pgvector.sqlalchemy import VECTOR
+from sqlalchemy import Text, bindparam, cast, func, literal, select, text, true
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+from pgvector.sqlalchemy import BIT, HALFVEC, VECTOR
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 Distance = Literal["cosine", "l2", "ip"]
+IterativeScan = Literal["off", "strict_order", "relaxed_order"]
+Quantization = Literal["halfvec", "bit"]
+
+# pgvector's upper bound for hnsw.ef_search.
+_MAX_EF_SEARCH = 1000
+
+# ANN knobs -> pgvector GUCs (also the bind names in the set_config statement).
+ANN_SETTINGS = {
+    "ef_search": "hnsw.ef_search",
+    "probes": "ivfflat.probes",
+    "iterative_scan": "hnsw.iterative_scan",
+    "max_scan_tuples": "hnsw.max_scan_tuples",
+}
+_ANN_BIND = {guc: name for name, guc in ANN_SETTINGS.items()}
+_LOCAL_SETTINGS_KEY = "age_search.ann_local"
+_SCOPE_KEY = "age_search.ann_scope"
+
+
+def _session_info(session: Any) -> Optional[dict]:
+    info = getattr(getattr(session, "sync_session", session), "info", None)
+    return info if isinstance(info, dict) else None
+
+
+def _transaction_token(session: Any) -> Any:
+    """
+    The innermost transaction (savepoint or root) of a Session / AsyncSession, or None.
+    SET LOCAL values end with it, and a rolled-back savepoint undoes the ones set inside.
+    """
+    sync = getattr(session, "sync_session", session)
+    get_txn = getattr(sync, "get_transaction", None)
+    if get_txn is None:
+        return None
+    return sync.get_nested_transaction() or get_txn()
+
+
+def local_settings(session: Any) -> dict[str, Optional[str]]:
+    """
+    pgvector GUCs age_search has set with set_config(..., true) in the session's current
+    transaction (None: reset to the server default); empty outside a transaction or for
+    sessions it can't track.
+    """
+    info, token = _session_info(session), _transaction_token(session)
+    saved = info.get(_LOCAL_SETTINGS_KEY) if info is not None and token is not None else None
+    return dict(saved[1]) if saved and saved[0] is token else {}
+
+
+def _remember_local_settings(session: Any, values: dict[str, Optional[str]]) -> None:
+    info, token = _session_info(session), _transaction_token(session)
+    if info is None or token is None:
+        return
+    info[_LOCAL_SETTINGS_KEY] = (token, {**local_settings(session), **values})
+
+
+def ann_scope(session: Any) -> dict[str, str]:
+    """
+    pgvector GUCs set by the active age_search.tuning.ann_tuning blocks of the session
+    (innermost wins). The search methods use them in place of the model defaults.
+    """
+    info = _session_info(session)
+    scope: dict[str, str] = {}
+    for values in (info or {}).get(_SCOPE_KEY, ()):
+        scope.update(values)
+    return scope
+
+
+def set_local_sql(values: dict[str, Optional[str]]):
+    """
+    (SELECT, params) applying pgvector GUCs transaction-locally: one set_config(..., true)
+    per entry of `values` (GUC name -> value, None resets it to the server default).
+    """
+    calls = [f"set_config('{guc}', :{_ANN_BIND[guc]}, true)" for guc in values]
+    return text("SELECT " + ", ".join(calls)), {_ANN_BIND[guc]: v for guc, v in values.items()}
+
 
 class VectorMixin:
     vector_dim: int = 1536
     embedding: Mapped[Any] = mapped_column(VECTOR(vector_dim), nullable=True)
+    # Per-model ANN defaults applied (transaction-locally) by the vector search methods when
+    # no per-call value is given. age_search.tuning.autotune_ef_search sets ann_ef_search.
+    ann_ef_search: Optional[int] = None
+    ann_probes: Optional[int] = None
+    # Two-stage search: with vector_quantization set, the ANN pass runs on a compact expression
+    # index (embedding::halfvec, or binary_quantize(embedding)::bit) for k * vector_oversample
+    # candidates, which are then re-ranked exactly on the full-precision column.
+    # migrations.install_all builds the matching index instead of the full-precision one.
+    vector_quantization: Optional[Quantization] = None
+    vector_oversample: int = 4
+    # Optional in-process mirror (age_search.local_index.LocalVectorIndex). When set and loaded,
+    # vector_search / vector_search_ids answer covered queries from memory.
+    local_vector_index: Optional[Any] = None
 
     @classmethod
-    def vector_search(cls, session: Session, qvec: Sequence[float], *, k: int = 20, distance: Distance = "cosine", where=None):
+    def _distance_expr(cls, qvec: Sequence[float], distance: Distance = "cosine"):
         col = cls.embedding
         if distance == "cosine":
-            order = col.cosine_distance(qvec)
-        elif distance == "l2":
-            order = col.l2_distance(qvec)
-        else:
-            order = -col.inner_product(qvec)
+            return col.cosine_distance(qvec)
+        if distance == "l2":
+            return col.l2_distance(qvec)
+        # `<#>` is the negative inner product, so ascending order is still "best first".
+        return col.max_inner_product(qvec)
+
+    @classmethod
+    def _coarse_distance_expr(cls, qvec: Any, distance: Distance = "cosine"):
+        """
+        Distance on the quantized representation; must match the index expression built by
+        migrations.quantized_index_target to be answered from that index.
+        """
+        dim = cls.vector_dim
+        # Explicit cast: binary_quantize() is overloaded, so an untyped parameter is ambiguous.
+        q = qvec if isinstance(qvec, ColumnElement) else cast(literal(list(qvec), VECTOR(dim)), VECTOR(dim))
+        if cls.vector_quantization == "bit":
+            # Hamming distance on sign bits is the coarse proxy for every metric.
+            return cast(func.binary_quantize(cls.embedding), BIT(dim)).hamming_distance(
+                cast(func.binary_quantize(q), BIT(dim))
+            )
+        if cls.vector_quantization != "halfvec":
+            raise ValueError(f"Unsupported vector_quantization: {cls.vector_quantization!r}")
+        col, hq = cast(cls.embedding, HALFVEC(dim)), cast(q, HALFVEC(dim))
+        if distance == "cosine":
+            return col.cosine_distance(hq)
+        if distance == "l2":
+            return col.l2_distance(hq)
+        return col.max_inner_product(hq)
+
+    @classmethod
+    def _local_hits(cls, qvec: Sequence[float], *, k: int, distance: Distance, where=None):
+        """
+        [(id, distance), ...] from the local mirror, or None if there is none or it doesn't
+        cover `where`.
+        """
+        index = cls.local_vector_index
+        if index is None:
+            return None
+        covered, ids = index.covers(where)
+        if not covered:
+            return None
+        return index.search(qvec, k=k, distance=distance, ids=ids)
+
+    @classmethod
+    def _objects_in_order(cls, rows: Any, hits: Sequence[tuple[int, float]]):
+        by_id = {o.id: o for o in rows}
+        return [by_id[i] for i, _d in hits if i in by_id]
+
+    @classmethod
+    def _rerank_limit(cls, k: int, oversample: Optional[int]) -> Optional[int]:
+        """
+        Size of the coarse candidate set, or None when the model isn't quantized.
+        """
+        if cls.vector_quantization is None:
+            return None
+        factor = oversample if oversample is not None else cls.vector_oversample
+        return int(k) * max(1, int(factor))
+
+    @classmethod
+    def _coarse_candidates(cls, qvec: Any, *, limit: int, distance: Distance, where=None):
+        """
+        `id IN (top-`limit` ids by quantized distance)`; the caller orders by the full distance.
+        """
+        coarse = select(cls.id)  # type: ignore[attr-defined]
+        if where is not None:
+            coarse = coarse.where(where)
+        coarse = coarse.order_by(cls._coarse_distance_expr(qvec, distance)).limit(int(limit))
+        # Keep the model's table in the subquery's FROM even though the enclosing query
+        # selects from it too; only the query vector (LATERAL in vector_search_many) correlates.
+        return cls.id.in_(coarse.correlate_except(cls.__table__))  # type: ignore[attr-defined]
+
+    @classmethod
+    def _ann_settings_sql(
+        cls,
+        session: Any,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        iterative_scan: Optional[IterativeScan] = None,
+        min_ef_search: Optional[int] = None,
+    ):
+        """
+        (SELECT, params) setting the ANN knobs this search needs (falling back to the model's
+        ann_ef_search / ann_probes) with set_config(..., is_local => true), or None when they
+        are already in effect in the session's transaction, so repeated searches in one
+        transaction don't pay a settings round trip each.
+
+        Local settings end with the transaction, so they never leak into pooled connections.
+        There is no restore statement: a knob an earlier search set that this one doesn't ask
+        for is reset (set_config(name, NULL, true)) in the same SELECT as the knobs it needs.
+
+        Inside an ann_tuning block, the knobs it sets take the place of the model defaults
+        (a per-call value still wins for that search).
+
+        `min_ef_search` raises ef_search to at least that value (HNSW returns at most
+        ef_search rows, so an oversampled coarse pass needs ef_search >= its LIMIT).
+        """
+        if iterative_scan is not None and iterative_scan not in ("off", "strict_order", "relaxed_order"):
+            raise ValueError(f"Unsupported iterative_scan: {iterative_scan!r}")
+        scope = ann_scope(session)
+        if ef_search is None:
+            ef_search = int(scope["hnsw.ef_search"]) if "hnsw.ef_search" in scope else cls.ann_ef_search
+        if min_ef_search is not None and (ef_search is None or ef_search < min_ef_search):
+            ef_search = min(int(min_ef_search), _MAX_EF_SEARCH)
+        if probes is None:
+            probes = int(scope["ivfflat.probes"]) if "ivfflat.probes" in scope else cls.ann_probes
+        if iterative_scan is None:
+            iterative_scan = scope.get("hnsw.iterative_scan")  # type: ignore[assignment]
+        wanted = {
+            "hnsw.ef_search": str(int(ef_search)) if ef_search is not None else None,
+            "ivfflat.probes": str(int(probes)) if probes is not None else None,
+            "hnsw.iterative_scan": iterative_scan,
+        }
+        current = local_settings(session)
+        # None means "server default": only worth a set_config if an earlier search changed it.
+        pending = {guc: v for guc, v in wanted.items() if current.get(guc) != v and (v is not None or guc in current)}
+        return set_local_sql(pending) if pending else None
+
+    @classmethod
+    def _apply_ann_settings(cls, session: Session, **kw: Any) -> None:
+        settings = cls._ann_settings_sql(session, **kw)
+        if settings is not None:
+            session.execute(*settings)
+            _remember_local_settings(session, {ANN_SETTINGS[k]: v for k, v in settings[1].items()})
+
+    @classmethod
+    async def _apply_ann_settings_async(cls, session: "AsyncSession", **kw: Any) -> None:
+        settings = cls._ann_settings_sql(session, **kw)
+        if settings is not None:
+            await session.execute(*settings)
+            _remember_local_settings(session, {ANN_SETTINGS[k]: v for k, v in settings[1].items()})
+
+    @classmethod
+    def _vector_search_stmt(
+        cls, qvec: Sequence[float], *, k: int, distance: Distance, where=None, oversample: Optional[int] = None
+    ):
+        order = cls._distance_expr(qvec, distance)
 
         stmt = select(cls)
         if where is not None:
             stmt = stmt.where(where)
-        stmt = stmt.order_by(order).limit(int(k))
+        limit = cls._rerank_limit(k, oversample)
+        if limit is not None:
+            stmt = stmt.where(cls._coarse_candidates(qvec, limit=limit, distance=distance, where=where))
+        return stmt.order_by(order).limit(int(k))
+
+    @classmethod
+    def vector_search(
+        cls,
+        session: Session,
+        qvec: Sequence[float],
+        *,
+        k: int = 20,
+        distance: Distance = "cosine",
+        where=None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        oversample: Optional[int] = None,
+    ):
+        """
+        Top-k mapped objects by `distance` to `qvec`, optionally filtered by `where`.
+
+        With a loaded local_vector_index covering `where`, the ranking is computed in-process
+        from the mirror, which is only as fresh as its last load()/refresh(): rows written
+        since are missed and updated embeddings rank by their old value. Set the mirror's
+        max_staleness to bound that.
+        """
+        hits = cls._local_hits(qvec, k=k, distance=distance, where=where)
+        if hits is not None:
+            stmt = select(cls).where(cls.id.in_([i for i, _d in hits]))  # type: ignore[attr-defined]
+            return cls._objects_in_order(session.execute(stmt).scalars().all(), hits)
+        stmt = cls._vector_search_stmt(qvec, k=k, distance=distance, where=where, oversample=oversample)
+        cls._apply_ann_settings(
+            session, ef_search=ef_search, probes=probes, min_ef_search=cls._rerank_limit(k, oversample)
+        )
         return session.execute(stmt).scalars().all()
+
+    @classmethod
+    async def vector_search_async(
+        cls,
+        session: "AsyncSession",
+        qvec: Sequence[float],
+        *,
+        k: int = 20,
+        distance: Distance = "cosine",
+        where=None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        oversample: Optional[int] = None,
+    ):
+        hits = cls._local_hits(qvec, k=k, distance=distance, where=where)
+        if hits is not None:
+            stmt = select(cls).where(cls.id.in_([i for i, _d in hits]))  # type: ignore[attr-defined]
+            return cls._objects_in_order((await session.execute(stmt)).scalars().all(), hits)
+        stmt = cls._vector_search_stmt(qvec, k=k, distance=distance, where=where, oversample=oversample)
+        await cls._apply_ann_settings_async(
+            session, ef_search=ef_search, probes=probes, min_ef_search=cls._rerank_limit(k, oversample)
+        )
+        return (await session.execute(stmt)).scalars().all()
+
+    @classmethod
+    def _vector_search_ids_stmt(
+        cls,
+        qvec: Sequence[float],
+        *,
+        k: int,
+        distance: Distance,
+        where=None,
+        exact: bool = False,
+        iterative_scan: Optional[IterativeScan] = None,
+        oversample: Optional[int] = None,
+    ):
+        dist = cls._distance_expr(qvec, distance)
+
+        stmt = select(cls.id, dist.label("distance"))  # type: ignore[attr-defined]
+        if where is not None:
+            stmt = stmt.where(where)
+
+        if exact:
+            # MATERIALIZED stops the planner from answering ORDER BY ... LIMIT with the ANN index.
+            cand = stmt.cte("candidates").prefix_with("MATERIALIZED")
+            return select(cand.c.id, cand.c.distance).order_by(cand.c.distance).limit(int(k))
+
+        limit = cls._rerank_limit(k, oversample)
+        if limit is not None:
+            stmt = stmt.where(cls._coarse_candidates(qvec, limit=limit, distance=distance, where=where))
+        stmt = stmt.order_by(dist).limit(int(k))
+        if iterative_scan == "relaxed_order":
+            # relaxed_order may return rows slightly out of order; re-sort the k rows.
+            cand = stmt.cte("candidates").prefix_with("MATERIALIZED")
+            stmt = select(cand.c.id, cand.c.distance).order_by(cand.c.distance)
+        return stmt
+
+    @classmethod
+    def vector_search_ids(
+        cls,
+        session: Session,
+        qvec: Sequence[float],
+        *,
+        k: int = 20,
+        distance: Distance = "cosine",
+        where=None,
+        exact: bool = False,
+        iterative_scan: Optional[IterativeScan] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        oversample: Optional[int] = None,
+    ):
+        """
+        Like vector_search, but returns rows of (id, distance) instead of mapped objects,
+        so candidates don't ship their embedding/content over the wire.
+
+        For filtered searches (`where`):
+          - exact=True scores every matching row (no ANN index), so top-k within the filter is exact.
+            Cheap when the filter is selective.
+          - iterative_scan="strict_order"/"relaxed_order" keeps the HNSW index but lets it keep
+            scanning until k filtered rows are found (pgvector >= 0.8, SET LOCAL for this search).
+
+        ef_search / probes override the model's ann_ef_search / ann_probes for this search; a
+        later search in the transaction that doesn't pass them is back on the defaults.
+        On a quantized model (vector_quantization), `oversample` overrides vector_oversample;
+        exact=True always scores the full-precision vectors.
+
+        With a loaded local_vector_index covering `where`, the search runs in-process (exact)
+        on the mirror as of its last refresh, so recent writes may be missing (see
+        LocalVectorIndex.max_staleness).
+        """
+        hits = cls._local_hits(qvec, k=k, distance=distance, where=where)
+        if hits is not None:
+            return hits
+        stmt = cls._vector_search_ids_stmt(
+            qvec, k=k, distance=distance, where=where, exact=exact, iterative_scan=iterative_scan, oversample=oversample
+        )
+        if exact:
+            return session.execute(stmt).all()
+        cls._apply_ann_settings(
+            session,
+            ef_search=ef_search,
+            probes=probes,
+            iterative_scan=iterative_scan,
+            min_ef_search=cls._rerank_limit(k, oversample),
+        )
+        return session.execute(stmt).all()
+
+    @classmethod
+    async def vector_search_ids_async(
+        cls,
+        session: "AsyncSession",
+        qvec: Sequence[float],
+        *,
+        k: int = 20,
+        distance: Distance = "cosine",
+        where=None,
+        exact: bool = False,
+        iterative_scan: Optional[IterativeScan] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        oversample: Optional[int] = None,
+    ):
+        hits = cls._local_hits(qvec, k=k, distance=distance, where=where)
+        if hits is not None:
+            return hits
+        stmt = cls._vector_search_ids_stmt(
+            qvec, k=k, distance=distance, where=where, exact=exact, iterative_scan=iterative_scan, oversample=oversample
+        )
+        if exact:
+            return (await session.execute(stmt)).all()
+        await cls._apply_ann_settings_async(
+            session,
+            ef_search=ef_search,
+            probes=probes,
+            iterative_scan=iterative_scan,
+            min_ef_search=cls._rerank_limit(k, oversample),
+        )
+        return (await session.execute(stmt)).all()
+
+    @classmethod
+    def _vector_search_many_stmt(
+        cls,
+        qvecs: Sequence[Sequence[float]],
+        *,
+        k: int,
+        distance: Distance,
+        where=None,
+        oversample: Optional[int] = None,
+    ):
+        # Query vectors travel as one text[] parameter ("[x,y,...]" literals) and are cast
+        # back to vector per row, so the batch is a single bind regardless of its size.
+        literals = ["[" + ",".join(repr(float(x)) for x in v) + "]" for v in qvecs]
+        arr = bindparam("qvecs", literals, type_=ARRAY(Text))
+        q = func.unnest(arr).table_valued("qvec", with_ordinality="ord").render_derived(name="q")
+
+        qexpr = cast(q.c.qvec, VECTOR(cls.vector_dim))
+        dist = cls._distance_expr(qexpr, distance)  # type: ignore[arg-type]
+        hits = select(cls.id, dist.label("distance"))  # type: ignore[attr-defined]
+        if where is not None:
+            hits = hits.where(where)
+        limit = cls._rerank_limit(k, oversample)
+        if limit is not None:
+            hits = hits.where(cls._coarse_candidates(qexpr, limit=limit, distance=distance, where=where))
+        hits = hits.order_by(dist).limit(int(k)).lateral("hits")
+
+        return (
+            select(q.c.ord, hits.c.id, hits.c.distance)
+            .select_from(q.join(hits, true()))
+            .order_by(q.c.ord, hits.c.distance)
+        )
+
+    @classmethod
+    def vector_search_many(
+        cls,
+        session: Session,
+        qvecs: Sequence[Sequence[float]],
+        *,
+        k: int = 20,
+        distance: Distance = "cosine",
+        where=None,
+        batch_size: int = 256,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        oversample: Optional[int] = None,
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Run many vector searches with one statement per `batch_size` query vectors:
+        unnest(query vectors) WITH ORDINALITY joined LATERAL to an ordered, limited ANN
+        subquery. Returns one ranked [(id, distance), ...] list per query vector, in input order.
+        """
+        out: list[list[tuple[int, float]]] = [[] for _ in qvecs]
+        size = max(1, int(batch_size))
+        cls._apply_ann_settings(
+            session, ef_search=ef_search, probes=probes, min_ef_search=cls._rerank_limit(k, oversample)
+        )
+        for start in range(0, len(qvecs), size):
+            stmt = cls._vector_search_many_stmt(
+                qvecs[start : start + size], k=k, distance=distance, where=where, oversample=oversample
+            )
+            for ord_, id_, dist in session.execute(stmt).all():
+                out[start + int(ord_) - 1].append((int(id_), float(dist)))
+        return out
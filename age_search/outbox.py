@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Integer,
+    String,
+    Table,
+    Text,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .exceptions import OutboxBatchError
+from .mixins_graph import graph_delete_ids, graph_upsert_rows
+
+# Outbox ops: "upsert", "delete" (plain DELETE) or "detach_delete".
+OUTBOX_OPS = ("upsert", "delete", "detach_delete")
+
+
+def make_graph_outbox_table(metadata, *, table_name: str = "agegraph_outbox") -> Table:
+    """
+    Create (or return existing) outbox table for asynchronous graph sync.
+
+    One row per vertex change: (label, key, node_id, op, props). Rows are written in the
+    application's transaction (install_graph_sync with mode="outbox") and applied to AGE
+    by `drain_outbox` / `agegraph sync-worker`. `attempts` / `last_error` record failed
+    applications; rows that reach the worker's max_attempts stay in the table as dead letters.
+    """
+    existing = metadata.tables.get(table_name)
+    if existing is not None:
+        return existing
+
+    return Table(
+        table_name,
+        metadata,
+        # Integer variant keeps SQLite autoincrement working in tests.
+        Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+        Column("label", String(255), nullable=False),
+        Column("key", String(255), nullable=False, default="id"),
+        Column("node_id", JSON, nullable=False),
+        Column("op", String(16), nullable=False),
+        Column("props", JSON, nullable=True),
+        Column("attempts", Integer, nullable=False, default=0, server_default="0"),
+        Column("last_error", Text, nullable=True),
+        Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+    )
+
+
+def write_outbox_rows(session: Session, table: Table, rows: Sequence[dict[str, Any]]) -> None:
+    """
+    Insert change records ({label, key, node_id, op, props}) into the outbox, in the
+    session's current transaction.
+    """
+    if rows:
+        session.execute(insert(table), list(rows))
+
+
+@dataclass
+class OutboxStats:
+    """
+    Counters for outbox draining. `lag_seconds` is the age of the oldest record in the
+    most recent non-empty batch.
+    """
+
+    processed: int = 0
+    batches: int = 0
+    errors: int = 0
+    lag_seconds: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def _record(self, n: int, lag: Optional[float]) -> None:
+        with self._lock:
+            self.processed += n
+            self.batches += 1
+            self.lag_seconds = lag
+
+    def _error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "processed": self.processed,
+                "batches": self.batches,
+                "errors": self.errors,
+                "lag_seconds": self.lag_seconds,
+            }
+
+
+def _lag_seconds(oldest: Any) -> Optional[float]:
+    if oldest is None:
+        return None
+    if oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - oldest).total_seconds())
+
+
+def _vertex_key(t: Any):
+    # node_id is JSON, which has no equality operator in Postgres; compare its text form.
+    return tuple_(t.label, t.key, cast(t.node_id, Text))
+
+
+def _blocked_vertices(session: Session, table: Table, claimed: Sequence[Any], max_attempts: Optional[int]) -> set:
+    """
+    Vertices in `claimed` that still have an older pending record this batch didn't claim
+    (locked by another worker, or not yet visible to SKIP LOCKED). Those vertices are left
+    for later so records for one vertex are always applied oldest first.
+    """
+    t = table.c
+    first: dict[tuple[str, str, str], int] = {}
+    for r in claimed:
+        k = (r.label, r.key, json.dumps(r.node_id))
+        first[k] = min(first.get(k, r.id), r.id)
+    stmt = select(t.id, t.label, t.key, cast(t.node_id, Text)).where(
+        _vertex_key(t).in_(list(first)),
+        t.id < max(first.values()),
+        t.id.not_in([r.id for r in claimed]),
+    )
+    if max_attempts is not None:
+        stmt = stmt.where(t.attempts < int(max_attempts))
+    blocked = set()
+    for id_, label, key, node_text in session.execute(stmt).all():
+        k = (label, key, json.dumps(json.loads(node_text)))
+        if id_ < first.get(k, -1):
+            blocked.add(k)
+    return blocked
+
+
+def drain_outbox(
+    session: Session,
+    table: Table,
+    *,
+    batch_size: int = 5000,
+    graph_name: Optional[str] = None,
+    stats: Optional[OutboxStats] = None,
+    max_attempts: Optional[int] = None,
+    ids: Optional[Sequence[int]] = None,
+) -> int:
+    """
+    Apply up to `batch_size` outbox records to AGE and delete them. Returns the number of
+    records consumed; the caller commits.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several workers can drain the same
+    outbox concurrently. Ordering per vertex is kept across workers: a vertex whose oldest
+    pending record wasn't claimed by this batch is skipped (its records stay in the outbox
+    and are retried later), so an older change can never be applied after a newer one.
+    Within a batch, repeated changes to one vertex collapse to the latest record.
+
+    Records with `attempts >= max_attempts` are not claimed (dead letters). `ids` restricts
+    the claim to those outbox rows. If applying the batch fails, OutboxBatchError (with the
+    claimed ids) is raised; the caller rolls back.
+    """
+    t = table.c
+    stmt = (
+        select(t.id, t.label, t.key, t.node_id, t.op, t.props, t.created_at)
+        .order_by(t.id)
+        .limit(int(batch_size))
+        .with_for_update(skip_locked=True)
+    )
+    if max_attempts is not None:
+        stmt = stmt.where(t.attempts < int(max_attempts))
+    if ids is not None:
+        stmt = stmt.where(t.id.in_(list(ids)))
+    claimed = session.execute(stmt).all()
+    if not claimed:
+        return 0
+
+    blocked = _blocked_vertices(session, table, claimed, max_attempts)
+    if blocked:
+        claimed = [r for r in claimed if (r.label, r.key, json.dumps(r.node_id)) not in blocked]
+        if not claimed:
+            return 0
+
+    latest: dict[tuple[str, str, Any], Any] = {}
+    for r in claimed:
+        k = (r.label, r.key, json.dumps(r.node_id))
+        latest.pop(k, None)
+        latest[k] = r
+
+    deletes: dict[tuple[str, str, bool], list[Any]] = {}
+    upserts: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for (label, key, _node), r in latest.items():
+        if r.op == "upsert":
+            upserts.setdefault((label, key), []).append({"id": r.node_id, "props": r.props or {}})
+        else:
+            deletes.setdefault((label, key, r.op == "detach_delete"), []).append(r.node_id)
+
+    try:
+        for (label, key, detach), node_ids in deletes.items():
+            graph_delete_ids(
+                session, label, node_ids, key=key, detach=detach, batch_size=batch_size, graph_name=graph_name
+            )
+        for (label, key), rows in upserts.items():
+            graph_upsert_rows(session, label, rows, key=key, batch_size=batch_size, graph_name=graph_name)
+    except Exception as e:
+        raise OutboxBatchError([r.id for r in claimed], str(e)) from e
+
+    session.execute(delete(table).where(t.id.in_([r.id for r in claimed])))
+
+    if stats is not None:
+        stats._record(len(claimed), _lag_seconds(min(r.created_at for r in claimed)))
+    return len(claimed)
+
+
+def _isolate_failures(
+    engine: Engine,
+    table: Table,
+    ids: Sequence[int],
+    *,
+    graph_name: Optional[str],
+    stats: OutboxStats,
+    max_attempts: Optional[int],
+) -> None:
+    """
+    After a failed batch, apply its records one per transaction so good records go through
+    and only the failing ones get their `attempts` / `last_error` bumped.
+    """
+    for id_ in sorted(ids):
+        try:
+            with Session(engine) as s:
+                drain_outbox(
+                    s, table, batch_size=1, graph_name=graph_name, stats=stats, max_attempts=max_attempts, ids=[id_]
+                )
+                s.commit()
+        except OutboxBatchError as e:
+            with Session(engine) as s:
+                s.execute(
+                    update(table)
+                    .where(table.c.id == id_)
+                    .values(attempts=table.c.attempts + 1, last_error=str(e.__cause__ or e)[:2000])
+                )
+                s.commit()
+
+
+def run_sync_worker(
+    engine: Engine,
+    table: Table,
+    *,
+    batch_size: int = 5000,
+    parallelism: int = 1,
+    poll_interval: float = 1.0,
+    graph_name: Optional[str] = None,
+    stop: Optional[threading.Event] = None,
+    until_empty: bool = False,
+    stats: Optional[OutboxStats] = None,
+    max_attempts: Optional[int] = 5,
+) -> OutboxStats:
+    """
+    Drain the outbox with `parallelism` threads, each committing one batch per transaction.
+
+    Runs until `stop` is set (or, with until_empty=True, until nothing claimable is left).
+    A failed batch is rolled back and its records are retried one per transaction; records
+    that fail on their own get `attempts` incremented and are skipped once they reach
+    `max_attempts` (dead letters, kept in the table with `last_error`). With
+    max_attempts=None nothing is dead-lettered and until_empty=True re-raises instead.
+    """
+    stop = stop or threading.Event()
+    stats = stats or OutboxStats()
+
+    def _loop() -> None:
+        while not stop.is_set():
+            try:
+                with Session(engine) as s:
+                    n = drain_outbox(
+                        s, table, batch_size=batch_size, graph_name=graph_name, stats=stats, max_attempts=max_attempts
+                    )
+                    s.commit()
+            except OutboxBatchError as e:
+                stats._error()
+                if until_empty and max_attempts is None:
+                    raise
+                _isolate_failures(
+                    engine, table, e.ids, graph_name=graph_name, stats=stats, max_attempts=max_attempts
+                )
+                continue
+            except Exception:
+                stats._error()
+                n = 0
+                if until_empty:
+                    raise
+            if n == 0:
+                if until_empty:
+                    return
+                stop.wait(poll_interval)
+
+    if parallelism <= 1:
+        _loop()
+        return stats
+
+    threads = [threading.Thread(target=_loop, name=f"agegraph-sync-{i}", daemon=True) for i in range(parallelism)]
+    for th in threads:
+        th.start()
+    try:
+        while any(th.is_alive() for th in threads):
+            time.sleep(0.1)
+    finally:
+        stop.set()
+        for th in threads:
+            th.join()
+    return stats
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .exceptions import LegTimeoutError
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+R = TypeVar("R")
+
+_DEFAULT_WORKERS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_engine_executors: "weakref.WeakKeyDictionary[Engine, ThreadPoolExecutor]" = weakref.WeakKeyDictionary()
+_executor_lock = threading.Lock()
+
+
+def _pool_capacity(engine: Engine) -> Optional[int]:
+    """
+    How many connections the engine's pool can hand out at once (pool_size + max_overflow),
+    or None when it is unbounded or unknown (NullPool, StaticPool, max_overflow=-1).
+    """
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    size = size() if callable(size) else size
+    if not isinstance(size, int):
+        return None
+    overflow = getattr(pool, "_max_overflow", 0)
+    if overflow < 0:
+        return None
+    return max(1, size + overflow)
+
+
+def leg_executor(engine: Optional[Engine] = None) -> ThreadPoolExecutor:
+    """
+    Pool used to run search legs concurrently (created lazily).
+
+    Unless one was installed with set_leg_executor, each engine gets its own pool with as many
+    threads as its connection pool can serve (pool_size + max_overflow), so legs never queue
+    on threads while connections are free, nor hold threads waiting for a connection.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            return _executor
+        if engine is None:
+            _executor = ThreadPoolExecutor(max_workers=_DEFAULT_WORKERS, thread_name_prefix="agegraph-leg")
+            return _executor
+        ex = _engine_executors.get(engine)
+        if ex is None:
+            workers = _pool_capacity(engine) or _DEFAULT_WORKERS
+            ex = _engine_executors[engine] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agegraph-leg")
+        return ex
+
+
+def set_leg_executor(executor: Optional[ThreadPoolExecutor]) -> None:
+    """
+    Use one pool for all concurrent legs, whatever the engine; None goes back to the
+    per-engine pools sized from the connection pool.
+    """
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+
+class _LegHandle:
+    """
+    Lets the caller cancel a leg's running statement from another thread. The DBAPI
+    connection is attached while the leg runs and detached before it goes back to the pool,
+    so a late cancel never hits another checkout's query.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conn: Any = None
+        self.abandoned = False
+
+    def attach(self, dbapi_conn: Any) -> None:
+        with self._lock:
+            if self.abandoned:
+                raise LegTimeoutError("search leg abandoned before it started")
+            self._conn = dbapi_conn
+
+    def detach(self) -> None:
+        with self._lock:
+            self._conn = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.abandoned = True
+            cancel = getattr(self._conn, "cancel", None)  # psycopg / psycopg2 connections
+            if cancel is not None:
+                try:
+                    cancel()
+                except Exception:  # noqa: BLE001 - best effort; statement_timeout still applies
+                    pass
+
+
+def _driver_connection(s: Session) -> Any:
+    return s.connection().connection.driver_connection
+
+
+def _run_on_own_session(
+    engine: Engine,
+    fn: Callable[[Session], R],
+    timeout: Optional[float],
+    handle: _LegHandle,
+) -> R:
+    with Session(engine) as s:
+        handle.attach(_driver_connection(s))
+        try:
+            if timeout is not None and engine.dialect.name == "postgresql":
+                # Server-side backstop in case the cancel request is lost.
+                s.execute(
+                    text("SELECT set_config('statement_timeout', :v, true)"),
+                    {"v": f"{max(1, int(timeout * 1000))}ms"},
+                )
+            return fn(s)
+        finally:
+            handle.detach()
+            s.rollback()
+
+
+def run_legs(
+    session: Session,
+    legs: Sequence[Callable[[Session], R]],
+    *,
+    timeout: Optional[float] = None,
+    allow_partial: bool = False,
+) -> list[Optional[R]]:
+    """
+    Run independent read-only legs concurrently, each on its own pooled connection.
+
+    Results come back in the order of `legs` (not completion order), so fusion stays
+    deterministic. Legs run in their own transactions and don't see the caller's
+    uncommitted changes.
+
+    If a leg exceeds `timeout` seconds, its running statement is cancelled on the server
+    (the DBAPI connection's cancel(), with statement_timeout as a backstop) and run_legs
+    raises LegTimeoutError, or yields None for that leg when allow_partial=True. A leg that
+    had not started yet is dropped. If the session is bound to a single Connection (which
+    can't be shared across threads), legs run sequentially on `session` instead.
+    """
+    bind = session.get_bind()
+    if not isinstance(bind, Engine):
+        return [fn(session) for fn in legs]
+
+    pool = leg_executor(bind)
+    handles = [_LegHandle() for _ in legs]
+    futures: list[Future] = [pool.submit(_run_on_own_session, bind, fn, timeout, h) for fn, h in zip(legs, handles)]
+    deadline = monotonic() + timeout if timeout is not None else None
+
+    out: list[Optional[R]] = []
+    for i, fut in enumerate(futures):
+        remaining = None if deadline is None else max(0.0, deadline - monotonic())
+        try:
+            out.append(fut.result(timeout=remaining))
+        except FutureTimeoutError:
+            # fut.cancel() only stops a leg still queued; a running one is interrupted
+            # through its connection.
+            fut.cancel()
+            handles[i].cancel()
+            if not allow_partial:
+                for j in range(i + 1, len(futures)):
+                    futures[j].cancel()
+                    handles[j].cancel()
+                raise LegTimeoutError(f"search leg {i} exceeded {timeout}s") from None
+            out.append(None)
+    return out
+
+
+async def _run_on_own_async_session(
+    engine: "AsyncEngine",
+    fn: Callable[["AsyncSession"], Awaitable[R]],
+    timeout: Optional[float],
+) -> R:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    async with AsyncSession(engine) as s:
+        if timeout is not None and engine.dialect.name == "postgresql":
+            await s.execute(
+                text("SELECT set_config('statement_timeout', :v, true)"),
+                {"v": f"{max(1, int(timeout * 1000))}ms"},
+            )
+        try:
+            return await fn(s)
+        finally:
+            await s.rollback()
+
+
+async def run_legs_async(
+    session: "AsyncSession",
+    legs: Sequence[Callable[["AsyncSession"], Awaitable[R]]],
+    *,
+    timeout: Optional[float] = None,
+    allow_partial: bool = False,
+) -> list[Optional[R]]:
+    """
+    asyncio counterpart of run_legs: each leg gets its own AsyncSession on `session.bind`
+    and the legs are gathered; results keep the order of `legs`.
+    """
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    bind = session.bind
+    if not isinstance(bind, AsyncEngine):
+        return [await fn(session) for fn in legs]
+
+    async def _one(i: int, fn: Callable[["AsyncSession"], Awaitable[R]]) -> Optional[R]:
+        try:
+            return await asyncio.wait_for(_run_on_own_async_session(bind, fn, timeout), timeout)
+        except asyncio.TimeoutError:
+            if not allow_partial:
+                raise LegTimeoutError(f"search leg {i} exceeded {timeout}s") from None
+            return None
+
+    return list(await asyncio.gather(*(_one(i, fn) for i, fn in enumerate(legs))))
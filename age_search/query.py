@@ -1,8 +1,31 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Any, Optional
+import base64
+import json
+import re
+from dataclasses import dataclass, field, replace
+from typing import Any, Iterator, Optional, Sequence, Type, TypeVar
 from sqlalchemy.orm import Session
-from .cypher import cypher_json
+from .cypher import cypher_json, cypher_json_async, cypher_rows, iter_cypher_json
+from .hydrate import hydrate
+
+T = TypeVar("T")
+
+_DIRECTION = re.compile(r"\s+(ASC|DESC)\s*$", re.IGNORECASE)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
 
 @dataclass
 class CypherQuery:
@@ -13,6 +36,9 @@ class CypherQuery:
     where_clauses: list[str] = field(default_factory=list)
     limit_n: Optional[int] = None
     graph_name: Optional[str] = None
+    order: list[tuple[str, bool]] = field(default_factory=list)  # (expr, descending)
+    skip_n: Optional[int] = None
+    after_values: Optional[list[Any]] = None
 
     def where(self, clause: str, **params: Any) -> "CypherQuery":
         self.where_clauses.append(clause)
@@ -23,19 +49,146 @@ class CypherQuery:
         self.limit_n = int(n)
         return self
 
-    def _compile(self) -> str:
+    def order_by(self, *exprs: str) -> "CypherQuery":
+        """
+        Add sort keys, e.g. order_by("m.year DESC", "m.id"). Keyset cursors compare on
+        these keys, so end with a unique one (such as the id property).
+        """
+        for e in exprs:
+            m = _DIRECTION.search(e)
+            desc = bool(m and m.group(1).upper() == "DESC")
+            self.order.append((e[: m.start()] if m else e, desc))
+        return self
+
+    def skip(self, n: int) -> "CypherQuery":
+        self.skip_n = int(n)
+        return self
+
+    def after(self, cursor: Optional[str]) -> "CypherQuery":
+        """
+        Continue after the row a cursor (from page()) points at. Compiles into a WHERE on
+        the order_by keys, so deep pages cost the same as the first one.
+        """
+        if cursor is None:
+            self.after_values = None
+            return self
+        if not self.order:
+            raise ValueError("after() needs order_by() keys")
+        values = decode_cursor(cursor)
+        if len(values) != len(self.order):
+            raise ValueError("Cursor does not match the order_by() keys")
+        self.after_values = values
+        return self
+
+    def _keyset_clause(self) -> tuple[Optional[str], dict[str, Any]]:
+        if self.after_values is None:
+            return None, {}
+        params = {f"after_{i}": v for i, v in enumerate(self.after_values)}
+        # (k0 > v0) OR (k0 = v0 AND k1 > v1) OR ...
+        ors = []
+        for i, (expr, desc) in enumerate(self.order):
+            eqs = [f"{e} = $after_{j}" for j, (e, _d) in enumerate(self.order[:i])]
+            cmp = f"{expr} {'<' if desc else '>'} $after_{i}"
+            ors.append("(" + " AND ".join([*eqs, cmp]) + ")")
+        return " OR ".join(ors), params
+
+    def _compile(self, *, with_keys: bool = False) -> str:
         parts = [self.match.strip()]
-        if self.where_clauses:
-            parts.append("WHERE " + " AND ".join(f"({c})" for c in self.where_clauses))
-        parts.append(f"RETURN {self.return_expr} AS row")
+        clauses = list(self.where_clauses)
+        keyset, _ = self._keyset_clause()
+        if keyset:
+            clauses.append(keyset)
+        if clauses:
+            parts.append("WHERE " + " AND ".join(f"({c})" for c in clauses))
+        ret = f"RETURN {self.return_expr} AS row"
+        if with_keys:
+            ret += "".join(f", {e} AS k{i}" for i, (e, _d) in enumerate(self.order))
+        parts.append(ret)
+        if self.order:
+            parts.append("ORDER BY " + ", ".join(f"{e}{' DESC' if d else ''}" for e, d in self.order))
+        if self.skip_n is not None:
+            parts.append(f"SKIP {self.skip_n}")
         if self.limit_n is not None:
             parts.append(f"LIMIT {self.limit_n}")
         return "\n".join(parts)
 
+    def _params(self) -> dict[str, Any]:
+        return {**self.params, **self._keyset_clause()[1]}
+
     def all(self) -> list[Any]:
-        return cypher_json(self.session, self._compile(), params=self.params, graph_name=self.graph_name)
+        return cypher_json(self.session, self._compile(), params=self._params(), graph_name=self.graph_name)
+
+    def page(self, size: int) -> tuple[list[Any], Optional[str]]:
+        """
+        One keyset page: (rows, cursor for the next page or None when exhausted).
+        Rows are decoded client-side (see age_search.cypher.cypher_rows).
+        """
+        if not self.order:
+            raise ValueError("page() needs order_by() keys")
+        q = replace(self, limit_n=int(size))
+        columns = ["row", *(f"k{i}" for i in range(len(self.order)))]
+        rows = cypher_rows(
+            self.session,
+            q._compile(with_keys=True),
+            columns=columns,
+            params=q._params(),
+            graph_name=self.graph_name,
+        )
+        cursor = encode_cursor(rows[-1][1:]) if len(rows) == int(size) else None
+        return [r[0] for r in rows], cursor
+
+    def pages(self, size: int) -> Iterator[list[Any]]:
+        """
+        Iterate over all results `size` rows at a time using keyset cursors.
+        """
+        q = replace(self)
+        while True:
+            rows, cursor = q.page(size)
+            if rows:
+                yield rows
+            if cursor is None:
+                return
+            q = replace(self).after(cursor)
+
+    def stream(self, *, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Like all(), but yields rows from a server-side cursor `batch_size` at a time.
+        """
+        return iter_cypher_json(
+            self.session,
+            self._compile(),
+            params=self._params(),
+            graph_name=self.graph_name,
+            batch_size=batch_size,
+        )
+
+    def objects(self, model: Type[T], *, defer: Sequence[str] = ()) -> list[T]:
+        """
+        Return mapped `model` instances instead of vertex JSON: cypher returns only the
+        vertex id property of `return_expr` (which must be a node variable), then all
+        matches are loaded with one SELECT (see age_search.hydrate.hydrate).
+        """
+        key = getattr(model, "vertex_property_key", "id")
+        ids = replace(self, return_expr=f"{self.return_expr}.{key}").all()
+        return hydrate(self.session, model, ids, defer=defer)
 
     def first(self) -> Optional[Any]:
         self.limit(1)
         rows = self.all()
         return rows[0] if rows else None
+
+    async def all_async(self) -> list[Any]:
+        """
+        Same as all(), for a CypherQuery whose `session` is an AsyncSession.
+        """
+        return await cypher_json_async(
+            self.session,  # type: ignore[arg-type]
+            self._compile(),
+            params=self._params(),
+            graph_name=self.graph_name,
+        )
+
+    async def first_async(self) -> Optional[Any]:
+        self.limit(1)
+        rows = await self.all_async()
+        return rows[0] if rows else None
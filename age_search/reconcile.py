@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, Optional, Sequence, Type
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .cypher import _require_safe_ident, cypher_rows
+from .mixins_graph import graph_delete_ids, graph_upsert_rows
+
+
+@dataclass
+class ReconcileReport:
+    """
+    Outcome of reconcile_graph. `missing` / `extra` / `stale` hold the affected ids
+    (vertices to create / delete / update); `last_key` is the resume point.
+    """
+
+    label: str
+    dry_run: bool
+    chunks: int = 0
+    rows: int = 0
+    vertices: int = 0
+    missing: list[Any] = field(default_factory=list)
+    extra: list[Any] = field(default_factory=list)
+    stale: list[Any] = field(default_factory=list)
+    last_key: Any = None
+    done: bool = False
+
+    @property
+    def in_sync(self) -> bool:
+        return not (self.missing or self.extra or self.stale)
+
+
+def props_hash(props: dict[str, Any], fields: Sequence[str]) -> str:
+    """
+    Stable hash of the chosen vertex properties (missing keys hash as null).
+    """
+    payload = json.dumps({f: props.get(f) for f in fields}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _load_checkpoint(path: str, label: str) -> Any:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        data = json.load(f)
+    return data.get("last_key") if data.get("label") == label else None
+
+
+def _save_checkpoint(path: str, label: str, last_key: Any) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"label": label, "last_key": last_key}, f)
+    os.replace(tmp, path)
+
+
+def _graph_chunk(
+    session: Session,
+    label: str,
+    key: str,
+    lo: Any,
+    hi: Any,
+    limit: int,
+    graph_name: Optional[str],
+) -> list[tuple[Any, dict[str, Any]]]:
+    """
+    Up to `limit` vertices with lo < key <= hi (either bound may be None), in key order.
+    """
+    where = []
+    if lo is not None:
+        where.append(f"n.{key} > $lo")
+    if hi is not None:
+        where.append(f"n.{key} <= $hi")
+    cy = f"""
+    MATCH (n:{label})
+    {"WHERE " + " AND ".join(where) if where else ""}
+    RETURN n.{key}, properties(n)
+    ORDER BY n.{key}
+    LIMIT {int(limit)}
+    """
+    rows = cypher_rows(session, cy, columns=("k", "props"), params={"lo": lo, "hi": hi}, graph_name=graph_name)
+    return [(k, props or {}) for k, props in rows]
+
+
+def _graph_range(
+    session: Session,
+    label: str,
+    key: str,
+    lo: Any,
+    hi: Any,
+    page_size: int,
+    graph_name: Optional[str],
+) -> Iterator[list[tuple[Any, dict[str, Any]]]]:
+    """
+    The vertices of a key range, keyset-paged `page_size` at a time, so an open-ended or
+    vertex-heavy range never comes back as one unbounded result.
+    """
+    while True:
+        page = _graph_chunk(session, label, key, lo, hi, page_size, graph_name)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        lo = page[-1][0]
+
+
+def reconcile_graph(
+    session: Session,
+    model: Type[Any],
+    *,
+    fields: Optional[Sequence[str]] = None,
+    chunk_size: int = 5000,
+    dry_run: bool = False,
+    checkpoint: Optional[str] = None,
+    start_after: Any = None,
+    batch_size: int = 1000,
+    commit: bool = True,
+    graph_name: Optional[str] = None,
+) -> ReconcileReport:
+    """
+    Compare a GraphNodeMixin model's table with its AGE vertices and repair the drift.
+
+    Walks the table in primary-key order, `chunk_size` rows at a time (keyset pagination),
+    and reads the label's vertices for the same key range, also keyset-paged by `chunk_size`
+    (ORDER BY n.<key> LIMIT). The last range is open-ended, so vertices past the table's
+    last key are seen too. Per chunk:
+      - rows without a vertex are upserted (missing)
+      - vertices without a row are deleted (extra)
+      - vertices whose `fields` hash differs from graph_properties() are upserted (stale)
+
+    `fields` defaults to the id property plus `graph_property_fields`. With dry_run=True
+    nothing is written. Otherwise each chunk's fixes are committed on `session` and, if
+    `checkpoint` is a file path, the last key is saved there so an interrupted run resumes
+    after it. Pass commit=False to run inside the caller's transaction instead: nothing
+    is committed (and no checkpoint is written, since nothing is durable yet).
+    """
+    label = _require_safe_ident(model._label(), what="graph label")
+    key = _require_safe_ident(model.vertex_property_key, what="vertex property key")
+    pk = getattr(model, model.graph_id_field)
+    fields = list(fields) if fields is not None else [key, *model.graph_property_fields]
+
+    report = ReconcileReport(label=label, dry_run=dry_run)
+    lo = start_after
+    if lo is None and checkpoint:
+        lo = _load_checkpoint(checkpoint, label)
+
+    while True:
+        stmt = select(model).order_by(pk).limit(int(chunk_size))
+        if lo is not None:
+            stmt = stmt.where(pk > lo)
+        objs = session.execute(stmt).scalars().all()
+        last_chunk = len(objs) < chunk_size
+        next_lo = objs[-1].graph_id() if objs else lo
+        # The final chunk is open-ended so vertices past the last row count as extra.
+        hi = None if last_chunk else next_lo
+
+        rows = {o.graph_id(): o for o in objs}
+        matched: set[Any] = set()
+        stale: list[Any] = []
+        for page in _graph_range(session, label, key, lo, hi, int(chunk_size), graph_name):
+            report.vertices += len(page)
+            extra = []
+            for gid, vprops in page:
+                o = rows.get(gid)
+                if o is None:
+                    extra.append(gid)
+                    continue
+                matched.add(gid)
+                if props_hash(vprops, fields) != props_hash(o.graph_properties(), fields):
+                    stale.append(gid)
+            report.extra.extend(extra)
+            if extra and not dry_run:
+                graph_delete_ids(session, label, extra, key=key, batch_size=batch_size, graph_name=graph_name)
+        report.chunks += 1
+        report.rows += len(objs)
+
+        missing = [gid for gid in rows if gid not in matched]
+        report.missing.extend(missing)
+        report.stale.extend(stale)
+        if not dry_run:
+            fix = set(missing).union(stale)
+            upserts = [{"id": gid, "props": o.graph_properties()} for gid, o in rows.items() if gid in fix]
+            if upserts:
+                graph_upsert_rows(session, label, upserts, key=key, batch_size=batch_size, graph_name=graph_name)
+            if commit:
+                session.commit()
+
+        if objs:
+            lo = report.last_key = next_lo
+            if checkpoint and commit and not dry_run:
+                _save_checkpoint(checkpoint, label, lo)
+        if last_chunk:
+            break
+
+    report.done = True
+    if checkpoint and commit and not dry_run and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return report
+
+
+def report_dict(report: ReconcileReport, *, max_ids: int = 20) -> dict[str, Any]:
+    """
+    JSON-friendly summary (id lists truncated to `max_ids`).
+    """
+    out = asdict(report)
+    for k in ("missing", "extra", "stale"):
+        ids = out[k]
+        out[k] = {"count": len(ids), "ids": ids[:max_ids]}
+    return out
@@ -1,9 +1,54 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, Optional, Type
+from typing import Any, Iterable, Optional, Sequence, Type
 from sqlalchemy.orm import Session
+from .cypher import _require_safe_ident, cypher_rows
+from .mixins_graph import _batches
 from .query import CypherQuery
 
+
+def graph_link_rows(
+    session: Session,
+    edge: str,
+    rows: Sequence[dict[str, Any]],
+    *,
+    source_label: str,
+    target_label: str,
+    source_key: str = "id",
+    target_key: str = "id",
+    create_only: bool = False,
+    batch_size: int = 1000,
+    graph_name: Optional[str] = None,
+) -> int:
+    """
+    Create many (source)-[edge]->(target) edges with one UNWIND cypher() call per batch.
+
+    `rows` are {"s": source id, "t": target id, "props": {...}} dicts. Edges are MERGEd
+    unless create_only=True (caller guarantees they don't exist yet; skips the existence
+    check). Pairs whose endpoints don't exist are ignored. Returns the number of edges
+    merged/created.
+    """
+    edge = _require_safe_ident(edge, what="edge label")
+    src = _require_safe_ident(source_label, what="graph label")
+    tgt = _require_safe_ident(target_label, what="graph label")
+    skey = _require_safe_ident(source_key, what="vertex property key")
+    tkey = _require_safe_ident(target_key, what="vertex property key")
+    with_props = any(r.get("props") for r in rows)
+
+    cy = f"""
+    UNWIND $rows AS r
+    MATCH (n:{src}) WHERE n.{skey} = r.s
+    MATCH (m:{tgt}) WHERE m.{tkey} = r.t
+    {"CREATE" if create_only else "MERGE"} (n)-[e:{edge}]->(m)
+    {"SET e += r.props" if with_props else ""}
+    RETURN count(e)
+    """
+    total = 0
+    for batch in _batches(rows, batch_size):
+        out = cypher_rows(session, cy, columns=("n",), params={"rows": list(batch)}, graph_name=graph_name)
+        total += int(out[0][0]) if out and out[0][0] is not None else 0
+    return total
+
 @dataclass(frozen=True)
 class GraphRelationship:
     edge: str
@@ -22,6 +67,133 @@ class GraphRelationship:
             return self
         return _BoundRel(self, instance)
 
+    def _pattern(self, src: str, node_props: str = "") -> str:
+        tgt = f":{self.target_label}" if self.target_label else ""
+        if self.direction == "out":
+            return f"(n:{src}{node_props})-[:{self.edge}]->(m{tgt})"
+        if self.direction == "in":
+            return f"(n:{src}{node_props})<-[:{self.edge}]-(m{tgt})"
+        return f"(n:{src}{node_props})-[:{self.edge}]-(m{tgt})"
+
+    def load_for(
+        self,
+        session: Session,
+        instances: Iterable[Any],
+        *,
+        limit_per_source: Optional[int] = None,
+        graph_name: Optional[str] = None,
+    ) -> dict[Any, list[Any]]:
+        """
+        Eager-load neighbors for many source instances (or raw ids) in one cypher() call,
+        instead of one `instance.<rel>(session).all()` per source.
+
+        Returns {source_id: [neighbor vertex, ...]} with an entry (possibly empty) for every
+        requested id. Neighbors are ordered by their target_key and cut to
+        `limit_per_source` on the server.
+
+        The cut is a slice of collect(m): cypher has no per-group LIMIT, so AGE still matches,
+        sorts and collects every neighbor of each source before slicing. Only the sliced lists
+        are sent back, but server cost follows the sources' full degree. For a few high-degree
+        sources, one `instance.<rel>(session).limit(n)` query each (LIMIT applied during the
+        match) can be cheaper.
+        """
+        ids = list(dict.fromkeys(i if _is_raw_id(i) else getattr(i, self.source_key) for i in instances))
+        out: dict[Any, list[Any]] = {i: [] for i in ids}
+        if not ids:
+            return out
+
+        src = _require_safe_ident(self.source_label or "", what="graph label")
+        skey = _require_safe_ident(self.source_key, what="vertex property key")
+        tkey = _require_safe_ident(self.target_key, what="vertex property key")
+        # Sliced after collect(): see the docstring for the cost on high-degree sources.
+        sliced = f"ms[0..{int(limit_per_source)}]" if limit_per_source is not None else "ms"
+        cy = f"""
+        MATCH {self._pattern(src)}
+        WHERE n.{skey} IN $ids
+        WITH n.{skey} AS sid, m
+        ORDER BY m.{tkey}
+        WITH sid, collect(m) AS ms
+        RETURN sid, {sliced}
+        """
+        for sid, neighbors in cypher_rows(session, cy, columns=("sid", "ms"), params={"ids": ids}, graph_name=graph_name):
+            out.setdefault(sid, []).extend(neighbors or [])
+        return out
+
+    def link_pairs(
+        self,
+        session: Session,
+        pairs: Iterable[Sequence[Any]],
+        *,
+        graph_name: Optional[str] = None,
+        props: Optional[dict[str, Any]] = None,
+        weight: Optional[float] = None,
+        target_label: Optional[str] = None,
+        batch_size: int = 1000,
+        create_only: bool = False,
+    ) -> int:
+        """
+        Bulk version of `add`: create an edge for every (source, target) or
+        (source, target, props) pair, batched through UNWIND.
+
+        Sources/targets may be mapped instances or raw id values. `props` / `weight` apply to
+        every edge; per-pair props are merged on top. create_only=True uses CREATE instead of
+        MERGE (no existence check). Returns the number of edges written.
+
+        The target label is `target_label`, else the relationship's target_label, else the
+        label of the target instances (all targets must share it). Raises ValueError when it
+        can't be determined (only raw target ids) or the targets disagree.
+        """
+        base = dict(props or {})
+        if weight is not None:
+            base["weight"] = float(weight)
+
+        rows: list[dict[str, Any]] = []
+        tgt_label = target_label or self.target_label
+        inferred: Optional[str] = None
+        for pair in pairs:
+            s, t = pair[0], pair[1]
+            if tgt_label is None and not _is_raw_id(t):
+                label = _vertex_label(t)
+                if inferred is not None and label != inferred:
+                    raise ValueError(
+                        f"{self.edge}: targets have different labels ({inferred!r}, {label!r}); pass target_label="
+                    )
+                inferred = label
+            rows.append(
+                {
+                    "s": s if _is_raw_id(s) else getattr(s, self.source_key),
+                    "t": t if _is_raw_id(t) else getattr(t, self.target_key),
+                    "props": {**base, **(pair[2] or {})} if len(pair) > 2 else base,
+                }
+            )
+        if not rows:
+            return 0
+        tgt_label = tgt_label or inferred
+        if tgt_label is None:
+            raise ValueError(f"{self.edge}: can't infer the target label from raw ids; pass target_label=")
+        return graph_link_rows(
+            session,
+            self.edge,
+            rows,
+            source_label=self.source_label or "",
+            target_label=tgt_label,
+            source_key=self.source_key,
+            target_key=self.target_key,
+            create_only=create_only,
+            batch_size=batch_size,
+            graph_name=graph_name,
+        )
+
+
+def _is_raw_id(v: Any) -> bool:
+    return isinstance(v, (int, str))
+
+
+def _vertex_label(obj: Any) -> str:
+    # GraphNodeMixin models may map to a graph_label other than their class name.
+    label = getattr(type(obj), "_label", None)
+    return label() if callable(label) else type(obj).__name__
+
 @dataclass
 class _BoundRel:
     rel: GraphRelationship
@@ -29,15 +201,7 @@ class _BoundRel:
 
     def query(self, session: Session, *, graph_name: Optional[str] = None) -> CypherQuery:
         src = self.rel.source_label or self.inst.__class__.__name__
-        tgt = f":{self.rel.target_label}" if self.rel.target_label else ""
-        edge = self.rel.edge
-
-        if self.rel.direction == "out":
-            pat = f"(n:{src} {{{self.rel.source_key}: $id}})-[:{edge}]->(m{tgt})"
-        elif self.rel.direction == "in":
-            pat = f"(n:{src} {{{self.rel.source_key}: $id}})<-[:{edge}]-(m{tgt})"
-        else:
-            pat = f"(n:{src} {{{self.rel.source_key}: $id}})-[:{edge}]-(m{tgt})"
+        pat = self.rel._pattern(src, f" {{{self.rel.source_key}: $id}}")
 
         q = CypherQuery(
             session=session,
@@ -51,6 +215,24 @@ class _BoundRel:
     def __call__(self, session: Session, *, graph_name: Optional[str] = None) -> CypherQuery:
         return self.query(session, graph_name=graph_name)
 
+    def objects(
+        self,
+        session: Session,
+        model: Optional[Type[Any]] = None,
+        *,
+        graph_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        defer: Sequence[str] = (),
+    ) -> list[Any]:
+        """
+        Neighbors as mapped instances (one cypher call + one SELECT). `model` defaults to
+        the source instance's class, which fits self-referencing relationships.
+        """
+        q = self.query(session, graph_name=graph_name)
+        if limit is not None:
+            q.limit(limit)
+        return q.objects(model or type(self.inst), defer=defer)
+
     def add(
         self,
         session: Session,
@@ -78,3 +260,27 @@ class _BoundRel:
                                           "tgt_id": getattr(other, self.rel.target_key),
                                           "props": rel_props}, graph_name=graph_name)
         return q.first()
+
+    def add_many(
+        self,
+        session: Session,
+        others: Iterable[Any],
+        *,
+        graph_name: Optional[str] = None,
+        props: Optional[dict[str, Any]] = None,
+        weight: Optional[float] = None,
+        batch_size: int = 1000,
+        create_only: bool = False,
+    ) -> int:
+        """
+        `add` for many targets at once (see GraphRelationship.link_pairs).
+        """
+        return self.rel.link_pairs(
+            session,
+            ((self.inst, o) for o in others),
+            graph_name=graph_name,
+            props=props,
+            weight=weight,
+            batch_size=batch_size,
+            create_only=create_only,
+        )
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from sqlalchemy import ForeignKey, Integer, String, Table, Text, Column, select
 from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 
 from .base import Base
-from .cypher import cypher_json
+from .cypher import cypher_json, cypher_json_async
 from .mixins_graph import GraphNodeMixin
 from .relationships import GraphRelationship
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 
 class Label(Base, GraphNodeMixin):
     """
@@ -123,25 +126,16 @@ def doc_ids_for_labels(
     return [int(r[0]) for r in session.execute(stmt).all()]
 
 
-def graph_descendant_label_ids(
-    session: Session,
-    *,
-    graph_name: str,
-    root_label_id: int,
-    max_hops: int = 25,
-    include_self: bool = True,
-    limit: int = 5000,
-) -> list[int]:
-    """
-    AGE subtree expansion for Label nodes connected by :PARENT_OF edges.
-    """
-    cy = f"""
+def _descendant_labels_cypher(max_hops: int, limit: int) -> str:
+    return f"""
     MATCH (root:Label {{id: $root}})
     MATCH (root)-[:PARENT_OF*1..{int(max_hops)}]->(d:Label)
     RETURN DISTINCT d.id
     LIMIT {int(limit)}
     """
-    rows = cypher_json(session, cy, params={"root": int(root_label_id)}, graph_name=graph_name)
+
+
+def _descendant_ids(rows: list, root_label_id: int, include_self: bool) -> list[int]:
     out = [int(x) for x in rows if x is not None]
     if include_self:
         out.append(int(root_label_id))
@@ -155,6 +149,49 @@ def graph_descendant_label_ids(
     return deduped
 
 
+def graph_descendant_label_ids(
+    session: Session,
+    *,
+    graph_name: str,
+    root_label_id: int,
+    max_hops: int = 25,
+    include_self: bool = True,
+    limit: int = 5000,
+) -> list[int]:
+    """
+    AGE subtree expansion for Label nodes connected by :PARENT_OF edges.
+    """
+    cy = _descendant_labels_cypher(max_hops, limit)
+    rows = cypher_json(session, cy, params={"root": int(root_label_id)}, graph_name=graph_name)
+    return _descendant_ids(rows, root_label_id, include_self)
+
+
+async def graph_descendant_label_ids_async(
+    session: "AsyncSession",
+    *,
+    graph_name: str,
+    root_label_id: int,
+    max_hops: int = 25,
+    include_self: bool = True,
+    limit: int = 5000,
+) -> list[int]:
+    """
+    asyncio counterpart of graph_descendant_label_ids.
+    """
+    cy = _descendant_labels_cypher(max_hops, limit)
+    rows = await cypher_json_async(session, cy, params={"root": int(root_label_id)}, graph_name=graph_name)
+    return _descendant_ids(rows, root_label_id, include_self)
+
+
+def _doc_ids_cypher(doc_label: str, label_label: str, edge: str, limit: int) -> str:
+    return f"""
+    MATCH (d:{doc_label})-[:{edge}]->(l:{label_label})
+    WHERE l.id IN $ids
+    RETURN DISTINCT d.id
+    LIMIT {int(limit)}
+    """
+
+
 def graph_doc_ids_for_label_ids(
     session: Session,
     *,
@@ -171,16 +208,32 @@ def graph_doc_ids_for_label_ids(
     if not label_ids:
         return []
 
-    cy = f"""
-    MATCH (d:{doc_label})-[:{edge}]->(l:{label_label})
-    WHERE l.id IN $ids
-    RETURN DISTINCT d.id
-    LIMIT {int(limit)}
-    """
+    cy = _doc_ids_cypher(doc_label, label_label, edge, limit)
     rows = cypher_json(session, cy, params={"ids": [int(i) for i in label_ids]}, graph_name=graph_name)
     return [int(x) for x in rows if x is not None]
 
 
+async def graph_doc_ids_for_label_ids_async(
+    session: "AsyncSession",
+    *,
+    graph_name: str,
+    label_ids: list[int],
+    doc_label: str = "Doc",
+    label_label: str = "Label",
+    edge: str = "HAS_LABEL",
+    limit: int = 50000,
+) -> list[int]:
+    """
+    asyncio counterpart of graph_doc_ids_for_label_ids.
+    """
+    if not label_ids:
+        return []
+
+    cy = _doc_ids_cypher(doc_label, label_label, edge, limit)
+    rows = await cypher_json_async(session, cy, params={"ids": [int(i) for i in label_ids]}, graph_name=graph_name)
+    return [int(x) for x in rows if x is not None]
+
+
 def graph_doc_ids_in_label_subtree(
     session: Session,
     *,
@@ -209,3 +262,34 @@ def graph_doc_ids_in_label_subtree(
         limit=limit,
     )
 
+
+async def graph_doc_ids_in_label_subtree_async(
+    session: "AsyncSession",
+    *,
+    graph_name: str,
+    root_label_id: int,
+    max_hops: int = 25,
+    include_self: bool = True,
+    doc_label: str = "Doc",
+    edge: str = "HAS_LABEL",
+    limit: int = 50000,
+) -> list[int]:
+    """
+    asyncio counterpart of graph_doc_ids_in_label_subtree.
+    """
+    label_ids = await graph_descendant_label_ids_async(
+        session,
+        graph_name=graph_name,
+        root_label_id=root_label_id,
+        max_hops=max_hops,
+        include_self=include_self,
+        limit=min(int(limit), 5000),
+    )
+    return await graph_doc_ids_for_label_ids_async(
+        session,
+        graph_name=graph_name,
+        label_ids=label_ids,
+        doc_label=doc_label,
+        edge=edge,
+        limit=limit,
+    )
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional, Sequence, Type
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .eval import EvalCase, evaluate
+from .mixins_vector import (
+    ANN_SETTINGS,
+    _SCOPE_KEY,
+    _remember_local_settings,
+    _session_info,
+    set_local_sql,
+)
+
+DEFAULT_EF_SEARCH_CANDIDATES = (10, 20, 40, 64, 100, 200, 400, 800)
+
+
+@contextmanager
+def ann_tuning(
+    session: Session,
+    *,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    iterative_scan: Optional[str] = None,
+    max_scan_tuples: Optional[int] = None,
+) -> Iterator[None]:
+    """
+    Apply pgvector ANN settings for the statements inside the block, transaction-locally
+    (set_config(..., true), i.e. SET LOCAL), and put the previous values back when the block
+    exits normally. The vector search methods called inside use these settings instead of
+    the model's ann_ef_search / ann_probes.
+
+    If the block raises, nothing is restored: the error propagates as is (in a failed
+    transaction another statement would only replace it with InFailedSqlTransaction), and
+    the local settings end with the transaction anyway.
+
+    Unlike migrations.set_session_tuning, nothing outlives the transaction, so pooled
+    connections never inherit the settings.
+    """
+    wanted = {
+        ANN_SETTINGS[name]: str(value)
+        for name, value in (
+            ("ef_search", ef_search),
+            ("probes", probes),
+            ("iterative_scan", iterative_scan),
+            ("max_scan_tuples", max_scan_tuples),
+        )
+        if value is not None
+    }
+    if not wanted:
+        yield
+        return
+
+    names = list(wanted)
+    # current_setting(name, true) returns NULL for unknown GUCs (e.g. older pgvector).
+    old = session.execute(
+        text("SELECT " + ", ".join(f"current_setting(:n{i}, true)" for i in range(len(names)))),
+        {f"n{i}": n for i, n in enumerate(names)},
+    ).one()
+    session.execute(*set_local_sql(wanted))
+    _remember_local_settings(session, wanted)
+    info = _session_info(session)
+    scopes = info.setdefault(_SCOPE_KEY, []) if info is not None else []
+    scopes.append(wanted)
+    try:
+        yield
+    finally:
+        scopes.pop()
+    previous = {n: v for n, v in zip(names, old) if v is not None}
+    if previous:
+        session.execute(*set_local_sql(previous))
+        _remember_local_settings(session, previous)
+
+
+@dataclass
+class EfSearchTrial:
+    """
+    One ef_search value tried by autotune_ef_search: mean recall@k against exact search and
+    per-query latency.
+    """
+
+    ef_search: int
+    k: int
+    recall_at_k: float
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+
+
+@dataclass
+class EfSearchTuning:
+    """
+    Result of autotune_ef_search. `reports` holds the trial (recall@k, latency) for every
+    ef_search value tried.
+    """
+
+    ef_search: int
+    recall: float
+    target_recall: float
+    k: int
+    reports: dict[int, EfSearchTrial] = field(default_factory=dict)
+
+    @property
+    def met_target(self) -> bool:
+        return self.recall >= self.target_recall
+
+
+@contextmanager
+def _without_local_index(model: Type[Any]) -> Iterator[None]:
+    """
+    Detach the model's local_vector_index for the block, so searches reach Postgres.
+    """
+    if getattr(model, "local_vector_index", None) is None:
+        yield
+        return
+    own = "local_vector_index" in vars(model)
+    saved = vars(model).get("local_vector_index")
+    model.local_vector_index = None
+    try:
+        yield
+    finally:
+        if own:
+            model.local_vector_index = saved
+        else:
+            del model.local_vector_index
+
+
+def autotune_ef_search(
+    session: Session,
+    model: Type[Any],
+    queries: Sequence[Sequence[float]],
+    *,
+    k: int = 10,
+    target_recall: float = 0.95,
+    candidates: Sequence[int] = DEFAULT_EF_SEARCH_CANDIDATES,
+    distance: str = "cosine",
+    where: Any = None,
+    persist: bool = True,
+    path: Optional[str] = None,
+) -> EfSearchTuning:
+    """
+    Pick the smallest hnsw.ef_search whose recall@k against exact search reaches
+    `target_recall` on a sample of query vectors.
+
+    Ground truth comes from vector_search_ids(exact=True); each candidate is scored with
+    age_search.eval.evaluate (benchmark=True, so latency is reported too). If no candidate
+    reaches the target, the best-recall one is chosen.
+
+    The model's local_vector_index is bypassed while tuning (it would answer every search
+    exactly). On a quantized model, candidates below the coarse pass's candidate count
+    (k * vector_oversample) are raised to it, since the search raises ef_search to that
+    value anyway; the trials report the ef_search that actually ran.
+
+    With persist=True the choice is stored on the model (`model.ann_ef_search`), which the
+    vector search methods apply per transaction; `path` additionally records it in a JSON
+    file (see load_ann_tuning).
+    """
+    floor = model._rerank_limit(k, None) or int(k)
+    reports: dict[int, EfSearchTrial] = {}
+    chosen: Optional[int] = None
+    with _without_local_index(model):
+        truth = [
+            {int(r[0]) for r in model.vector_search_ids(session, q, k=k, distance=distance, where=where, exact=True)}
+            for q in queries
+        ]
+        cases = [EvalCase(name=str(i), relevant_ids=t) for i, t in enumerate(truth)]
+
+        for ef in sorted({max(int(c), floor) for c in candidates}):
+
+            def _search(case: EvalCase, _ef: int = ef) -> list[int]:
+                q = queries[int(case.name)]
+                rows = model.vector_search_ids(session, q, k=k, distance=distance, where=where, ef_search=_ef)
+                return [int(r[0]) for r in rows]
+
+            # evaluate's *_at_10 fields are measured at its `k`, here the tuning k.
+            rep = evaluate(cases, search=_search, k=k, benchmark=True)
+            reports[ef] = EfSearchTrial(ef, int(k), rep.recall_at_10, rep.p50_ms, rep.p95_ms)
+            if reports[ef].recall_at_k >= target_recall:
+                chosen = ef
+                break
+
+    if chosen is None:
+        chosen = max(reports, key=lambda ef: (reports[ef].recall_at_k, -ef))
+
+    result = EfSearchTuning(
+        ef_search=chosen,
+        recall=reports[chosen].recall_at_k,
+        target_recall=target_recall,
+        k=k,
+        reports=reports,
+    )
+    if persist:
+        model.ann_ef_search = chosen
+        if path:
+            save_ann_tuning(path, model)
+    return result
+
+
+def _model_key(model: Type[Any]) -> str:
+    return getattr(model, "__tablename__", None) or model.__name__
+
+
+def save_ann_tuning(path: str, *models: Type[Any]) -> None:
+    """
+    Merge the models' ann_ef_search / ann_probes into a JSON file keyed by table name.
+    """
+    data: dict[str, Any] = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            data = json.load(f)
+    for m in models:
+        data[_model_key(m)] = {"ef_search": m.ann_ef_search, "probes": m.ann_probes}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_ann_tuning(path: str, *models: Type[Any]) -> None:
+    """
+    Apply settings saved by save_ann_tuning / autotune_ef_search(path=...) to the models.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    for m in models:
+        saved = data.get(_model_key(m))
+        if saved:
+            m.ann_ef_search = saved.get("ef_search")
+            m.ann_probes = saved.get("probes")
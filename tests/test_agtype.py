@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import math
+
+from age_search.agtype import decode_agtype
+from age_search.cypher import cypher_rows
+
+
+def test_decode_agtype_scalars():
+    assert decode_agtype("42") == 42 and decode_agtype("-7") == -7
+    assert decode_agtype('"doc"') == "doc"
+    assert decode_agtype('"a \\"q\\""') == 'a "q"'
+    assert decode_agtype("true") is True and decode_agtype("null") is None
+    assert decode_agtype("1.5") == 1.5
+    assert decode_agtype("2.50::numeric") == 2.5
+    assert math.isnan(decode_agtype("NaN"))
+    assert decode_agtype(None) is None and decode_agtype(3) == 3
+
+
+def test_decode_agtype_vertex_edge_path():
+    v = '{"id": 844424930131969, "label": "Doc", "properties": {"id": 1, "title": "a::b"}}::vertex'
+    assert decode_agtype(v) == {
+        "id": 844424930131969,
+        "label": "Doc",
+        "properties": {"id": 1, "title": "a::b"},
+    }
+
+    e = '{"id": 1125899906842625, "label": "REL", "end_id": 2, "start_id": 1, "properties": {}}::edge'
+    p = f"[{v}, {e}, {v}]::path"
+    out = decode_agtype(p)
+    assert [x["label"] for x in out] == ["Doc", "REL", "Doc"]
+    assert decode_agtype("[1, 2]") == [1, 2]
+
+
+def test_cypher_rows_builds_column_spec_and_decodes():
+    class _Result:
+        def all(self):  # noqa: ANN201
+            return [("1", '"x"'), ("2", "null")]
+
+    class _Session:
+        def get_bind(self):  # noqa: ANN201
+            return None
+
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            self.sql = str(stmt)
+            return _Result()
+
+    s = _Session()
+    rows = cypher_rows(s, "MATCH (d:Doc) RETURN d.id, d.title", columns=["id", "title"], graph_name="g")  # type: ignore[arg-type]
+
+    assert rows == [(1, "x"), (2, None)]
+    assert "AS (id agtype, title agtype)" in s.sql
+    assert "agtype_to_json" not in s.sql
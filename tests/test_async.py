@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Sequence
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from age_search.base import Base
+from age_search.cypher import cypher_json_async
+from age_search.hybrid import hybrid_search, hybrid_search_async
+from age_search.hybrid2 import hybrid_search_results, hybrid_search_results_async
+import age_search.taxonomy as taxonomy
+from age_search.hybrid_graph import (
+    hybrid_search_results_constrained_async,
+    hybrid_search_results_in_label_subtree_async,
+)
+
+
+class _AsyncSessionShim:
+    """Awaitable facade over a sync Session (enough of the AsyncSession surface for these tests)."""
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+        self.bind = session.get_bind()
+        self.statements = []
+
+    async def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+        self.statements.append(stmt)
+        return self.sync_session.execute(stmt, params)
+
+
+class DocAsync(Base):
+    __tablename__ = "docs_async"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    content: Mapped[str] = mapped_column(String, nullable=False)
+
+    @classmethod
+    def bm25_search(cls, _session, _query_text: str, *, k: int = 50, **_kw):  # noqa: ANN001
+        return [(2, 3.0), (1, 2.0)][:k]
+
+    @classmethod
+    async def bm25_search_async(cls, _session, _query_text: str, *, k: int = 50, allowed_ids=None, **_kw):  # noqa: ANN001
+        rows = [(2, 3.0, "two"), (1, 2.0, "one")]
+        return [r for r in rows if allowed_ids is None or r[0] in allowed_ids][:k]
+
+    @classmethod
+    def vector_search_ids(cls, _session, _query_vec: Sequence[float], *, k: int = 50, **_kw):  # noqa: ANN001
+        return [(3, 0.1), (1, 0.2)][:k]
+
+    @classmethod
+    async def vector_search_ids_async(cls, _session, _query_vec: Sequence[float], *, k: int = 50, **_kw):  # noqa: ANN001
+        return [(3, 0.1), (1, 0.2)][:k]
+
+
+def _seed(session: Session, engine) -> _AsyncSessionShim:  # noqa: ANN001
+    Base.metadata.create_all(engine)
+    session.add_all([DocAsync(id=i, content=str(i)) for i in (1, 2, 3)])
+    session.commit()
+    return _AsyncSessionShim(session)
+
+
+def test_async_hybrid_matches_sync(session, engine):
+    asession = _seed(session, engine)
+    kw = {"query_text": "q", "query_vec": [0.0, 1.0]}
+
+    objs = asyncio.run(hybrid_search_async(asession, DocAsync, **kw))  # type: ignore[arg-type]
+    assert [o.id for o in objs] == [o.id for o in hybrid_search(session, DocAsync, **kw)]
+
+    results = asyncio.run(hybrid_search_results_async(asession, DocAsync, parallel=True, **kw))  # type: ignore[arg-type]
+    sync_results = hybrid_search_results(session, DocAsync, **kw)
+    assert [r.id for r in results] == [r.id for r in sync_results] == [1, 2, 3]
+    assert [r.rrf_score for r in results] == [r.rrf_score for r in sync_results]
+    assert results[0].snippet == "one" and results[0].obj is not None
+
+
+def test_async_constrained_pushes_allowed_ids(session, engine):
+    asession = _seed(session, engine)
+    results = asyncio.run(
+        hybrid_search_results_constrained_async(
+            asession,  # type: ignore[arg-type]
+            DocAsync,
+            query_text="q",
+            query_vec=[0.0, 1.0],
+            allowed_ids=[1, 2],
+        )
+    )
+    assert [r.id for r in results] == [1, 2]
+
+
+def test_async_label_subtree_resolves_docs_then_searches_within_them(session, engine, monkeypatch):
+    asession = _seed(session, engine)
+    calls = []
+
+    async def fake_cypher_json_async(_s, cy, *, params=None, graph_name=None):  # noqa: ANN001
+        calls.append(params)
+        return [5] if "PARENT_OF" in cy else [1, 2]
+
+    monkeypatch.setattr(taxonomy, "cypher_json_async", fake_cypher_json_async)
+    results = asyncio.run(
+        hybrid_search_results_in_label_subtree_async(
+            asession,  # type: ignore[arg-type]
+            DocAsync,
+            graph_name="g",
+            root_label_id=4,
+            query_text="q",
+            query_vec=[0.0, 1.0],
+        )
+    )
+    assert calls == [{"root": 4}, {"ids": [5, 4]}]
+    assert [r.id for r in results] == [1, 2]
+
+
+def test_cypher_json_async_uses_same_sql(session):
+    asession = _AsyncSessionShim(session)
+
+    class _Rows:
+        def all(self):  # noqa: ANN201
+            return [({"id": 1},), ({"id": 2},)]
+
+    async def _execute(stmt, params=None):  # noqa: ANN001, ANN202
+        asession.statements.append((stmt, params))
+        return _Rows()
+
+    asession.execute = _execute  # type: ignore[method-assign]
+    out = asyncio.run(cypher_json_async(asession, "MATCH (n) RETURN n", params={"x": 1}, graph_name="g"))  # type: ignore[arg-type]
+
+    assert out == [{"id": 1}, {"id": 2}]
+    stmt, params = asession.statements[0]
+    assert "'g'::name" in str(stmt) and params == {"params": '{"x": 1}'}
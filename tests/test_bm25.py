@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from sqlalchemy import Integer, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.mixins_bm25 import BM25SearchMixin
+from age_search.mixins_vector import VectorMixin
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocBM25(_Base, VectorMixin, BM25SearchMixin):
+    __tablename__ = "docs_bm25"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+def _sql(stmt) -> str:  # noqa: ANN001
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_bm25_search_objects_is_one_statement_with_scores():
+    seen = []
+
+    class _Session:
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            seen.append(stmt)
+            return self
+
+        def all(self):  # noqa: ANN201
+            return [(DocBM25(id=2, content="b"), 3.5), (DocBM25(id=1, content="a"), 1.25)]
+
+    docs = DocBM25.bm25_search_objects(_Session(), "graph", k=5)  # type: ignore[arg-type]
+
+    assert [(d.id, d.bm25_score) for d in docs] == [(2, 3.5), (1, 1.25)]
+    assert len(seen) == 1
+    sql = _sql(seen[0])
+    assert "paradedb.score(docs_bm25.id) AS bm25_score" in sql
+    assert "WHERE docs_bm25.content @@@ %(content_1)s" in sql
+    assert "ORDER BY paradedb.score(docs_bm25.id) DESC" in sql
+    # the embedding column is deferred by default
+    assert "docs_bm25.embedding" not in sql
+    assert "docs_bm25.embedding" in _sql(DocBM25._bm25_objects_stmt("graph", k=5, defer=()))
+
+
+def test_bm25_filters_are_compiled_into_the_paradedb_query():
+    from sqlalchemy import func
+
+    stmt = DocBM25._bm25_stmt(
+        "graph",
+        k=5,
+        allowed_ids=[3, 1],
+        filter=func.paradedb.term("tenant_id", 7),
+        where=DocBM25.id > 0,
+    )
+    sql = _sql(stmt)
+    assert "WHERE (docs_bm25.id @@@ paradedb.boolean(must => ARRAY[paradedb.parse_with_field('content', " in sql
+    # filters restrict the match set without contributing to the BM25 score
+    assert "paradedb.const_score(0, paradedb.term(%(term_1)s::VARCHAR, %(term_2)s::INTEGER))" in sql
+    assert "paradedb.const_score(0, paradedb.term_set((SELECT array_agg(paradedb.term('id', allowed.x))" in sql
+    assert "FROM unnest(%(allowed_ids)s::BIGINT[]) AS allowed(x)" in sql
+    assert "AND docs_bm25.id > " in sql
+    assert stmt.compile().params["allowed_ids"] == [3, 1]
+
+    # nothing to push down: the plain field @@@ query
+    assert "WHERE docs_bm25.content @@@ " in _sql(DocBM25._bm25_stmt("graph", k=5))
+    # an empty allowed set matches nothing
+    assert "WHERE false" in _sql(DocBM25._bm25_stmt("graph", k=5, allowed_ids=[]))
+
+
+def test_bm25_search_objects_accepts_filters():
+    sql = _sql(DocBM25._bm25_objects_stmt("graph", k=5, allowed_ids=[2]))
+    assert "docs_bm25.id @@@ paradedb.boolean(" in sql
+
+
+def test_constrained_hybrid_search_takes_bm25_top_k_inside_the_allowed_set():
+    from age_search.hybrid_graph import hybrid_search_results_constrained
+
+    seen = []
+
+    class _Session:
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            seen.append(stmt)
+            return self
+
+        def all(self):  # noqa: ANN201
+            return []
+
+    hybrid_search_results_constrained(
+        _Session(),  # type: ignore[arg-type]
+        DocBM25,
+        query_text="graph",
+        query_vec=[0.0, 1.0],
+        allowed_ids=[3, 1],
+        k_lex=5,
+        fetch_objects=False,
+    )
+
+    bm25 = [st for st in seen if "paradedb.score" in _sql(st)]
+    assert len(bm25) == 1
+    sql = _sql(bm25[0])
+    # the allowed set is inside the @@@ query that the LIMIT applies to, not a post-filter
+    assert "docs_bm25.id @@@ paradedb.boolean(must => ARRAY[" in sql
+    assert "paradedb.const_score(0, paradedb.term_set(" in sql
+    assert "docs_bm25.content @@@" not in sql
+    assert bm25[0].compile().params["allowed_ids"] == [1, 3]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import age_search.bulk as bulk
+from age_search.bulk import bulk_load_graph, make_graphid, read_edge_file, read_vertex_file
+
+
+class _FakeGraphSession:
+    def get_bind(self):  # noqa: ANN201
+        return None
+
+
+def test_bulk_load_graph_allocates_ids_and_resolves_edges(monkeypatch):
+    copies: list[tuple[str, list]] = []
+    seqs: dict[str, int] = {}
+    label_ids = {"Doc": 3, "Tag": 4, "RELATED_TO": 5, "HAS_TAG": 6}
+
+    def fake_ensure(_s, graph, name, *, kind, report):  # noqa: ANN001, ANN202
+        return bulk._LabelInfo(label_id=label_ids[name], seq=f"{graph}.{name}_seq", relation=f'{graph}."{name}"')
+
+    def fake_allocate(_s, info, n):  # noqa: ANN001, ANN202
+        start = seqs.get(info.seq, 0)
+        seqs[info.seq] = start + n
+        return [make_graphid(info.label_id, i) for i in range(start + 1, start + n + 1)]
+
+    monkeypatch.setattr(bulk, "_ensure_label", fake_ensure)
+    monkeypatch.setattr(bulk, "_allocate_graphids", fake_allocate)
+    monkeypatch.setattr(bulk, "_copy_rows", lambda _s, sql, rows: copies.append((sql, list(rows))))
+
+    report = bulk_load_graph(
+        _FakeGraphSession(),  # type: ignore[arg-type]
+        [("Doc", 1, {"title": "a"}), ("Doc", 2, None), ("Tag", 10, None)],
+        [("RELATED_TO", 1, 2, {"weight": 0.5}), ("HAS_TAG", ("Doc", 1), ("Tag", 10), None), ("RELATED_TO", 1, 99, None)],
+        graph_name="g",
+        batch_size=2,
+    )
+
+    assert (report.vertices, report.edges, report.skipped_edges) == (3, 2, 1)
+    assert copies[0][0] == 'COPY g."Doc" (id, properties) FROM STDIN'
+    assert copies[0][1][0] == (make_graphid(3, 1), json.dumps({"title": "a", "id": 1}))
+    doc1, doc2 = make_graphid(3, 1), make_graphid(3, 2)
+    related = next(rows for sql, rows in copies if "RELATED_TO" in sql)
+    assert related == [(make_graphid(5, 1), doc1, doc2, '{"weight": 0.5}')]
+    assert make_graphid(3, 1) == (3 << 48) | 1
+
+
+def test_bulk_load_graph_rejects_duplicate_vertices_and_ambiguous_ids(monkeypatch):
+    monkeypatch.setattr(
+        bulk, "_ensure_label", lambda _s, g, name, *, kind, report: bulk._LabelInfo(len(name), f"{name}_seq", name)
+    )
+    monkeypatch.setattr(bulk, "_allocate_graphids", lambda _s, info, n: [make_graphid(info.label_id, i) for i in range(n)])
+    monkeypatch.setattr(bulk, "_copy_rows", lambda _s, sql, rows: list(rows))
+
+    with pytest.raises(ValueError, match=r"\('Doc', 1\) is listed more than once"):
+        bulk_load_graph(_FakeGraphSession(), [("Doc", 1, None), ("Doc", 1, None)], graph_name="g")  # type: ignore[arg-type]
+
+    # the same id under two labels is allowed, but a bare id can't pick one of them
+    same_id = [("Doc", 1, None), ("Tag", 1, None)]
+    with pytest.raises(ValueError, match="used under several labels"):
+        bulk_load_graph(_FakeGraphSession(), same_id, [("HAS_TAG", 1, ("Tag", 1), None)], graph_name="g")  # type: ignore[arg-type]
+    report = bulk_load_graph(
+        _FakeGraphSession(), same_id, [("HAS_TAG", ("Doc", 1), ("Tag", 1), None)], graph_name="g"  # type: ignore[arg-type]
+    )
+    assert (report.vertices, report.edges) == (2, 1)
+
+
+def test_read_graph_files(tmp_path):
+    vj = tmp_path / "v.jsonl"
+    vj.write_text('{"label": "Doc", "id": 1, "props": {"t": "a"}}\n\n')
+    vc = tmp_path / "v.csv"
+    vc.write_text("label,id,title\nDoc,2,b\n")
+    ec = tmp_path / "e.csv"
+    ec.write_text("label,src,dst,dst_label,w\nHAS_TAG,1,10,Tag,1\n")
+
+    assert list(read_vertex_file(str(vj))) == [("Doc", 1, {"t": "a"})]
+    assert list(read_vertex_file(str(vc))) == [("Doc", 2, {"title": "b"})]
+    assert list(read_edge_file(str(ec))) == [("HAS_TAG", 1, ("Tag", 10), {"w": "1"})]
@@ -18,12 +18,13 @@ def test_graph_edge_list_ids_parses_rows(monkeypatch):
     with Session(engine) as session:
         called = {}
 
-        def fake_cypher_json(s, cy, *, graph_name, params=None, returns_alias="row"):  # noqa: ANN001
+        def fake_iter_cypher_rows(s, cy, *, columns, graph_name, batch_size=1000, **_kw):  # noqa: ANN001
             called["cy"] = cy
             called["graph_name"] = graph_name
-            return [[1, "2"], None, ["x"], [3, 4]]
+            called["columns"] = columns
+            yield from [(1, "2"), (None, 5), ("x", None), (3, 4)]
 
-        monkeypatch.setattr(comm, "cypher_json", fake_cypher_json)
+        monkeypatch.setattr(comm, "iter_cypher_rows", fake_iter_cypher_rows)
         edges = comm.graph_edge_list_ids(
             session,
             graph_name="g",
@@ -37,4 +38,5 @@ def test_graph_edge_list_ids_parses_rows(monkeypatch):
         assert called["graph_name"] == "g"
         assert "RELATED_TO" in called["cy"]
         assert "LIMIT 123" in called["cy"]
+        assert "RETURN a.id, b.id" in called["cy"] and called["columns"] == ("a", "b")
 
@@ -4,7 +4,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
 from age_search.config import AGEGraphConfig
-from age_search.cypher import _cfg
+from age_search.cypher import (
+    _cfg,
+    _cypher_sql,
+    configure_cypher_sql_cache,
+    cypher_sql_cache_info,
+)
+from age_search.engine import _connect_args
 
 
 def test_cfg_pulls_from_engine_info_and_allows_override_graph_name():
@@ -19,3 +25,23 @@ def test_cfg_pulls_from_engine_info_and_allows_override_graph_name():
         assert cfg2.graph_name == "g2"
         assert cfg2.search_path == "ag_catalog, public"
 
+
+def test_cypher_sql_is_cached_per_graph_query_and_alias():
+    configure_cypher_sql_cache(maxsize=2)
+    try:
+        g1, g2 = AGEGraphConfig(graph_name="g1"), AGEGraphConfig(graph_name="g2")
+        a = _cypher_sql(g1, "MATCH (n) RETURN n")
+        assert _cypher_sql(g1, "MATCH (n) RETURN n") is a
+        assert _cypher_sql(g2, "MATCH (n) RETURN n") is not a
+        assert _cypher_sql(g1, "MATCH (n) RETURN n", returns_alias="v") is not a
+
+        info = cypher_sql_cache_info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (1, 3, 2, 2)
+    finally:
+        configure_cypher_sql_cache()
+
+
+def test_prepare_threshold_goes_to_connect_args_without_overriding():
+    assert _connect_args(None, None) == {}
+    assert _connect_args(None, 0) == {"prepare_threshold": 0}
+    assert _connect_args({"prepare_threshold": 3}, 0) == {"prepare_threshold": 3}
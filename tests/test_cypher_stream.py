@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from age_search.cypher import iter_cypher_json
+from age_search.query import CypherQuery
+
+
+class _StreamResult:
+    def __init__(self, rows, size):  # noqa: ANN001
+        self.rows, self.size, self.closed = rows, size, False
+
+    def partitions(self):  # noqa: ANN201
+        for i in range(0, len(self.rows), self.size):
+            yield self.rows[i : i + self.size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _StreamSession:
+    def __init__(self, n: int):
+        self.n = n
+        self.calls = []
+        self.result = None
+
+    def get_bind(self):  # noqa: ANN201
+        return None
+
+    def execute(self, stmt, params=None, *, execution_options=None):  # noqa: ANN001, ANN201
+        self.calls.append((str(stmt), params, execution_options))
+        self.result = _StreamResult([(i,) for i in range(self.n)], execution_options["yield_per"])
+        return self.result
+
+
+def test_iter_cypher_json_streams_in_batches():
+    s = _StreamSession(5)
+    out = iter_cypher_json(s, "MATCH (n) RETURN n.id", graph_name="g", batch_size=2)  # type: ignore[arg-type]
+    assert s.calls == []  # lazy until iterated
+
+    assert list(out) == [0, 1, 2, 3, 4]
+    _sql, params, opts = s.calls[0]
+    assert opts == {"stream_results": True, "yield_per": 2}
+    assert params == {"params": "{}"}
+    assert s.result.closed
+
+
+def test_cypher_query_stream():
+    s = _StreamSession(3)
+    q = CypherQuery(s, "MATCH (d:Doc)", "d.id", graph_name="g").where("d.id > $x", x=0)  # type: ignore[arg-type]
+    assert list(q.stream(batch_size=10)) == [0, 1, 2]
+    sql, params, _opts = s.calls[0]
+    assert "WHERE (d.id > $x)" in sql and params == {"params": '{"x": 0}'}
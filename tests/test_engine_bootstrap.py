@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import age_search.engine as engine_mod
+from age_search.config import AGEGraphConfig
+from age_search.engine import (
+    AGEBootstrapStats,
+    _bootstrap_connection,
+    _install_age_listeners,
+    reset_age_bootstrap,
+)
+
+
+class _FakeCursor:
+    def __init__(self, log: list[str]):
+        self.log = log
+
+    def execute(self, sql: str) -> None:
+        self.log.append(sql)
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeDBAPIConn:
+    def __init__(self):
+        self.log: list[str] = []
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self.log)
+
+    def commit(self) -> None:
+        self.log.append("COMMIT")
+
+
+def test_bootstrap_runs_once_per_connection_and_on_search_path_change():
+    conn, info, stats = _FakeDBAPIConn(), {}, AGEBootstrapStats()
+    cfg = AGEGraphConfig()
+
+    assert _bootstrap_connection(conn, info, cfg, stats) is True
+    assert _bootstrap_connection(conn, info, cfg, stats) is False
+    assert conn.log == ["LOAD 'age';", "SET search_path = ag_catalog, public;", "COMMIT"]
+
+    _bootstrap_connection(conn, info, AGEGraphConfig(search_path="ag_catalog, app, public"), stats)
+    assert conn.log[-2] == "SET search_path = ag_catalog, app, public;"
+    assert stats.snapshot() == {"checkouts": 3, "bootstraps": 2, "invalidations": 0}
+
+
+def test_listeners_track_bootstrap_on_pool_record(monkeypatch):
+    real = engine_mod._bootstrap_connection
+    fake = _FakeDBAPIConn()
+    # sqlite can't LOAD 'age'; route the bootstrap SQL to a fake connection.
+    monkeypatch.setattr(
+        engine_mod,
+        "_bootstrap_connection",
+        lambda _c, info, cfg, stats, force=False: real(fake, info, cfg, stats, force=force),
+    )
+
+    eng = create_engine("sqlite+pysqlite:///:memory:")
+    stats = _install_age_listeners(eng, AGEGraphConfig())
+
+    for _ in range(3):
+        with eng.connect() as c:
+            c.execute(text("SELECT 1"))
+    assert stats.checkouts == 3 and stats.bootstraps == 1
+
+    with Session(eng) as s:
+        s.execute(text("SELECT 1"))
+        reset_age_bootstrap(s)
+    with eng.connect() as c:
+        c.invalidate()
+    with eng.connect() as c:
+        c.execute(text("SELECT 1"))
+
+    # explicit reset -> re-init on next checkout; invalidation -> fresh connection re-inits
+    assert stats.snapshot() == {"checkouts": 6, "bootstraps": 3, "invalidations": 1}
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.mixins_graph as mg
+from age_search.base import Base
+from age_search.mixins_graph import GraphNodeMixin
+
+
+class DocG(Base, GraphNodeMixin):
+    __tablename__ = "docs_graph_batch"
+    graph_label = "Doc"
+    graph_property_fields = ("title",)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+
+def _capture(monkeypatch):  # noqa: ANN001, ANN202
+    calls = []
+
+    def fake_cypher_rows(_s, cy, *, columns, params=None, graph_name=None):  # noqa: ANN001
+        calls.append((cy, params, graph_name))
+        n = len(params.get("rows") or params.get("ids"))
+        return [(n,)]
+
+    monkeypatch.setattr(mg, "cypher_rows", fake_cypher_rows)
+    return calls
+
+
+def test_graph_upsert_many_batches_unwind(monkeypatch):
+    calls = _capture(monkeypatch)
+    docs = [DocG(id=i, title=f"t{i}") for i in range(5)]
+
+    assert DocG.graph_upsert_many(None, docs, batch_size=2, graph_name="g") == 5  # type: ignore[arg-type]
+
+    assert len(calls) == 3
+    cy, params, graph_name = calls[0]
+    assert "UNWIND $rows AS r" in cy and "MERGE (n:Doc {id: r.id})" in cy
+    assert params == {"rows": [{"id": 0, "props": {"title": "t0", "id": 0}}, {"id": 1, "props": {"title": "t1", "id": 1}}]}
+    assert graph_name == "g"
+
+
+def test_graph_delete_many_accepts_objects_and_ids(monkeypatch):
+    calls = _capture(monkeypatch)
+
+    assert DocG.graph_delete_many(None, [DocG(id=1, title="a"), 2, 3], batch_size=10) == 3  # type: ignore[arg-type]
+    cy, params, _ = calls[0]
+    assert params == {"ids": [1, 2, 3]}
+    assert "DETACH DELETE n" in cy
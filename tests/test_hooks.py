@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from sqlalchemy import String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.hooks as hooks
+from age_search.base import Base
+from age_search.hooks import install_graph_sync
+from age_search.mixins_graph import GraphNodeMixin
+
+
+class DocSync(Base, GraphNodeMixin):
+    __tablename__ = "docs_sync"
+    graph_label = "Doc"
+    graph_property_fields = ("title",)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+
+install_graph_sync(DocSync)
+
+
+def test_flush_queues_and_batches_graph_changes(session, engine, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        hooks, "graph_upsert_rows", lambda _s, label, rows, **kw: calls.append(("upsert", label, rows))
+    )
+    monkeypatch.setattr(
+        hooks, "graph_delete_ids", lambda _s, label, ids, **kw: calls.append(("delete", label, ids))
+    )
+    Base.metadata.create_all(engine)
+
+    a, b, c = DocSync(id=1, title="a"), DocSync(id=2, title="b"), DocSync(id=3, title="c")
+    session.add_all([a, b, c])
+    session.flush()
+    assert calls == [
+        (
+            "upsert",
+            "Doc",
+            [{"id": i, "props": {"title": t, "id": i}} for i, t in ((1, "a"), (2, "b"), (3, "c"))],
+        )
+    ]
+
+    calls.clear()
+    a.title = "a2"
+    session.delete(b)
+    session.commit()
+    assert calls == [("delete", "Doc", [2]), ("upsert", "Doc", [{"id": 1, "props": {"title": "a2", "id": 1}}])]
+    assert hooks._QUEUE_KEY not in session.info
+
+
+def test_rollback_drops_queued_changes(session):
+    session.execute(text("SELECT 1"))
+    d = DocSync(id=9, title="x")
+    hooks._enqueue(session, d, "upsert", hooks.GraphSyncOptions())
+    hooks._enqueue(session, d, "delete", hooks.GraphSyncOptions())
+    assert [op for op, _p, _o in session.info[hooks._QUEUE_KEY].values()] == ["delete"]
+
+    session.rollback()
+    assert hooks._QUEUE_KEY not in session.info
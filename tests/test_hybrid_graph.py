@@ -55,3 +55,49 @@ def test_hybrid_search_results_constrained_filters_to_allowed_ids(session, engin
     assert {r.id for r in results} <= {1, 2}
     assert all(r.obj is not None for r in results)
 
+
+def test_hybrid_search_results_constrained_pushes_allowed_ids_into_legs(session, engine):
+    calls: dict[str, dict] = {}
+
+    class DocPushdown(Base):
+        __tablename__ = "docs_pushdown"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        content: Mapped[str] = mapped_column(String, nullable=False)
+
+        @classmethod
+        def bm25_search(cls, _session, _query_text: str, *, k: int = 50, **kw):  # noqa: ANN001
+            calls["bm25"] = kw
+            return [(2, 1.0)]
+
+        @classmethod
+        def vector_search_ids(cls, _session, _query_vec: Sequence[float], *, k: int = 50, **kw):  # noqa: ANN001
+            calls["vec"] = kw
+            return [(1, 0.1)]
+
+    Base.metadata.create_all(engine)
+    session.add_all([DocPushdown(id=1, content="a"), DocPushdown(id=2, content="b")])
+    session.commit()
+
+    results = hybrid_search_results_constrained(
+        session,
+        DocPushdown,
+        query_text="ignored",
+        query_vec=[0.0, 1.0],
+        allowed_ids=[2, 1, 2],
+    )
+    assert [r.id for r in results] == [2, 1]
+    assert calls["bm25"]["allowed_ids"] == [1, 2]
+    assert calls["vec"]["where"] is not None
+    assert calls["vec"]["exact"] is True
+
+    hybrid_search_results_constrained(
+        session,
+        DocPushdown,
+        query_text="ignored",
+        query_vec=[0.0, 1.0],
+        allowed_ids=[1, 2],
+        exact_max_ids=1,
+    )
+    assert "exact" not in calls["vec"]
+    assert calls["vec"]["iterative_scan"] == "relaxed_order"
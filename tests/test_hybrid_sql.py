@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from sqlalchemy import Integer, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.hybrid2 import hybrid_search_results
+from age_search.hybrid_sql import hybrid_select
+from age_search.mixins_bm25 import BM25SearchMixin
+from age_search.mixins_vector import VectorMixin
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocSQL(_Base, VectorMixin, BM25SearchMixin):
+    __tablename__ = "docs_sql"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class DocSQLHalf(_Base, VectorMixin, BM25SearchMixin):
+    __tablename__ = "docs_sql_half"
+    vector_quantization = "halfvec"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+def _sql(stmt) -> str:  # noqa: ANN001
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_hybrid_select_is_one_cte_statement():
+    sql = _sql(hybrid_select(DocSQL, query_text="shoes", query_vec=[0.0, 1.0], k_lex=7, k_vec=9))
+
+    assert sql.lstrip().startswith("WITH lex AS")
+    assert "vec AS" in sql and "fused AS" in sql
+    assert "row_number() OVER (ORDER BY paradedb.score(docs_sql.id) DESC)" in sql
+    assert "row_number() OVER (ORDER BY docs_sql.embedding <=>" in sql
+    assert "FULL OUTER JOIN vec ON lex.id = vec.id" in sql
+    assert "FROM docs_sql JOIN fused ON docs_sql.id = fused.id" in sql
+
+
+def test_hybrid_select_without_objects_skips_table_join():
+    sql = _sql(
+        hybrid_select(DocSQL, query_text="shoes", query_vec=[0.0, 1.0], fetch_objects=False)
+    )
+    assert "JOIN fused" not in sql
+    assert sql.rstrip().endswith("fused.semantic_rank ASC")
+
+
+class _FakeRow(tuple):
+    @property
+    def _mapping(self):  # noqa: ANN202
+        return dict(zip(["DocSQL", *_COLS], self))
+
+
+_COLS = [
+    "id",
+    "rrf_score",
+    "lexical_rank",
+    "semantic_rank",
+    "bm25_score",
+    "fts_rank",
+    "snippet",
+    "vector_distance",
+]
+
+
+class _FakeResult:
+    def __init__(self, rows):  # noqa: ANN001
+        self._rows = rows
+
+    def all(self):  # noqa: ANN201
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self, rows):  # noqa: ANN001
+        self.rows = rows
+        self.calls = 0
+
+    def execute(self, stmt):  # noqa: ANN001, ANN201
+        self.calls += 1
+        return _FakeResult(self.rows)
+
+
+def test_hybrid_search_results_single_statement_maps_rows():
+    d1, d2 = DocSQL(id=1, content="a"), DocSQL(id=2, content="b")
+    session = _FakeSession(
+        [
+            _FakeRow((d1, 1, 2 / 61, 1, 1, 3.5, None, "snip", 0.25)),
+            _FakeRow((d2, 2, 1 / 62, 2, None, 1.5, None, None, None)),
+        ]
+    )
+
+    results = hybrid_search_results(
+        session,  # type: ignore[arg-type]
+        DocSQL,
+        query_text="shoes",
+        query_vec=[0.0, 1.0],
+        single_statement=True,
+    )
+
+    assert session.calls == 1
+    assert [r.id for r in results] == [1, 2]
+    assert results[0].obj is d1
+    assert results[0].bm25_score == 3.5
+    assert results[0].snippet == "snip"
+    assert results[0].vector_distance == 0.25
+    assert results[0].semantic_rank == 1
+    assert results[1].semantic_rank is None
+    assert results[1].lexical_rank == 2
+
+
+def test_quantized_vector_leg_reranks_coarse_candidates_with_ann_settings():
+    class _Capture(_FakeSession):
+        def __init__(self):
+            super().__init__([])
+            self.stmts = []
+
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            self.stmts.append((stmt, params))
+            return super().execute(stmt)
+
+    s = _Capture()
+    hybrid_search_results(
+        s,  # type: ignore[arg-type]
+        DocSQLHalf,
+        query_text="shoes",
+        query_vec=[0.0, 1.0],
+        k_vec=10,
+        single_statement=True,
+    )
+
+    # ef_search covers the oversampled coarse LIMIT (10 * 4)
+    (settings, params), (stmt, _) = s.stmts
+    assert "hnsw.ef_search" in str(settings) and params == {"ef_search": "40"}
+    sql = _sql(stmt)
+    assert "docs_sql_half.id IN (SELECT docs_sql_half.id" in sql
+    assert "CAST(docs_sql_half.embedding AS HALFVEC(1536)) <=>" in sql
+    assert "row_number() OVER (ORDER BY docs_sql_half.embedding <=>" in sql
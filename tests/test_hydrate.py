@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from sqlalchemy import String, Text, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.query as query_mod
+from age_search.base import Base
+from age_search.hydrate import hydrate
+from age_search.mixins_graph import GraphNodeMixin
+from age_search.relationships import GraphRelationship
+
+
+class DocHyd(Base, GraphNodeMixin):
+    __tablename__ = "docs_hydrate"
+    graph_label = "Doc"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+
+    related = GraphRelationship("RELATED_TO", target_label="Doc", source_label="Doc")
+
+
+def _seed(session, engine):  # noqa: ANN001, ANN202
+    Base.metadata.create_all(engine)
+    session.add_all([DocHyd(id=i, title=f"t{i}", body="x" * 100) for i in range(1, 5)])
+    session.commit()
+    session.expunge_all()
+
+    selects = []
+    event.listen(engine, "before_cursor_execute", lambda *a: selects.append(a[2]))
+    return selects
+
+
+def test_hydrate_keeps_order_reuses_identities_and_defers(session, engine):
+    selects = _seed(session, engine)
+    loaded = session.get(DocHyd, 3)
+    selects.clear()
+
+    objs = hydrate(session, DocHyd, [3, 1, 99, 2], defer=("body",))
+
+    assert [o.id for o in objs] == [3, 1, 2]
+    assert objs[0] is loaded
+    assert len(selects) == 1 and "docs_hydrate.id IN" in selects[0]
+    assert "body" not in objs[1].__dict__
+
+
+def test_cypher_query_objects_returns_id_property_then_hydrates(session, engine, monkeypatch):
+    _seed(session, engine)
+    seen = {}
+
+    def fake_cypher_json(_s, cy, *, params=None, graph_name=None):  # noqa: ANN001
+        seen["cy"] = cy
+        return [4, 2]
+
+    monkeypatch.setattr(query_mod, "cypher_json", fake_cypher_json)
+
+    objs = DocHyd(id=1, title="t1", body="").related.objects(session, limit=2)
+
+    assert [o.id for o in objs] == [4, 2]
+    assert "RETURN m.id AS row" in seen["cy"] and "LIMIT 2" in seen["cy"]
+
+
+class DocUid(Base, GraphNodeMixin):
+    __tablename__ = "docs_hydrate_uid"
+    graph_label = "Doc"
+    graph_id_field = "uid"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    uid: Mapped[int] = mapped_column(unique=True)
+
+
+def test_hydrate_matches_graph_id_field_not_primary_key(session, engine):
+    Base.metadata.create_all(engine)
+    session.add_all([DocUid(id=i, uid=100 + i) for i in (1, 2, 3)])
+    session.commit()
+    session.expunge_all()
+    loaded = session.get(DocUid, 2)  # uid 102
+
+    # 2 is a primary key in the identity map but no vertex id: it must not match
+    objs = hydrate(session, DocUid, [102, 2, 101])
+
+    assert [o.uid for o in objs] == [102, 101]
+    assert objs[0] is loaded
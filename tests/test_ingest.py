@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import struct
+
+import pytest
+from sqlalchemy import REAL, BigInteger, Column, Double, Float, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+import age_search.ingest as ingest
+from age_search.ingest import bulk_ingest, encode_vector
+from age_search.mixins_fts import FTSSearchMixin
+from age_search.mixins_vector import VectorMixin
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocIngest(_Base, VectorMixin, FTSSearchMixin):
+    __tablename__ = "docs_ingest"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class _Session:
+    def __init__(self, indexes=()):  # noqa: ANN001
+        self.sql: list = []
+        self.indexes = list(indexes)
+
+    def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+        self.sql.append(stmt)
+        return self
+
+    def all(self):  # noqa: ANN201
+        return self.indexes
+
+
+@pytest.fixture()
+def copies(monkeypatch):
+    out: list = []
+    monkeypatch.setattr(ingest, "_copy_rows", lambda _s, sql, rows, *, types: out.append((sql, types, list(rows))))
+    return out
+
+
+def test_encode_vector_matches_pgvector_binary_format():
+    assert encode_vector([1.0, -2.5]) == struct.pack(">HHff", 2, 0, 1.0, -2.5)
+
+
+def test_plain_copy_in_batches(copies):
+    vec = [0.5] * 1536
+    rows = [{"id": i, "content": f"doc {i}", "embedding": vec if i != 2 else None} for i in range(1, 4)]
+
+    report = bulk_ingest(_Session(), DocIngest, rows, batch_size=2)  # type: ignore[arg-type]
+
+    assert (report.rows, report.batches) == (3, 2)
+    sql, types, batch = copies[0]
+    assert sql == "COPY docs_ingest (id, content, embedding) FROM STDIN (FORMAT BINARY)"
+    assert types == ["int8", "text", "bytea"]
+    assert batch[0][:2] == (1, "doc 1") and batch[0][2] == encode_vector(vec)
+    assert batch[1][2] is None
+
+
+def test_generated_columns_and_dimension_mismatch_are_rejected(copies):
+    with pytest.raises(ValueError, match="generated column"):
+        bulk_ingest(_Session(), DocIngest, [{"id": 1, "content_tsv": "x"}])  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="expected 1536 dimensions"):
+        bulk_ingest(_Session(), DocIngest, [{"id": 1, "embedding": [1.0]}])  # type: ignore[arg-type]
+
+
+def test_upsert_through_staging_and_deferred_indexes(copies):
+    s = _Session(indexes=[("public.ix_docs_ingest_fts", "CREATE INDEX ix_docs_ingest_fts ON public.docs_ingest USING gin (content_tsv)")])
+    report = bulk_ingest(
+        s,  # type: ignore[arg-type]
+        DocIngest,
+        {"id": [1, 2, 1], "content": ["a", "b", "c"]},
+        upsert=True,
+        defer_indexes=True,
+        maintenance_work_mem="2GB",
+    )
+
+    assert report.deferred_indexes == ["public.ix_docs_ingest_fts"]
+    assert copies[0][0] == "COPY pg_temp._ingest_docs_ingest (id, content) FROM STDIN (FORMAT BINARY)"
+    assert report.rows == 3
+    assert copies[0][2] == [(1, "c"), (2, "b")]  # duplicate key: last row wins
+
+    stmts = [str(x.compile(dialect=postgresql.dialect())) if not hasattr(x, "text") else x.text for x in s.sql]
+    assert stmts[1] == "DROP INDEX public.ix_docs_ingest_fts"
+    assert "CREATE TEMP TABLE pg_temp._ingest_docs_ingest ON COMMIT DROP AS SELECT id, content FROM docs_ingest WITH NO DATA" in stmts
+    upsert = next(x for x in stmts if x.startswith("INSERT"))
+    assert "INSERT INTO docs_ingest (id, content) SELECT pg_temp._ingest_docs_ingest.id, pg_temp._ingest_docs_ingest.content" in upsert
+    assert "FROM pg_temp._ingest_docs_ingest" in upsert
+    assert "DROP TABLE IF EXISTS pg_temp._ingest_docs_ingest" in stmts
+    assert "ON CONFLICT (id) DO UPDATE SET content = excluded.content" in upsert
+    assert stmts[-1].startswith("CREATE INDEX ix_docs_ingest_fts")
+    assert "maintenance_work_mem" in stmts[-2]
+
+
+def test_numpy_matrix_columns_are_encoded_from_float32(copies):
+    np = pytest.importorskip("numpy")
+    m = np.arange(2 * 1536, dtype=np.float32).reshape(2, 1536)
+
+    bulk_ingest(_Session(), DocIngest, {"id": np.array([7, 8]), "embedding": m})  # type: ignore[arg-type]
+
+    (_sql, _types, batch), = copies
+    assert batch[1][1] == encode_vector(m[1].tolist())
+
+
+@pytest.mark.parametrize(
+    ("type_", "expected"),
+    [
+        (REAL(), "float4"),
+        (postgresql.REAL(), "float4"),
+        (Float(precision=24), "float4"),
+        (Float(), "float8"),
+        (Double(), "float8"),
+        (postgresql.DOUBLE_PRECISION(), "float8"),
+    ],
+)
+def test_float_columns_map_to_their_postgres_width(type_, expected):
+    assert ingest._copy_type(Column("x", type_)) == expected
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.base import Base
+from age_search.hybrid2 import hybrid_search_results
+from age_search.mixins_fts import FTSSearchMixin
+from age_search.mixins_vector import VectorMixin
+
+
+class _PgBase(DeclarativeBase):
+    pass
+
+
+class DocIds(_PgBase, VectorMixin, FTSSearchMixin):
+    __tablename__ = "docs_ids"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class _CaptureSession:
+    def __init__(self):
+        self.stmts = []
+
+    def execute(self, stmt):  # noqa: ANN001, ANN201
+        self.stmts.append(stmt)
+        return self
+
+    def all(self):  # noqa: ANN201
+        return []
+
+
+def test_id_only_legs_do_not_select_heavy_columns():
+    s = _CaptureSession()
+    DocIds.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+    DocIds.fts_search_ids(s, "shoes", k=5)  # type: ignore[arg-type]
+
+    vec_stmt, fts_stmt = s.stmts
+    assert [c.key for c in vec_stmt.selected_columns] == ["id", "distance"]
+    assert [c.key for c in fts_stmt.selected_columns] == ["id", "rank"]
+
+    fts_sql = str(fts_stmt.compile(dialect=postgresql.dialect()))
+    assert "ts_rank_cd(docs_ids.content_tsv" in fts_sql
+    assert "ORDER BY ts_rank_cd" in fts_sql
+
+
+def test_hybrid_search_results_fills_distance_and_fts_rank(session, engine):
+    class DocLegs(Base):
+        __tablename__ = "docs_legs"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        content: Mapped[str] = mapped_column(String, nullable=False)
+
+        @classmethod
+        def fts_search(cls, *_a, **_kw):  # noqa: ANN002, ANN003, ANN206
+            raise AssertionError("hybrid should use fts_search_ids")
+
+        @classmethod
+        def fts_search_ids(cls, _session, _query_text: str, *, k: int = 50, **_kw):  # noqa: ANN001
+            return [(2, 0.5), (1, 0.25)][:k]
+
+        @classmethod
+        def vector_search(cls, *_a, **_kw):  # noqa: ANN002, ANN003, ANN206
+            raise AssertionError("hybrid should use vector_search_ids")
+
+        @classmethod
+        def vector_search_ids(cls, _session, _query_vec: Sequence[float], *, k: int = 50, **_kw):  # noqa: ANN001
+            return [(3, 0.1), (1, 0.2)][:k]
+
+    Base.metadata.create_all(engine)
+    session.add_all([DocLegs(id=1, content="a"), DocLegs(id=2, content="b"), DocLegs(id=3, content="c")])
+    session.commit()
+
+    results = hybrid_search_results(session, DocLegs, query_text="q", query_vec=[0.0, 1.0])
+    by_id = {r.id: r for r in results}
+
+    assert [r.id for r in results] == [1, 2, 3]
+    assert by_id[1].fts_rank == 0.25 and by_id[1].vector_distance == 0.2
+    assert by_id[2].fts_rank == 0.5 and by_id[2].vector_distance is None
+    assert by_id[3].vector_distance == 0.1 and by_id[3].fts_rank is None
+    assert all(r.obj is not None for r in results)
+
+
+def test_vector_search_ids_exact_uses_materialized_candidates():
+    s = _CaptureSession()
+    DocIds.vector_search_ids(s, [0.0, 1.0], k=5, where=DocIds.id > 3, exact=True)  # type: ignore[arg-type]
+
+    sql = str(s.stmts[0].compile(dialect=postgresql.dialect()))
+    assert "WITH candidates AS MATERIALIZED" in sql
+    assert "WHERE docs_ids.id >" in sql
+    assert "ORDER BY candidates.distance" in sql
+
+
+def test_vector_search_many_is_one_lateral_statement_per_batch():
+    class _Rows(_CaptureSession):
+        def all(self):  # noqa: ANN201
+            # (ordinality, id, distance); the second query vector has no hits
+            return [(1, 7, 0.1), (1, 3, 0.2), (3, 9, 0.05)] if len(self.stmts) == 1 else [(1, 4, 0.3)]
+
+    s = _Rows()
+    out = DocIds.vector_search_many(s, [[0.0, 1.0], [1.0, 0.0], [0.5, 0.5], [1.0, 1.0]], k=2, batch_size=3)  # type: ignore[arg-type]
+
+    assert out == [[(7, 0.1), (3, 0.2)], [], [(9, 0.05)], [(4, 0.3)]]
+    assert len(s.stmts) == 2
+    sql = str(s.stmts[0].compile(dialect=postgresql.dialect()))
+    assert "unnest(%(qvecs)s::TEXT[]) WITH ORDINALITY AS q(qvec, ord)" in sql
+    assert "JOIN LATERAL" in sql
+    assert "CAST(q.qvec AS VECTOR(1536))" in sql
+    assert s.stmts[0].compile().params["qvecs"] == ["[0.0,1.0]", "[1.0,0.0]", "[0.5,0.5]"]
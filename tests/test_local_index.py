@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import ARRAY, BigInteger, DateTime, Integer, any_, bindparam, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.legs import allowed_ids_predicate, vector_leg
+from age_search.local_index import LocalVectorIndex, allowed_ids_from_predicate
+from age_search.mixins_vector import VectorMixin
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocLocal(_Base, VectorMixin):
+    __tablename__ = "docs_local"
+    vector_dim = 2
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tenant_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+T0 = datetime(2026, 1, 1)
+
+
+@pytest.fixture()
+def docs(session):
+    _Base.metadata.create_all(session.get_bind())
+    session.add_all(
+        [
+            DocLocal(id=1, tenant_id=1, updated_at=T0, embedding=[1.0, 0.0]),
+            DocLocal(id=2, tenant_id=1, updated_at=T0, embedding=[0.0, 1.0]),
+            DocLocal(id=3, tenant_id=1, updated_at=T0, embedding=[0.7, 0.7]),
+            DocLocal(id=4, tenant_id=2, updated_at=T0, embedding=[1.0, 0.1]),
+        ]
+    )
+    session.commit()
+    yield session
+    DocLocal.local_vector_index = None
+
+
+def test_allowed_ids_from_predicate_recognises_only_its_own_predicate():
+    assert allowed_ids_from_predicate(allowed_ids_predicate(DocLocal, [3, 1]), DocLocal) == [3, 1]
+    assert allowed_ids_from_predicate(DocLocal.id > 3, DocLocal) is None
+    assert allowed_ids_from_predicate(None, DocLocal) is None
+    # same shape and bind name, but on another column: not an id filter
+    other = DocLocal.tenant_id == any_(bindparam("allowed_ids", [1], type_=ARRAY(BigInteger)))
+    assert allowed_ids_from_predicate(other, DocLocal) is None
+
+
+def test_vector_search_ids_uses_a_covering_mirror_and_falls_back_otherwise():
+    calls = []
+
+    class _Mirror:
+        def covers(self, where):  # noqa: ANN001, ANN201
+            return where is None, None
+
+        def search(self, qvec, *, k, distance, ids):  # noqa: ANN001, ANN201
+            calls.append((k, distance, ids))
+            return [(2, 0.0)]
+
+    class _Session:
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            calls.append("sql")
+            return self
+
+        def all(self):  # noqa: ANN201
+            return []
+
+    DocLocal.local_vector_index = _Mirror()
+    try:
+        assert DocLocal.vector_search_ids(_Session(), [0.0, 1.0], k=3) == [(2, 0.0)]  # type: ignore[arg-type]
+        DocLocal.vector_search_ids(_Session(), [0.0, 1.0], k=3, where=DocLocal.id > 1)  # type: ignore[arg-type]
+    finally:
+        DocLocal.local_vector_index = None
+    assert calls == [(3, "cosine", None), "sql"]
+
+
+def test_load_search_and_scope(docs):
+    pytest.importorskip("numpy")
+
+    idx = LocalVectorIndex(DocLocal, scope=DocLocal.tenant_id == 1, watermark="updated_at").load(docs)
+    assert len(idx) == 3 and idx.last_watermark == T0
+
+    hits = idx.search([1.0, 0.0], k=2)
+    assert [i for i, _d in hits] == [1, 3]
+    assert hits[0][1] == pytest.approx(0.0, abs=1e-6)
+    assert [i for i, _d in idx.search([1.0, 0.0], k=3, distance="ip")] == [1, 3, 2]
+
+    assert idx.covers(DocLocal.tenant_id == 1) == (True, None)
+    assert idx.covers(None) == (False, None)
+    assert idx.covers(DocLocal.tenant_id == 2) == (False, None)
+
+
+def test_hybrid_vector_leg_is_served_from_the_mirror(docs):
+    pytest.importorskip("numpy")
+
+    DocLocal.local_vector_index = LocalVectorIndex(DocLocal).load(docs)
+    leg = vector_leg(docs, DocLocal, [1.0, 0.0], k=5, allowed_ids=[2, 3, 4])
+    assert leg.ids == [4, 3, 2]
+    assert DocLocal.vector_search(docs, [0.0, 1.0], k=1)[0].id == 2
+
+
+def test_refresh_upserts_from_watermark_and_survives_save_open(docs, tmp_path):
+    pytest.importorskip("numpy")
+
+    idx = LocalVectorIndex(DocLocal, watermark="updated_at").load(docs)
+    later = T0 + timedelta(minutes=5)
+    docs.execute(update(DocLocal).where(DocLocal.id == 2).values(embedding=[1.0, 0.0], updated_at=later))
+    docs.execute(update(DocLocal).where(DocLocal.id == 4).values(embedding=None, updated_at=later))
+    docs.add(DocLocal(id=5, tenant_id=1, updated_at=later, embedding=[0.0, 1.0]))
+    docs.commit()
+
+    path = str(tmp_path / "docs_local")
+    idx.save(path)
+    reopened = LocalVectorIndex(DocLocal, watermark="updated_at").open(path)
+    assert reopened.last_watermark == T0
+
+    assert reopened.refresh(docs) == 5  # every row is at or past the watermark (T0 included)
+    assert len(reopened) == 4
+    assert [i for i, _d in reopened.search([0.0, 1.0], k=1)] == [5]
+    assert {i for i, d in reopened.search([1.0, 0.0], k=2)} == {1, 2}
+    assert reopened.last_watermark == later
+
+
+def test_stale_mirror_stops_covering_queries(docs, monkeypatch):
+    pytest.importorskip("numpy")
+    import age_search.local_index as local_index
+
+    now = [1000.0]
+    monkeypatch.setattr(local_index.time, "time", lambda: now[0])
+    index = LocalVectorIndex(DocLocal, max_staleness=30).load(docs)
+    assert index.covers(None) == (True, None)
+
+    now[0] += 31
+    assert index.staleness == 31 and index.covers(None) == (False, None)
+    index.refresh(docs)  # nothing changed, but the mirror is current again
+    assert index.covers(None) == (True, None)
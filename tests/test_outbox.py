@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from sqlalchemy import String, func, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.outbox as outbox
+from age_search.base import Base
+from age_search.hooks import GraphSyncOptions, install_graph_sync
+from age_search.mixins_graph import GraphNodeMixin
+from age_search.outbox import OutboxStats, drain_outbox, make_graph_outbox_table, run_sync_worker
+
+OUTBOX = make_graph_outbox_table(Base.metadata, table_name="agegraph_outbox_test")
+
+
+class DocOut(Base, GraphNodeMixin):
+    __tablename__ = "docs_outbox"
+    graph_label = "Doc"
+    graph_property_fields = ("title",)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+
+install_graph_sync(DocOut, options=GraphSyncOptions(mode="outbox", outbox=OUTBOX))
+
+
+def _capture(monkeypatch):  # noqa: ANN001, ANN202
+    calls = []
+    monkeypatch.setattr(outbox, "graph_upsert_rows", lambda _s, label, rows, **kw: calls.append(("upsert", label, rows)))
+    monkeypatch.setattr(
+        outbox, "graph_delete_ids", lambda _s, label, ids, **kw: calls.append(("delete", label, ids, kw["detach"]))
+    )
+    return calls
+
+
+def test_outbox_mode_writes_records_in_transaction(session, engine, monkeypatch):
+    calls = _capture(monkeypatch)
+    Base.metadata.create_all(engine)
+
+    a, b = DocOut(id=1, title="a"), DocOut(id=2, title="b")
+    session.add_all([a, b])
+    session.commit()
+    a.title = "a2"
+    session.delete(b)
+    session.commit()
+
+    ops = session.execute(select(OUTBOX.c.node_id, OUTBOX.c.op).order_by(OUTBOX.c.id)).all()
+    assert [tuple(r) for r in ops] == [(1, "upsert"), (2, "upsert"), (1, "upsert"), (2, "detach_delete")]
+    assert calls == []  # nothing touched AGE in the write path
+
+    stats = OutboxStats()
+    assert drain_outbox(session, OUTBOX, batch_size=3, stats=stats) == 3
+    # the two records for id=1 collapse to the latest one
+    assert calls == [
+        ("upsert", "Doc", [{"id": 2, "props": {"title": "b", "id": 2}}, {"id": 1, "props": {"title": "a2", "id": 1}}]),
+    ]
+    assert session.execute(select(func.count()).select_from(OUTBOX)).scalar() == 1
+
+    assert drain_outbox(session, OUTBOX, stats=stats) == 1
+    assert calls[-1] == ("delete", "Doc", [2], True)
+    assert stats.processed == 4 and stats.lag_seconds is not None
+
+
+def test_run_sync_worker_until_empty(session, engine, monkeypatch):
+    calls = _capture(monkeypatch)
+    Base.metadata.create_all(engine)
+    session.add_all([DocOut(id=i, title=str(i)) for i in range(5)])
+    session.commit()
+
+    stats = run_sync_worker(engine, OUTBOX, batch_size=2, until_empty=True)
+
+    assert stats.snapshot()["processed"] == 5 and stats.batches == 3
+    assert sum(len(c[2]) for c in calls) == 5
+    assert session.execute(select(func.count()).select_from(OUTBOX)).scalar() == 0
+
+
+def _write(session, rows):  # noqa: ANN001, ANN202
+    outbox.write_outbox_rows(
+        session,
+        OUTBOX,
+        [{"label": "Doc", "key": "id", "node_id": n, "op": op, "props": {"title": "x"}} for n, op in rows],
+    )
+    session.commit()
+    return [r[0] for r in session.execute(select(OUTBOX.c.id).order_by(OUTBOX.c.id)).all()]
+
+
+def test_interleaved_claims_keep_per_vertex_order(session, engine, monkeypatch):
+    calls = _capture(monkeypatch)
+    Base.metadata.create_all(engine)
+    session.execute(OUTBOX.delete())
+    old_upsert, new_delete = _write(session, [(7, "upsert"), (7, "detach_delete")])
+
+    # Worker B gets only the newer delete (worker A holds the older upsert): it must not apply it.
+    assert drain_outbox(session, OUTBOX, ids=[new_delete]) == 0
+    assert calls == []
+
+    # Worker A applies the upsert, then the delete goes through: the vertex ends up deleted.
+    assert drain_outbox(session, OUTBOX, ids=[old_upsert]) == 1
+    assert drain_outbox(session, OUTBOX, ids=[new_delete]) == 1
+    assert [c[0] for c in calls] == ["upsert", "delete"]
+
+
+def test_failing_records_are_isolated_and_dead_lettered(session, engine, monkeypatch):
+    applied = []
+
+    def fake_upsert(_s, label, rows, **kw):  # noqa: ANN001, ANN202
+        if any(r["id"] == 3 for r in rows):
+            raise RuntimeError("bad props")
+        applied.extend(r["id"] for r in rows)
+
+    monkeypatch.setattr(outbox, "graph_upsert_rows", fake_upsert)
+    Base.metadata.create_all(engine)
+    session.execute(OUTBOX.delete())
+    _write(session, [(1, "upsert"), (3, "upsert"), (4, "upsert")])
+
+    stats = run_sync_worker(engine, OUTBOX, batch_size=10, until_empty=True, max_attempts=2)
+
+    assert sorted(applied) == [1, 4]
+    left = session.execute(select(OUTBOX.c.node_id, OUTBOX.c.attempts, OUTBOX.c.last_error)).all()
+    assert [tuple(r) for r in left] == [(3, 2, "bad props")]
+    assert stats.errors == 2
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Sequence
+
+import pytest
+from sqlalchemy import String, create_engine
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from age_search.base import Base
+from age_search.exceptions import LegTimeoutError
+from age_search.hybrid2 import hybrid_search_results
+import age_search.parallel as parallel
+from age_search.parallel import leg_executor, run_legs
+
+
+def test_run_legs_overlaps_legs_on_separate_sessions(session):
+    barrier = threading.Barrier(2, timeout=2)
+    seen: list[Session] = []
+
+    def leg(value: int):  # noqa: ANN202
+        def _fn(s: Session) -> int:
+            seen.append(s)
+            barrier.wait()  # only passes if both legs are running at the same time
+            return value
+
+        return _fn
+
+    assert run_legs(session, [leg(1), leg(2)]) == [1, 2]
+    assert len(seen) == 2 and session not in seen and seen[0] is not seen[1]
+
+
+def test_run_legs_timeout_raises_or_drops_leg(session):
+    def slow(_s: Session) -> str:
+        time.sleep(0.3)
+        return "slow"
+
+    def fast(_s: Session) -> str:
+        return "fast"
+
+    with pytest.raises(LegTimeoutError):
+        run_legs(session, [fast, slow], timeout=0.05)
+
+    assert run_legs(session, [slow, fast], timeout=0.05, allow_partial=True) == [None, "fast"]
+
+
+def test_run_legs_timeout_cancels_running_statement(session, monkeypatch):
+    cancelled = threading.Event()
+
+    class FakeDriverConnection:
+        def cancel(self) -> None:
+            cancelled.set()
+
+    monkeypatch.setattr(parallel, "_driver_connection", lambda _s: FakeDriverConnection())
+
+    def stuck(_s: Session) -> str:
+        # stands in for a query that only returns once the server cancels it
+        return "cancelled" if cancelled.wait(2) else "ran to the end"
+
+    start = time.monotonic()
+    assert run_legs(session, [stuck], timeout=0.05, allow_partial=True) == [None]
+    assert cancelled.wait(1) and time.monotonic() - start < 1
+
+
+def test_leg_executor_is_sized_from_the_connection_pool():
+    eng = create_engine("postgresql+psycopg://u@localhost/db", pool_size=3, max_overflow=2)
+    assert leg_executor(eng)._max_workers == 5
+    assert leg_executor(eng) is leg_executor(eng)
+
+
+def test_hybrid_search_results_parallel_matches_sequential(session, engine):
+    class DocPar(Base):
+        __tablename__ = "docs_parallel"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+        content: Mapped[str] = mapped_column(String, nullable=False)
+
+        @classmethod
+        def bm25_search(cls, _session, _query_text: str, *, k: int = 50, **_kw):  # noqa: ANN001
+            time.sleep(0.02)  # finish after the vector leg
+            return [(2, 3.0), (1, 2.0)]
+
+        @classmethod
+        def vector_search_ids(cls, _session, _query_vec: Sequence[float], *, k: int = 50, **_kw):  # noqa: ANN001
+            return [(3, 0.1), (1, 0.2)]
+
+    Base.metadata.create_all(engine)
+    session.add_all([DocPar(id=i, content=str(i)) for i in (1, 2, 3)])
+    session.commit()
+
+    kw = {"query_text": "q", "query_vec": [0.0, 1.0]}
+    seq = hybrid_search_results(session, DocPar, **kw)
+    par = hybrid_search_results(session, DocPar, parallel=True, leg_timeout=2.0, **kw)
+
+    assert [r.id for r in par] == [r.id for r in seq] == [1, 2, 3]
+    assert [r.rrf_score for r in par] == [r.rrf_score for r in seq]
+    assert all(r.obj is not None for r in par)
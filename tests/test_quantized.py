@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from sqlalchemy import Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.migrations import InstallSpec, install_all, quantized_index_target
+from age_search.mixins_vector import VectorMixin
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocHalf(_Base, VectorMixin):
+    __tablename__ = "docs_half"
+    vector_quantization = "halfvec"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class DocBit(_Base, VectorMixin):
+    __tablename__ = "docs_bit"
+    vector_quantization = "bit"
+    vector_oversample = 10
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+
+class _CaptureSession:
+    def __init__(self):
+        self.stmts = []
+
+    def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+        self.stmts.append((stmt, params))
+        return self
+
+    def all(self):  # noqa: ANN201
+        return []
+
+
+def _sql(stmt) -> str:  # noqa: ANN001
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_halfvec_coarse_pass_then_full_precision_rerank():
+    s = _CaptureSession()
+    DocHalf.vector_search_ids(s, [0.0, 1.0], k=5, where=DocHalf.id > 3)  # type: ignore[arg-type]
+
+    # ef_search is raised to the oversampled coarse LIMIT (5 * 4)
+    (settings, params), (stmt, _) = s.stmts
+    assert "hnsw.ef_search" in str(settings) and params == {"ef_search": "20"}
+
+    sql = _sql(stmt)
+    assert "docs_half.id IN (SELECT docs_half.id" in sql
+    assert "CAST(docs_half.embedding AS HALFVEC(1536)) <=> CAST(CAST(" in sql
+    assert sql.rstrip().endswith("ORDER BY docs_half.embedding <=> %(embedding_1)s \n LIMIT %(param_3)s::INTEGER")
+    compiled = stmt.compile()
+    assert compiled.params["param_2"] == 20 and compiled.params["param_3"] == 5
+
+
+def test_bit_coarse_pass_uses_hamming_and_per_call_oversample():
+    s = _CaptureSession()
+    DocBit.vector_search_ids(s, [0.0, 1.0], k=5, oversample=3, ef_search=100)  # type: ignore[arg-type]
+
+    (settings, params), (stmt, _) = s.stmts
+    assert params == {"ef_search": "100"}  # already above the coarse limit
+    sql = _sql(stmt)
+    assert "CAST(binary_quantize(docs_bit.embedding) AS BIT(1536)) <~> CAST(binary_quantize(CAST(" in sql
+    assert stmt.compile().params["param_2"] == 15
+
+
+def test_exact_search_skips_the_quantized_pass():
+    s = _CaptureSession()
+    DocBit.vector_search_ids(s, [0.0, 1.0], k=5, exact=True)  # type: ignore[arg-type]
+    assert len(s.stmts) == 1
+    assert "binary_quantize" not in _sql(s.stmts[0][0])
+
+
+def test_vector_search_many_reranks_inside_the_lateral():
+    stmt = DocHalf._vector_search_many_stmt([[0.0, 1.0]], k=2, distance="cosine")
+    sql = _sql(stmt)
+    assert "JOIN LATERAL" in sql
+    # the coarse subquery keeps its own FROM and correlates only the query vector
+    assert "IN (SELECT docs_half.id \nFROM docs_half ORDER BY CAST(docs_half.embedding AS HALFVEC(1536))" in sql
+    assert "CAST(CAST(q.qvec AS VECTOR(1536)) AS HALFVEC(1536))" in sql
+
+
+def test_quantized_index_target_and_install_all():
+    assert quantized_index_target("embedding", "halfvec", 8, opclass="vector_l2_ops") == (
+        "((embedding)::halfvec(8))",
+        "halfvec_l2_ops",
+    )
+    assert quantized_index_target("embedding", "bit", 8, opclass="vector_cosine_ops") == (
+        "(binary_quantize(embedding)::bit(8))",
+        "bit_hamming_ops",
+    )
+
+    executed = []
+
+    class _Conn:
+        def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+            executed.append(str(stmt))
+
+            class _R:
+                def first(self):  # noqa: ANN202
+                    return (1,)
+
+            return _R()
+
+    class _Engine:
+        @contextmanager
+        def begin(self):  # noqa: ANN201
+            yield _Conn()
+
+    install_all(_Engine(), models=[DocBit], spec=InstallSpec(enable_fts=False, analyze_after=False))  # type: ignore[arg-type]
+
+    idx = [s for s in executed if "USING hnsw" in s]
+    assert len(idx) == 1
+    assert "ix_docs_bit_emb_hnsw_bit" in idx[0]
+    assert "(binary_quantize(embedding)::bit(1536)) bit_hamming_ops" in idx[0]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+
+import age_search.query as query_mod
+from age_search.query import CypherQuery, decode_cursor, encode_cursor
+
+
+def test_order_skip_and_keyset_compile():
+    q = CypherQuery(None, "MATCH (d:Doc)", "d").where("d.year > $y", y=2000)  # type: ignore[arg-type]
+    q.order_by("d.year DESC", "d.id").skip(5).limit(10)
+    assert q._compile().endswith("RETURN d AS row\nORDER BY d.year DESC, d.id\nSKIP 5\nLIMIT 10")
+
+    q.skip_n = None
+    q.after(encode_cursor([2020, 7]))
+    cy = q._compile(with_keys=True)
+    assert "WHERE (d.year > $y) AND ((d.year < $after_0) OR (d.year = $after_0 AND d.id > $after_1))" in cy
+    assert "RETURN d AS row, d.year AS k0, d.id AS k1" in cy
+    assert q._params() == {"y": 2000, "after_0": 2020, "after_1": 7}
+
+
+def test_after_validates_cursor():
+    q = CypherQuery(None, "MATCH (d:Doc)", "d")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        q.after(encode_cursor([1]))
+    q.order_by("d.id")
+    with pytest.raises(ValueError):
+        q.after("not-a-cursor")
+    assert decode_cursor(encode_cursor(["a", 1])) == ["a", 1]
+
+
+def test_pages_walks_keyset_cursors(monkeypatch):
+    data = list(range(1, 8))
+    calls = []
+
+    def fake_cypher_rows(_s, cy, *, columns, params=None, graph_name=None):  # noqa: ANN001
+        calls.append(params)
+        after = params.get("after_0", 0)
+        ids = [i for i in data if i > after][: int(cy.rsplit("LIMIT ", 1)[1])]
+        return [({"id": i}, i) for i in ids]
+
+    monkeypatch.setattr(query_mod, "cypher_rows", fake_cypher_rows)
+    q = CypherQuery(None, "MATCH (d:Doc)", "d").order_by("d.id")  # type: ignore[arg-type]
+
+    pages = list(q.pages(3))
+
+    assert [[r["id"] for r in p] for p in pages] == [[1, 2, 3], [4, 5, 6], [7]]
+    assert [c.get("after_0") for c in calls] == [None, 3, 6]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import re
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.reconcile as rec
+from age_search.base import Base
+from age_search.mixins_graph import GraphNodeMixin
+from age_search.reconcile import reconcile_graph
+
+
+class DocRec(Base, GraphNodeMixin):
+    __tablename__ = "docs_reconcile"
+    graph_label = "Doc"
+    graph_property_fields = ("title",)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+
+def _fake_graph(monkeypatch, vertices, calls=None):  # noqa: ANN001, ANN202
+    writes = []
+
+    def fake_cypher_rows(_s, cy, *, columns, params, graph_name=None):  # noqa: ANN001
+        lo, hi = params["lo"], params["hi"]
+        limit = int(re.search(r"LIMIT (\d+)", cy).group(1))
+        if calls is not None:
+            calls.append((lo, hi))
+        return [
+            (k, p)
+            for k, p in sorted(vertices.items())
+            if (lo is None or k > lo) and (hi is None or k <= hi)
+        ][:limit]
+
+    monkeypatch.setattr(rec, "cypher_rows", fake_cypher_rows)
+    monkeypatch.setattr(rec, "graph_upsert_rows", lambda _s, label, rows, **kw: writes.append(("upsert", rows)))
+    monkeypatch.setattr(rec, "graph_delete_ids", lambda _s, label, ids, **kw: writes.append(("delete", ids)))
+    return writes
+
+
+def _seed(session, engine):  # noqa: ANN001, ANN202
+    Base.metadata.create_all(engine)
+    session.add_all([DocRec(id=i, title=f"t{i}") for i in range(1, 6)])
+    session.commit()
+
+
+def test_reconcile_dry_run_reports_drift_in_chunks(session, engine, monkeypatch):
+    _seed(session, engine)
+    vertices = {i: {"id": i, "title": f"t{i}"} for i in (1, 2, 4, 5)}
+    vertices[4]["title"] = "old"
+    vertices[42] = {"id": 42}
+    writes = _fake_graph(monkeypatch, vertices)
+
+    report = reconcile_graph(session, DocRec, chunk_size=2, dry_run=True)
+
+    assert (report.missing, report.stale, report.extra) == ([3], [4], [42])
+    assert report.chunks == 3 and report.rows == 5 and report.done
+    assert writes == []
+
+
+def test_reconcile_applies_fixes_and_resumes_from_checkpoint(session, engine, monkeypatch, tmp_path):
+    _seed(session, engine)
+    writes = _fake_graph(monkeypatch, {1: {"id": 1, "title": "t1"}, 9: {"id": 9}})
+    ckpt = tmp_path / "ckpt.json"
+    ckpt.write_text(json.dumps({"label": "Doc", "last_key": 3}))
+
+    report = reconcile_graph(session, DocRec, chunk_size=10, checkpoint=str(ckpt))
+
+    # ids <= 3 were done by the interrupted run
+    assert report.missing == [4, 5] and report.extra == [9]
+    assert writes == [
+        ("delete", [9]),
+        ("upsert", [{"id": 4, "props": {"title": "t4", "id": 4}}, {"id": 5, "props": {"title": "t5", "id": 5}}]),
+    ]
+    assert not ckpt.exists()
+
+
+def test_reconcile_pages_graph_side_and_deletes_vertices_past_last_row(session, engine, monkeypatch):
+    Base.metadata.create_all(engine)
+    session.add_all([DocRec(id=i, title=f"t{i}") for i in range(1, 5)])
+    session.commit()
+    calls = []
+    vertices = {i: {"id": i, "title": f"t{i}"} for i in range(1, 5)}
+    vertices.update({i: {"id": i} for i in range(10, 15)})
+    writes = _fake_graph(monkeypatch, vertices, calls)
+
+    report = reconcile_graph(session, DocRec, chunk_size=2, dry_run=True)
+
+    # 4 rows = two full chunks, then an open-ended chunk read two vertices per page
+    assert report.extra == [10, 11, 12, 13, 14] and report.in_sync is False
+    assert calls[-3:] == [(4, None), (11, None), (13, None)]
+    assert report.vertices == 9 and writes == []
+
+
+def test_reconcile_commit_false_leaves_transaction_to_caller(session, engine, monkeypatch, tmp_path):
+    _seed(session, engine)
+    _fake_graph(monkeypatch, {})
+    commits = []
+    monkeypatch.setattr(session, "commit", lambda: commits.append(1))
+    ckpt = tmp_path / "ckpt.json"
+
+    report = reconcile_graph(session, DocRec, chunk_size=2, commit=False, checkpoint=str(ckpt))
+
+    assert report.missing == [1, 2, 3, 4, 5]
+    assert commits == [] and not ckpt.exists()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import pytest
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+import age_search.relationships as rels
+from age_search.base import Base
+from age_search.mixins_graph import GraphNodeMixin
+from age_search.relationships import GraphRelationship
+
+
+class DocRel(Base, GraphNodeMixin):
+    __tablename__ = "docs_rel_edges"
+    graph_label = "Doc"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+
+    related = GraphRelationship("RELATED_TO", target_label="Doc", source_label="Doc")
+
+
+def _capture(monkeypatch):  # noqa: ANN001, ANN202
+    calls = []
+
+    def fake_cypher_rows(_s, cy, *, columns, params=None, graph_name=None):  # noqa: ANN001
+        calls.append((cy, params))
+        return [(len(params["rows"]),)]
+
+    monkeypatch.setattr(rels, "cypher_rows", fake_cypher_rows)
+    return calls
+
+
+def test_link_pairs_batches_with_props_and_weight(monkeypatch):
+    calls = _capture(monkeypatch)
+
+    n = DocRel.related.link_pairs(
+        None,  # type: ignore[arg-type]
+        [(1, 2), (DocRel(id=1, title="a"), 3, {"kind": "x"}), (2, 3)],
+        weight=0.5,
+        batch_size=2,
+    )
+
+    assert n == 3 and len(calls) == 2
+    cy, params = calls[0]
+    assert "UNWIND $rows AS r" in cy and "MERGE (n)-[e:RELATED_TO]->(m)" in cy and "SET e += r.props" in cy
+    assert params["rows"] == [
+        {"s": 1, "t": 2, "props": {"weight": 0.5}},
+        {"s": 1, "t": 3, "props": {"weight": 0.5, "kind": "x"}},
+    ]
+
+
+def test_add_many_create_only_skips_merge(monkeypatch):
+    calls = _capture(monkeypatch)
+    doc = DocRel(id=1, title="a")
+
+    assert doc.related.add_many(None, [DocRel(id=2, title="b"), 3], create_only=True) == 2  # type: ignore[arg-type]
+
+    cy, params = calls[0]
+    assert "CREATE (n)-[e:RELATED_TO]->(m)" in cy and "MERGE" not in cy
+    assert "SET e" not in cy
+    assert [(r["s"], r["t"]) for r in params["rows"]] == [(1, 2), (1, 3)]
+
+
+def test_link_pairs_resolves_the_target_label_or_raises(monkeypatch):
+    calls = _capture(monkeypatch)
+
+    class TagRel(Base, GraphNodeMixin):
+        __tablename__ = "tags_rel_edges"
+        graph_label = "Tag"
+
+        id: Mapped[int] = mapped_column(primary_key=True)
+
+    tagged = GraphRelationship("TAGGED", source_label="Doc")
+
+    # inferred from the target instances' graph label, not the source label
+    assert tagged.link_pairs(None, [(1, TagRel(id=7)), (2, 8)]) == 2  # type: ignore[arg-type]
+    assert "MATCH (m:Tag) WHERE m.id = r.t" in calls[0][0]
+
+    with pytest.raises(ValueError, match="target_label"):
+        tagged.link_pairs(None, [(1, 7), (2, 8)])  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="different labels"):
+        tagged.link_pairs(None, [(1, TagRel(id=7)), (2, DocRel(id=2, title="b"))])  # type: ignore[arg-type]
+    assert len(calls) == 1
+
+
+def test_load_for_fetches_neighbors_for_all_sources_in_one_call(monkeypatch):
+    calls = []
+
+    def fake_cypher_rows(_s, cy, *, columns, params=None, graph_name=None):  # noqa: ANN001
+        calls.append((cy, params))
+        return [(1, [{"id": 2}, {"id": 3}])]
+
+    monkeypatch.setattr(rels, "cypher_rows", fake_cypher_rows)
+
+    out = DocRel.related.load_for(None, [DocRel(id=1, title="a"), 4, 1], limit_per_source=2)  # type: ignore[arg-type]
+
+    assert out == {1: [{"id": 2}, {"id": 3}], 4: []}
+    cy, params = calls[0]
+    assert len(calls) == 1 and params == {"ids": [1, 4]}
+    assert "MATCH (n:Doc)-[:RELATED_TO]->(m:Doc)" in cy and "WHERE n.id IN $ids" in cy
+    assert "RETURN sid, ms[0..2]" in cy
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from sqlalchemy import Integer, Text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from age_search.mixins_vector import VectorMixin
+from age_search.tuning import ann_tuning, autotune_ef_search, load_ann_tuning
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class DocTune(_Base, VectorMixin):
+    __tablename__ = "docs_tune"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, stmt, params=None):  # noqa: ANN001, ANN201
+        self.calls.append((str(stmt), params))
+        return self
+
+    def one(self):  # noqa: ANN201
+        return ("40", None)
+
+    def all(self):  # noqa: ANN201
+        return []
+
+
+def test_ann_tuning_sets_local_and_restores_previous_values():
+    s = _Session()
+    with ann_tuning(s, ef_search=200, iterative_scan="strict_order"):  # type: ignore[arg-type]
+        s.execute("SELECT 1")
+
+    (read, rp), (set_, sp), _q, (restore, rsp) = s.calls
+    assert "current_setting(:n0, true)" in read and rp == {"n0": "hnsw.ef_search", "n1": "hnsw.iterative_scan"}
+    assert "set_config('hnsw.iterative_scan', :iterative_scan, true)" in set_
+    assert sp == {"ef_search": "200", "iterative_scan": "strict_order"}
+    # iterative_scan had no previous value (NULL) so only ef_search is put back
+    assert rsp == {"ef_search": "40"}
+
+
+def test_ann_tuning_does_not_restore_when_the_block_raises():
+    s = _Session()
+    try:
+        with ann_tuning(s, ef_search=200):  # type: ignore[arg-type]
+            raise RuntimeError("boom")
+    except RuntimeError as exc:
+        assert str(exc) == "boom"
+    assert len(s.calls) == 2  # read + set; no restore statement on top of the failure
+
+
+def test_per_call_ef_search_is_set_locally_and_skipped_without_a_value():
+    s = _Session()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5, ef_search=80)  # type: ignore[arg-type]
+    assert "set_config('hnsw.ef_search', :ef_search, true)" in s.calls[0][0]
+    assert s.calls[0][1] == {"ef_search": "80"}
+
+    s = _Session()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+    assert len(s.calls) == 1  # no settings statement without a value
+
+
+class _TxSession(_Session):
+    """Tracks set_config calls per transaction like a Session inside `begin()`."""
+
+    def __init__(self):
+        super().__init__()
+        self.info = {}
+        self.txn = object()
+
+    def get_transaction(self):  # noqa: ANN201
+        return self.txn
+
+    def get_nested_transaction(self):  # noqa: ANN201
+        return None
+
+
+def test_per_call_settings_are_set_once_per_transaction_and_reset_later():
+    s = _TxSession()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5, ef_search=80, iterative_scan="relaxed_order")  # type: ignore[arg-type]
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5, ef_search=80, iterative_scan="relaxed_order")  # type: ignore[arg-type]
+    (set_, sp), _q1, _q2 = s.calls  # no read, no restore, nothing to set the second time
+    assert sp == {"ef_search": "80", "iterative_scan": "relaxed_order"}
+
+    s.calls.clear()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+    (reset, rp), _q = s.calls  # the knobs the first searches set go back to the server defaults
+    assert "set_config('hnsw.ef_search', :ef_search, true)" in reset
+    assert rp == {"ef_search": None, "iterative_scan": None}
+
+    s.txn = object()  # a new transaction starts from the server defaults again
+    s.calls.clear()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+    assert len(s.calls) == 1
+
+
+def test_ann_tuning_scope_wins_over_the_model_default(monkeypatch):
+    monkeypatch.setattr(DocTune, "ann_ef_search", 40)
+    s = _TxSession()
+    with ann_tuning(s, ef_search=400):  # type: ignore[arg-type]
+        s.calls.clear()
+        DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+        assert len(s.calls) == 1  # ef_search=400 is already in effect; the default 40 isn't set
+
+        DocTune.vector_search_ids(s, [0.0, 1.0], k=5, ef_search=80)  # type: ignore[arg-type]
+        DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+        per_call, back = [p for _sql, p in s.calls if p]
+        assert per_call == {"ef_search": "80"} and back == {"ef_search": "400"}
+
+    s.calls.clear()
+    DocTune.vector_search_ids(s, [0.0, 1.0], k=5)  # type: ignore[arg-type]
+    # the block put the previous value (40 from the fake read) back, which is the model default
+    assert len(s.calls) == 1
+
+
+def test_autotune_picks_smallest_ef_meeting_target(monkeypatch, tmp_path):
+    truth = {0: [1, 2, 3, 4], 1: [5, 6, 7, 8]}
+
+    def fake_ids(_s, q, *, k, distance, where, exact=False, ef_search=None):  # noqa: ANN001
+        ids = truth[int(q[0])]
+        if not exact:
+            # recall grows with ef_search: 2/4 at ef<40, 3/4 at ef<100, 4/4 after
+            keep = 2 if ef_search < 40 else 3 if ef_search < 100 else 4
+            ids = ids[:keep] + [99, 98][: 4 - keep]
+        return [(i, 0.0) for i in ids]
+
+    monkeypatch.setattr(DocTune, "vector_search_ids", staticmethod(fake_ids))
+    path = tmp_path / "ann.json"
+    try:
+        res = autotune_ef_search(None, DocTune, [[0.0], [1.0]], k=4, target_recall=0.75, path=str(path))  # type: ignore[arg-type]
+
+        assert res.ef_search == 40 and res.recall == 0.75 and res.met_target
+        assert sorted(res.reports) == [10, 20, 40]
+        assert DocTune.ann_ef_search == 40
+
+        DocTune.ann_ef_search = None
+        load_ann_tuning(str(path), DocTune)
+        assert DocTune.ann_ef_search == 40
+    finally:
+        DocTune.ann_ef_search = None
+
+
+def test_autotune_bypasses_local_index_and_floors_quantized_candidates(monkeypatch):
+    class DocTuneQ(DocTune):
+        vector_quantization = "halfvec"
+        vector_oversample = 4
+        local_vector_index = object()  # would answer every search exactly
+
+    seen = []
+
+    def fake_ids(_s, q, *, k, distance, where, exact=False, ef_search=None):  # noqa: ANN001
+        assert DocTuneQ.local_vector_index is None
+        seen.append(ef_search)
+        return [(1, 0.0)]
+
+    monkeypatch.setattr(DocTuneQ, "vector_search_ids", staticmethod(fake_ids))
+    res = autotune_ef_search(None, DocTuneQ, [[0.0]], k=5, candidates=(10, 20, 40), persist=False)  # type: ignore[arg-type]
+
+    # 10 and 20 would both be raised to k * oversample = 20 by the search itself
+    assert sorted(res.reports) == [20] and seen == [None, 20]
+    assert res.reports[20].recall_at_k == 1.0 and res.reports[20].k == 5
+    assert DocTuneQ.local_vector_index is not None